@@ -0,0 +1,42 @@
+"""list filter indexes
+
+Revision ID: a91d6e2f4c07
+Revises: e7a83b5c19d4
+Create Date: 2026-10-18 13:12:44.208391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a91d6e2f4c07'
+down_revision: Union[str, None] = 'e7a83b5c19d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Date-range overlap filters scan end_date >= :from and check start_date
+DATE_RANGE_INDEXES = ['objective', 'key_result']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for table in DATE_RANGE_INDEXES:
+            op.create_index(
+                f'ix_{table}_end_date_start_date', table, ['end_date', 'start_date'],
+                unique=False, postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table in DATE_RANGE_INDEXES:
+            op.drop_index(
+                f'ix_{table}_end_date_start_date', table_name=table,
+                postgresql_concurrently=True,
+            )
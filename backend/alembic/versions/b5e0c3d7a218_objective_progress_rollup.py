@@ -0,0 +1,65 @@
+"""objective progress rollup
+
+Revision ID: b5e0c3d7a218
+Revises: a91d6e2f4c07
+Create Date: 2026-10-18 14:02:17.615230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e0c3d7a218'
+down_revision: Union[str, None] = 'a91d6e2f4c07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+DEPTHS = """
+    WITH RECURSIVE tree AS (
+        SELECT id, 0 AS depth FROM objective WHERE parent_id IS NULL
+        UNION ALL
+        SELECT o.id, t.depth + 1 FROM objective o JOIN tree t ON o.parent_id = t.id
+    )
+"""
+
+# Unweighted rollup, matching app.crud.progress with PROGRESS_WEIGHTS unset
+ROLLUP_LEVEL = DEPTHS + """
+    , inputs AS (
+        SELECT objective_id AS id,
+               CASE
+                   WHEN target_value = start_value THEN
+                       CASE WHEN current_value = target_value THEN 100.0 ELSE 0.0 END
+                   ELSE LEAST(GREATEST(
+                       (current_value - start_value) / (target_value - start_value), 0
+                   ), 1) * 100
+               END AS progress
+        FROM key_result WHERE objective_id IS NOT NULL
+        UNION ALL
+        SELECT parent_id, progress FROM objective WHERE parent_id IS NOT NULL
+    )
+    UPDATE objective o
+    SET progress = round(agg.progress)::integer
+    FROM (SELECT id, avg(progress) AS progress FROM inputs GROUP BY id) agg, tree t
+    WHERE o.id = agg.id AND t.id = o.id AND t.depth = :depth
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Derive stored progress bottom-up so each level sees its children's values
+    bind = op.get_bind()
+    max_depth = bind.execute(
+        sa.text(DEPTHS + "SELECT max(depth) FROM tree")
+    ).scalar()
+    for depth in range(max_depth or 0, -1, -1):
+        bind.execute(sa.text(ROLLUP_LEVEL), {"depth": depth})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Entered values are not kept; derived progress stays in place
+    pass
@@ -0,0 +1,38 @@
+"""message display window index
+
+Revision ID: c2f8a4b61d93
+Revises: b5e0c3d7a218
+Create Date: 2026-10-18 14:48:53.902174
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2f8a4b61d93'
+down_revision: Union[str, None] = 'b5e0c3d7a218'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Serves display_end >= today OR display_end IS NULL for /messages/active
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_message_display_end_display_start', 'message',
+            ['display_end', 'display_start'],
+            unique=False, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_message_display_end_display_start', table_name='message',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,53 @@
+"""member path
+
+Revision ID: c4f1d2a9e7b3
+Revises: dcae01b2a157
+Create Date: 2026-10-18 09:12:41.228310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f1d2a9e7b3'
+down_revision: Union[str, None] = 'dcae01b2a157'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('member', sa.Column('path', postgresql.ARRAY(sa.Integer()), nullable=True))
+    # Backfill paths by walking down from the top managers
+    op.execute(
+        """
+        WITH RECURSIVE tree(id, path) AS (
+            SELECT id, ARRAY[id] FROM member WHERE supervisor_id IS NULL
+            UNION ALL
+            SELECT m.id, t.path || m.id
+            FROM member m JOIN tree t ON m.supervisor_id = t.id
+        )
+        UPDATE member SET path = tree.path FROM tree WHERE member.id = tree.id
+        """
+    )
+    # Members not reachable from a top manager sit on a supervisor cycle
+    unreached = op.get_bind().execute(
+        sa.text('SELECT id FROM member WHERE path IS NULL ORDER BY id')
+    ).scalars().all()
+    if unreached:
+        raise RuntimeError(
+            f"Members {unreached} are part of a supervisor cycle; "
+            "clear supervisor_id on one member of each cycle and rerun"
+        )
+    op.alter_column('member', 'path', nullable=False, server_default='{}')
+    op.create_index('ix_member_path', 'member', ['path'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_member_path', table_name='member', postgresql_using='gin')
+    op.drop_column('member', 'path')
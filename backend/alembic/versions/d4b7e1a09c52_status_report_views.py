@@ -0,0 +1,85 @@
+"""status report views
+
+Revision ID: d4b7e1a09c52
+Revises: c2f8a4b61d93
+Create Date: 2026-10-18 16:20:44.108532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4b7e1a09c52'
+down_revision: Union[str, None] = 'c2f8a4b61d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Key result progress as in app.crud.progress.key_result_progress
+KEY_RESULT_PROGRESS = """
+    CASE
+        WHEN target_value = start_value THEN
+            CASE WHEN current_value = target_value THEN 100.0 ELSE 0.0 END
+        ELSE LEAST(GREATEST(
+            (current_value - start_value) / (target_value - start_value), 0
+        ), 1) * 100
+    END
+"""
+
+# One row per member, status, priority and quarter; progress is kept as a sum
+# so the endpoint can roll groups up without re-reading the base tables
+REPORTS = {
+    'objective_status_report': """
+        SELECT member_id, status, priority,
+               date_trunc('quarter', start_date)::date AS period,
+               count(*) AS item_count,
+               sum(progress)::double precision AS progress_sum
+        FROM objective
+        GROUP BY 1, 2, 3, 4
+    """,
+    'key_result_status_report': f"""
+        SELECT member_id, status, priority,
+               date_trunc('quarter', start_date)::date AS period,
+               count(*) AS item_count,
+               sum({KEY_RESULT_PROGRESS}) AS progress_sum
+        FROM key_result
+        GROUP BY 1, 2, 3, 4
+    """,
+}
+
+# What the reports were built from, compared with the base tables to skip
+# refreshes when nothing changed
+VERSION = """
+    SELECT (SELECT max(updated_at) FROM objective) AS objective_updated_at,
+           (SELECT count(*) FROM objective) AS objective_count,
+           (SELECT max(updated_at) FROM key_result) AS key_result_updated_at,
+           (SELECT count(*) FROM key_result) AS key_result_count,
+           now() AS refreshed_at
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(f'CREATE MATERIALIZED VIEW status_report_version AS {VERSION}')
+    # A single row, indexed only so it can be refreshed concurrently too
+    op.execute(
+        'CREATE UNIQUE INDEX ux_status_report_version '
+        'ON status_report_version (refreshed_at)'
+    )
+    for name, query in REPORTS.items():
+        op.execute(f'CREATE MATERIALIZED VIEW {name} AS {query}')
+        # REFRESH ... CONCURRENTLY needs a unique index over all rows
+        op.execute(
+            f'CREATE UNIQUE INDEX ux_{name} '
+            f'ON {name} (member_id, status, priority, period)'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in REPORTS:
+        op.execute(f'DROP MATERIALIZED VIEW {name}')
+    op.execute('DROP MATERIALIZED VIEW status_report_version')
@@ -0,0 +1,45 @@
+"""workspace indexes
+
+Revision ID: e1c9f3b75a28
+Revises: d4b7e1a09c52
+Create Date: 2026-10-18 17:05:12.384901
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1c9f3b75a28'
+down_revision: Union[str, None] = 'd4b7e1a09c52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Meetings a member attends or leads, for GET /me/workspace
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_meeting_participant_member_id'), 'meeting_participant',
+            ['member_id'], unique=False, postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_meeting_lead_member_id_date', 'meeting', ['lead_member_id', 'date'],
+            unique=False, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_meeting_lead_member_id_date', table_name='meeting',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            op.f('ix_meeting_participant_member_id'),
+            table_name='meeting_participant', postgresql_concurrently=True,
+        )
@@ -0,0 +1,99 @@
+"""foreign key indexes
+
+Revision ID: e7a83b5c19d4
+Revises: c4f1d2a9e7b3
+Create Date: 2026-10-18 10:41:06.517724
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a83b5c19d4'
+down_revision: Union[str, None] = 'c4f1d2a9e7b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+FOREIGN_KEY_INDEXES = [
+    ('member', 'supervisor_id'),
+    ('member', 'user_id'),
+    ('objective', 'member_id'),
+    ('objective', 'parent_id'),
+    ('key_result', 'member_id'),
+    ('key_result', 'objective_id'),
+]
+
+# Association pairs used by every meeting lookup, unique per meeting
+MEETING_LINKS = [
+    ('meeting_participant', 'member_id', 'uq_meeting_participant_meeting_member'),
+    ('meeting_objective', 'objective_id', 'uq_meeting_objective_meeting_objective'),
+    ('meeting_key_result', 'key_result_id', 'uq_meeting_key_result_meeting_key_result'),
+]
+
+# Primary keys are already indexed; these duplicates only slow down writes
+PRIMARY_KEY_INDEXES = [
+    'user',
+    'message',
+    'member',
+    'objective',
+    'key_result',
+    'meeting',
+    'meeting_participant',
+    'meeting_objective',
+    'meeting_key_result',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Drop duplicate links so the unique indexes can be built
+    for table, column, _ in MEETING_LINKS:
+        op.execute(
+            f"""
+            DELETE FROM {table} a USING {table} b
+            WHERE a.meeting_id = b.meeting_id
+              AND a.{column} = b.{column}
+              AND a.id > b.id
+            """
+        )
+    # Build indexes without blocking writes on a live database
+    with op.get_context().autocommit_block():
+        for table, column in FOREIGN_KEY_INDEXES:
+            op.create_index(
+                op.f(f'ix_{table}_{column}'), table, [column],
+                unique=False, postgresql_concurrently=True,
+            )
+        for table, column, name in MEETING_LINKS:
+            op.create_index(
+                name, table, ['meeting_id', column],
+                unique=True, postgresql_concurrently=True,
+            )
+            op.execute(
+                f'ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE USING INDEX {name}'
+            )
+        for table in PRIMARY_KEY_INDEXES:
+            op.drop_index(
+                op.f(f'ix_{table}_id'), table_name=table,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table in PRIMARY_KEY_INDEXES:
+            op.create_index(
+                op.f(f'ix_{table}_id'), table, ['id'],
+                unique=False, postgresql_concurrently=True,
+            )
+        for table, column, name in MEETING_LINKS:
+            op.drop_constraint(name, table, type_='unique')
+        for table, column in FOREIGN_KEY_INDEXES:
+            op.drop_index(
+                op.f(f'ix_{table}_{column}'), table_name=table,
+                postgresql_concurrently=True,
+            )
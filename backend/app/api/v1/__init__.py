@@ -1,5 +1,19 @@
 from fastapi import APIRouter
-from .endpoints import health, users, oauth, messages, members, objectives, key_results, meetings
+from .endpoints import (
+    health,
+    users,
+    oauth,
+    messages,
+    members,
+    objectives,
+    key_results,
+    meetings,
+    enums,
+    reports,
+    workspace,
+    export,
+    bulk_import,
+)
 
 api_v1_router = APIRouter()
 api_v1_router.include_router(health.router)
@@ -10,3 +24,8 @@ api_v1_router.include_router(members.router)
 api_v1_router.include_router(objectives.router)
 api_v1_router.include_router(key_results.router)
 api_v1_router.include_router(meetings.router)
+api_v1_router.include_router(enums.router)
+api_v1_router.include_router(reports.router)
+api_v1_router.include_router(workspace.router)
+api_v1_router.include_router(export.router)
+api_v1_router.include_router(bulk_import.router)
@@ -1,14 +1,113 @@
-from typing import Generator
-from app.db.session import SessionLocal
+from typing import Any, AsyncGenerator, Literal, Optional, Sequence, Union
+from fastapi import Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.crud.pagination import (
+    SortKey,
+    decode_cursor,
+    encode_cursor,
+)
+from app.db.session import AsyncSessionLocal, SessionLocal
+import hashlib
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+# Either session type; pass it to app.crud.aio, which handles both
+DbSession = Union[AsyncSession, Session]
 
-def get_db() -> Generator:
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+
+async def get_db() -> AsyncGenerator[DbSession, None]:
+    if settings.DB_ASYNC:
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            await run_in_threadpool(db.close)
+
+
+class Page:
+    """Pagination parameters shared by the list endpoints.
+
+    Pass ``cursor`` from the previous response's X-Next-Cursor header, with
+    the same sort, to page by key; ``skip`` is only used without a cursor.
+    ``limit`` is capped at MAX_PAGE_SIZE. With ``total`` the row count is
+    returned in X-Total-Count, either estimated from planner statistics or
+    exact.
+    """
+
+    def __init__(
+        self,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1),
+        cursor: Optional[str] = None,
+        total: Optional[Literal["estimated", "exact"]] = None,
+    ):
+        self.skip = skip
+        self.limit = min(limit, settings.MAX_PAGE_SIZE)
+        self.total = total
+        # Malformed cursors raise InvalidCursor, answered with 400 in app.main
+        self.after = decode_cursor(cursor) if cursor else None
+
+    @property
+    def exact(self) -> bool:
+        return self.total == "exact"
+
+    def set_headers(
+        self,
+        response: Response,
+        items: Sequence[Any],
+        total: Optional[int] = None,
+        sort: Sequence[SortKey] = (),
+    ) -> None:
+        if len(items) == self.limit:
+            last = items[-1]
+            if not isinstance(last, dict):
+                last = {f: getattr(last, f) for f in ["id", *(f for f, _ in sort)]}
+            values = [last[field] for field, _ in sort]
+            response.headers["X-Next-Cursor"] = encode_cursor(last["id"], values, sort)
+        if total is not None:
+            response.headers["X-Total-Count"] = str(total)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an ETag against an If-None-Match header."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in tags
+
+
+class Conditional:
+    """Conditional GET support for read endpoints.
+
+    Pass a version of the resource, such as ``(id, updated_at)`` or a
+    collection version, to ``check``. It derives a weak ETag scoped to the
+    request URL, sets it on the response and returns a 304 response when
+    the client already has that version, before anything is serialized.
+    """
+
+    def __init__(self, request: Request, response: Response):
+        self.request = request
+        self.response = response
+
+    def etag(self, *version: Any) -> str:
+        url = self.request.url
+        key = repr((url.path, url.query, *version)).encode()
+        return f'W/"{hashlib.sha1(key).hexdigest()}"'
+
+    def check(self, *version: Any) -> Optional[Response]:
+        etag = self.etag(*version)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        self.response.headers.update(headers)
+        if etag_matches(self.request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return None
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from app import schemas
+from app.api.v1.deps import DbSession, get_db
+from app.crud import aio
+from app.crud.crud_import import ImportFormat
+from app.api.v1.endpoints.oauth import read_users_me
+from app.schemas.bulk_import import ImportResult
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+router = APIRouter()
+
+
+@router.post(
+    "/import",
+    response_model=ImportResult,
+    status_code=status.HTTP_201_CREATED,
+    summary="Import members, objectives and key results",
+    tags=["Import"],
+)
+async def import_data(
+    request: Request,
+    response: Response,
+    format: ImportFormat = "ndjson",
+    dry_run: bool = False,
+    db: DbSession = Depends(get_db),
+    current_user: schemas.user.User = Depends(read_users_me),
+):
+    """
+    Create many members, objectives and key results in one transaction.
+    - **body**: NDJSON or CSV rows, each with ``type`` member, objective or
+      key_result, a ``key`` and the fields of its create endpoint;
+      ``supervisor_key``, ``member_key``, ``parent_key`` and ``objective_key``
+      refer to other rows by key, ``*_id`` fields to existing rows
+    - **dry_run**: check everything but write nothing (200)
+    - **Returns**: counts and the ids of new members and objectives by key
+    - **422** with every row error, in which case nothing is written
+    """
+    try:
+        text = (await request.body()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Body must be UTF-8")
+    result = await aio.crud_import.import_document(
+        db, text, format, dry_run=dry_run
+    )
+    if result["errors"]:
+        raise HTTPException(status_code=422, detail=result["errors"])
+    if dry_run:
+        response.status_code = status.HTTP_200_OK
+    return result
@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Request, Response, status
+from typing import Dict, List, Optional, Tuple
+from app.api.v1.deps import etag_matches
+from app.core.config import settings
+from app.models.key_result_enums import (
+    KeyResultComplexity,
+    KeyResultPriority,
+    KeyResultStatus,
+)
+from app.models.message_enums import MessagePriority
+from app.models.objective_enums import ObjectivePriority, ObjectiveStatus
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+router = APIRouter()
+
+ENUMS = {
+    "message_priorities": MessagePriority,
+    "objective_priorities": ObjectivePriority,
+    "objective_statuses": ObjectiveStatus,
+    "key_result_statuses": KeyResultStatus,
+    "key_result_priorities": KeyResultPriority,
+    "key_result_complexities": KeyResultComplexity,
+}
+
+
+def _serialize(value) -> Tuple[bytes, str]:
+    body = json.dumps(value, separators=(",", ":")).encode()
+    return body, f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+# Enums only change with a deploy, so every body and ETag is built once here
+_BODIES = {name: _serialize([e.value for e in enum]) for name, enum in ENUMS.items()}
+_CATALOGUE = _serialize({name: [e.value for e in enum] for name, enum in ENUMS.items()})
+
+
+def enum_response(request: Request, name: Optional[str] = None) -> Response:
+    """Pre-serialized values of one enum, or the whole catalogue without a name."""
+    body, etag = _BODIES[name] if name else _CATALOGUE
+    # The URLs are not versioned, so after max-age browsers revalidate with
+    # the ETag and pick up enum changes from a deploy
+    max_age = settings.ENUMS_CACHE_MAX_AGE_SECONDS
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={max_age}"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get(
+    "/enums",
+    response_model=Dict[str, List[str]],
+    summary="Get every enum",
+    tags=["Enums"],
+)
+async def get_enums(request: Request):
+    """
+    Get the values of every enum used by the API, keyed by name.
+    - **Returns**: e.g. ``{"objective_statuses": [...], ...}``, cacheable with ETag
+    """
+    return enum_response(request)
@@ -0,0 +1,126 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from typing import Annotated, AsyncIterator, List, Literal, Optional, Union
+from app import schemas
+from app.api.v1.deps import DbSession, get_db
+from app.core.config import settings
+from app.core.serialization import dump_json, dump_python
+from app.crud import aio
+from app.crud.crud_export import export_schema
+from app.api.v1.endpoints.oauth import read_users_me
+import csv
+import io
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+router = APIRouter()
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+async def _encode(
+    db: DbSession, statement, schema, format: ExportFormat
+) -> AsyncIterator[bytes]:
+    """One chunk per cursor batch: a JSON object per line, or CSV rows."""
+    if format == "csv":
+        fields = list(schema.model_fields)
+        yield (",".join(fields) + "\r\n").encode()
+    async for rows in aio.stream_rows(db, statement, settings.EXPORT_BATCH_SIZE):
+        if format == "csv":
+            out = io.StringIO()
+            csv.DictWriter(out, fieldnames=fields).writerows(
+                dump_python(List[schema], rows)
+            )
+            yield out.getvalue().encode()
+        else:
+            yield b"".join(dump_json(schema, row) + b"\n" for row in rows)
+
+
+async def export_response(
+    db: DbSession,
+    entity: str,
+    format: ExportFormat,
+    filters: Optional[
+        Union[schemas.objective.ObjectiveFilter, schemas.key_result.KeyResultFilter]
+    ] = None,
+) -> StreamingResponse:
+    # The snapshot starts here, so the session stays in this transaction
+    # (get_db closes it after the response) for every batch of the stream
+    await aio.crud_export.begin_snapshot(db)
+    statement = await aio.crud_export.export_statement(db, entity, filters=filters)
+    return StreamingResponse(
+        _encode(db, statement, export_schema(entity), format),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{entity}.{format}"',
+            # Let nginx pass each batch on instead of buffering the export
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@router.get(
+    "/export/objectives",
+    summary="Export objectives",
+    tags=["Export"],
+)
+async def export_objectives(
+    filters: Annotated[schemas.objective.ObjectiveFilter, Query()],
+    format: ExportFormat = "ndjson",
+    db: DbSession = Depends(get_db),
+    current_user: schemas.user.User = Depends(read_users_me),
+):
+    """
+    Stream every objective matching the filters of GET /objectives, by id.
+    - **format**: ``ndjson`` (one Objective per line) or ``csv``
+    - **Returns**: the whole result as one consistent snapshot; ``sort`` is ignored
+    """
+    return await export_response(db, "objectives", format, filters=filters)
+
+
+@router.get(
+    "/export/key-results",
+    summary="Export key results",
+    tags=["Export"],
+)
+async def export_key_results(
+    filters: Annotated[schemas.key_result.KeyResultFilter, Query()],
+    format: ExportFormat = "ndjson",
+    db: DbSession = Depends(get_db),
+    current_user: schemas.user.User = Depends(read_users_me),
+):
+    """
+    Stream every key result matching the filters of GET /key-results, by id.
+    - **format**: ``ndjson`` (one KeyResult per line) or ``csv``
+    - **Returns**: the whole result as one consistent snapshot; ``sort`` is ignored
+    """
+    return await export_response(db, "key-results", format, filters=filters)
+
+
+@router.get(
+    "/export/{entity}",
+    summary="Export members, meetings or meeting associations",
+    tags=["Export"],
+)
+async def export_entity(
+    entity: Literal[
+        "members",
+        "meetings",
+        "meeting-participants",
+        "meeting-objectives",
+        "meeting-key-results",
+    ],
+    format: ExportFormat = "ndjson",
+    db: DbSession = Depends(get_db),
+    current_user: schemas.user.User = Depends(read_users_me),
+):
+    """
+    Stream a whole table, by id, in the shape of its item endpoint.
+    - **format**: ``ndjson`` (one object per line) or ``csv``
+    - **Returns**: the whole table as one consistent snapshot
+    """
+    return await export_response(db, entity, format)
@@ -1,4 +1,8 @@
 from fastapi import APIRouter
+from app.core.cache import active_messages_cache, principal_cache
+from app.core.security import password_hasher
+from app.db.pool import pool_metrics
+from app.db.session import async_engine, engine
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,3 +23,26 @@ def healthcheck():
     Returns a simple status message.
     """
     return {"status": "ok"}
+
+
+@router.get(
+    "/health/metrics",
+    tags=["health"],
+    summary="Worker metrics",
+    response_description="Runtime counters of this worker process"
+)
+def metrics():
+    """
+    Runtime counters of the worker process serving the request.
+
+    Values are per worker; aggregate across workers when scraping.
+    """
+    return {
+        "principal_cache": principal_cache.stats(),
+        "active_messages_cache": active_messages_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "database_pool": {
+            "sync": pool_metrics(engine),
+            "async": pool_metrics(async_engine.sync_engine),
+        },
+    }
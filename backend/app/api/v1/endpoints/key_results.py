@@ -1,11 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, Response
+from typing import Annotated, List
 from app import schemas
-from app.api.v1.deps import get_db
-from app.crud import crud_key_result
+from app.api.v1.deps import Conditional, DbSession, Page, get_db
+from app.crud import aio
+from app.crud.pagination import parse_sort
 from app.api.v1.endpoints.oauth import read_users_me
-from app.models.key_result import KeyResultStatus, KeyResultPriority, KeyResultComplexity
+from app.api.v1.endpoints.enums import enum_response
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,13 +19,43 @@ router = APIRouter()
     summary="List key results",
     tags=["KeyResults"],
 )
-def read_key_results(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+async def read_key_results(
+    response: Response,
+    filters: Annotated[schemas.key_result.KeyResultFilter, Query()],
+    page: Page = Depends(),
+    conditional: Conditional = Depends(),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    return crud_key_result.get_key_results(db, skip=skip, limit=limit)
+    """
+    List key results, filtered and sorted in the database.
+    - **member_id**: repeat to include several members, e.g. a team
+    - **status**, **priority**, **complexity**: repeat to match any of the values
+    - **active_from**, **active_to**: only key results whose dates overlap this range
+    - **sort**: comma-separated fields, ``-`` descending, e.g. ``-priority,end_date``
+    - **Returns**: a page of key results; see X-Next-Cursor and X-Total-Count
+    - **304** if If-None-Match matches the ETag
+    """
+    sort = parse_sort(filters.sort, schemas.key_result.KEY_RESULT_SORT_FIELDS)
+    version = await aio.crud_key_result.get_key_results_version(db, filters=filters)
+    not_modified = conditional.check(*version)
+    if not_modified is not None:
+        return not_modified
+    key_results = await aio.crud_key_result.get_key_results(
+        db,
+        skip=page.skip,
+        limit=page.limit,
+        after=page.after,
+        filters=filters,
+        sort=sort,
+    )
+    total = None
+    if page.total:
+        total = await aio.crud_key_result.count_key_results(
+            db, exact=page.exact, filters=filters
+        )
+    page.set_headers(response, key_results, total, sort=sort)
+    return key_results
 
 @router.post(
     "/key-results",
@@ -34,12 +64,49 @@ def read_key_results(
     summary="Create key result",
     tags=["KeyResults"],
 )
-def create_key_result(
+async def create_key_result(
     key_result_in: schemas.key_result.KeyResultCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    return crud_key_result.create_key_result(db, key_result_in=key_result_in)
+    return await aio.crud_key_result.create_key_result(db, key_result_in=key_result_in)
+
+@router.patch(
+    "/key-results",
+    response_model=List[schemas.key_result.KeyResult],
+    summary="Check in many key results",
+    tags=["KeyResults"],
+)
+async def check_in_key_results(
+    check_ins: List[schemas.key_result.KeyResultCheckIn],
+    db: DbSession = Depends(get_db),
+    current_user: schemas.user.User = Depends(read_users_me),
+):
+    """
+    Update current_value and/or status of many key results in one transaction.
+    - **body**: a list of ``{id, current_value, status}``; omitted or null
+      fields keep their value, and each id may appear once
+    - **Returns**: the updated key results, by id
+    - **404** if any id does not exist, in which case nothing is changed
+    """
+    seen = set()
+    for check_in in check_ins:
+        if check_in.id in seen:
+            raise HTTPException(
+                status_code=422, detail=f"Duplicate key result id {check_in.id}"
+            )
+        seen.add(check_in.id)
+    if not check_ins:
+        return []
+    rows, missing = await aio.crud_key_result.check_in_key_results(
+        db, check_ins=check_ins
+    )
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Key results not found: {', '.join(map(str, missing))}",
+        )
+    return rows
 
 @router.get(
     "/key-results/{key_result_id}",
@@ -47,14 +114,18 @@ def create_key_result(
     summary="Get key result by ID",
     tags=["KeyResults"],
 )
-def read_key_result(
+async def read_key_result(
     key_result_id: int,
-    db: Session = Depends(get_db),
+    conditional: Conditional = Depends(),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    db_obj = crud_key_result.get_key_result(db, key_result_id=key_result_id)
+    db_obj = await aio.crud_key_result.get_key_result(db, key_result_id=key_result_id)
     if not db_obj:
         raise HTTPException(status_code=404, detail="Key result not found")
+    not_modified = conditional.check(db_obj.updated_at)
+    if not_modified is not None:
+        return not_modified
     return db_obj
 
 @router.put(
@@ -63,16 +134,18 @@ def read_key_result(
     summary="Update key result",
     tags=["KeyResults"],
 )
-def update_key_result(
+async def update_key_result(
     key_result_id: int,
     key_result_in: schemas.key_result.KeyResultUpdate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    db_obj = crud_key_result.get_key_result(db, key_result_id=key_result_id)
+    db_obj = await aio.crud_key_result.get_key_result(db, key_result_id=key_result_id)
     if not db_obj:
         raise HTTPException(status_code=404, detail="Key result not found")
-    return crud_key_result.update_key_result(db, db_obj=db_obj, key_result_in=key_result_in)
+    return await aio.crud_key_result.update_key_result(
+        db, db_obj=db_obj, key_result_in=key_result_in
+    )
 
 @router.delete(
     "/key-results/{key_result_id}",
@@ -80,15 +153,15 @@ def update_key_result(
     summary="Delete key result",
     tags=["KeyResults"],
 )
-def delete_key_result(
+async def delete_key_result(
     key_result_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    db_obj = crud_key_result.get_key_result(db, key_result_id=key_result_id)
+    db_obj = await aio.crud_key_result.get_key_result(db, key_result_id=key_result_id)
     if not db_obj:
         raise HTTPException(status_code=404, detail="Key result not found")
-    crud_key_result.delete_key_result(db, db_obj=db_obj)
+    await aio.crud_key_result.delete_key_result(db, db_obj=db_obj)
     return None
 
 @router.get(
@@ -97,8 +170,8 @@ def delete_key_result(
     summary="Get all key result statuses",
     tags=["KeyResults"],
 )
-def get_key_result_statuses():
-    return [e.value for e in KeyResultStatus]
+async def get_key_result_statuses(request: Request):
+    return enum_response(request, "key_result_statuses")
 
 @router.get(
     "/key-result-enums/priorities",
@@ -106,8 +179,8 @@ def get_key_result_statuses():
     summary="Get all key result priorities",
     tags=["KeyResults"],
 )
-def get_key_result_priorities():
-    return [e.value for e in KeyResultPriority]
+async def get_key_result_priorities(request: Request):
+    return enum_response(request, "key_result_priorities")
 
 @router.get(
     "/key-result-enums/complexities",
@@ -115,5 +188,5 @@ def get_key_result_priorities():
     summary="Get all key result complexities",
     tags=["KeyResults"],
 )
-def get_key_result_complexities():
-    return [e.value for e in KeyResultComplexity]
+async def get_key_result_complexities(request: Request):
+    return enum_response(request, "key_result_complexities")
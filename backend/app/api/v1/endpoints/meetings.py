@@ -1,12 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from typing import List
 from app import schemas
-from app.api.v1.deps import get_db
-from app.crud import crud_meeting
+from app.api.v1.deps import Conditional, DbSession, Page, get_db
+from app.crud import aio
+from app.crud.crud_meeting import ParticipantConflict
 from app.api.v1.endpoints.oauth import read_users_me
 from app.schemas.meeting import MeetingWithIDs
-from app.crud.crud_meeting import MeetingParticipant, MeetingObjective, MeetingKeyResult
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,14 +20,25 @@ router = APIRouter()
     summary="List meetings",
     tags=["Meetings"],
 )
-def read_meetings(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+async def read_meetings(
+    response: Response,
+    page: Page = Depends(),
+    conditional: Conditional = Depends(),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    meetings = crud_meeting.get_meetings(db, skip=skip, limit=limit)
-    return [crud_meeting.get_meeting_with_related_ids(db, m.id) for m in meetings]
+    version = await aio.crud_meeting.get_meetings_version(db)
+    not_modified = conditional.check(*version)
+    if not_modified is not None:
+        return not_modified
+    meetings = await aio.crud_meeting.get_meetings_with_related_ids(
+        db, skip=page.skip, limit=page.limit, after=page.after
+    )
+    total = None
+    if page.total:
+        total = await aio.crud_meeting.count_meetings(db, exact=page.exact)
+    page.set_headers(response, meetings, total)
+    return meetings
 
 
 @router.get(
@@ -37,12 +47,21 @@ def read_meetings(
     summary="Get meeting by ID",
     tags=["Meetings"],
 )
-def read_meeting(
+async def read_meeting(
     meeting_id: int,
-    db: Session = Depends(get_db),
+    conditional: Conditional = Depends(),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    meeting = crud_meeting.get_meeting_with_related_ids(db, meeting_id=meeting_id)
+    # The version covers the meeting's association rows as well
+    version = await aio.crud_meeting.get_meetings_version(db, meeting_id=meeting_id)
+    if version[1]:
+        not_modified = conditional.check(*version)
+        if not_modified is not None:
+            return not_modified
+    meeting = await aio.crud_meeting.get_meeting_with_related_ids(
+        db, meeting_id=meeting_id
+    )
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
     return meeting
@@ -55,12 +74,12 @@ def read_meeting(
     summary="Create meeting",
     tags=["Meetings"],
 )
-def create_meeting(
+async def create_meeting(
     meeting_in: schemas.meeting.MeetingCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    return crud_meeting.create_meeting(db, meeting_in=meeting_in)
+    return await aio.crud_meeting.create_meeting(db, meeting_in=meeting_in)
 
 
 @router.put(
@@ -69,16 +88,18 @@ def create_meeting(
     summary="Update meeting",
     tags=["Meetings"],
 )
-def update_meeting(
+async def update_meeting(
     meeting_id: int,
     meeting_in: schemas.meeting.MeetingUpdate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    db_meeting = crud_meeting.get_meeting(db, meeting_id=meeting_id)
+    db_meeting = await aio.crud_meeting.get_meeting(db, meeting_id=meeting_id)
     if not db_meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
-    return crud_meeting.update_meeting(db, db_meeting=db_meeting, meeting_in=meeting_in)
+    return await aio.crud_meeting.update_meeting(
+        db, db_meeting=db_meeting, meeting_in=meeting_in
+    )
 
 
 @router.delete(
@@ -87,15 +108,15 @@ def update_meeting(
     summary="Delete meeting",
     tags=["Meetings"],
 )
-def delete_meeting(
+async def delete_meeting(
     meeting_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    db_meeting = crud_meeting.get_meeting(db, meeting_id=meeting_id)
+    db_meeting = await aio.crud_meeting.get_meeting(db, meeting_id=meeting_id)
     if not db_meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
-    crud_meeting.delete_meeting(db, db_meeting=db_meeting)
+    await aio.crud_meeting.delete_meeting(db, db_meeting=db_meeting)
     return None
 
 
@@ -107,13 +128,13 @@ def delete_meeting(
     summary="Add participant",
     tags=["Meetings"],
 )
-def add_participant(
+async def add_participant(
     meeting_id: int,
     participant_in: schemas.meeting.MeetingParticipantCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    return crud_meeting.add_participant(
+    return await aio.crud_meeting.add_participant(
         db, meeting_id=meeting_id, participant_in=participant_in
     )
 
@@ -124,13 +145,15 @@ def add_participant(
     summary="Remove participant",
     tags=["Meetings"],
 )
-def remove_participant(
+async def remove_participant(
     meeting_id: int,
     member_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    crud_meeting.remove_participant(db, meeting_id=meeting_id, member_id=member_id)
+    await aio.crud_meeting.remove_participant(
+        db, meeting_id=meeting_id, member_id=member_id
+    )
     return None
 
 
@@ -140,17 +163,36 @@ def remove_participant(
     summary="Update participant association (replace member)",
     tags=["Meetings"],
 )
-def update_participant(
+async def update_participant(
     meeting_id: int,
     member_id: int,
     participant_in: schemas.meeting.MeetingParticipantCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    crud_meeting.remove_participant(db, meeting_id=meeting_id, member_id=member_id)
-    return crud_meeting.add_participant(
-        db, meeting_id=meeting_id, participant_in=participant_in
-    )
+    """
+    Replace the member of a participant link, or add the link.
+    - **Returns**: the participant link; unchanged if the member is the same
+    - **Raises**: 404 if meeting or new member not found, 409 if the new
+      member is already a participant
+    """
+    meeting = await aio.crud_meeting.get_meeting(db, meeting_id=meeting_id)
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    try:
+        participant = await aio.crud_meeting.update_participant(
+            db,
+            meeting_id=meeting_id,
+            member_id=member_id,
+            participant_in=participant_in,
+        )
+    except ParticipantConflict:
+        raise HTTPException(
+            status_code=409, detail="Member is already a participant"
+        )
+    if not participant:
+        raise HTTPException(status_code=404, detail="Member not found")
+    return participant
 
 
 @router.get(
@@ -159,16 +201,48 @@ def update_participant(
     summary="Get all participants for a meeting",
     tags=["Meetings"],
 )
-def get_meeting_participants(
+async def get_meeting_participants(
+    meeting_id: int,
+    db: DbSession = Depends(get_db),
+    current_user: schemas.user.User = Depends(read_users_me),
+):
+    meeting = await aio.crud_meeting.get_meeting(db, meeting_id=meeting_id)
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    participants = await aio.crud_meeting.get_participants(db, meeting_id=meeting_id)
+    return participants
+
+
+@router.put(
+    "/meetings/{meeting_id}/participants",
+    response_model=List[schemas.meeting.MeetingParticipant],
+    summary="Replace all participants of a meeting",
+    tags=["Meetings"],
+)
+async def replace_meeting_participants(
     meeting_id: int,
-    db: Session = Depends(get_db),
+    participants_in: List[schemas.meeting.MeetingParticipantCreate],
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    meeting = crud_meeting.get_meeting(db, meeting_id=meeting_id)
+    """
+    Replace the participants of a meeting with the given set in one transaction.
+    - **Returns**: the resulting participants
+    - **Raises**: 404 if meeting or any listed member not found,
+      in which case nothing is changed
+    """
+    meeting = await aio.crud_meeting.get_meeting(db, meeting_id=meeting_id)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
-    participants = db.query(MeetingParticipant).filter_by(meeting_id=meeting_id).all()
-    return [schemas.meeting.MeetingParticipant.model_validate(p) for p in participants]
+    links, missing = await aio.crud_meeting.replace_participants(
+        db, meeting_id=meeting_id, participants_in=participants_in
+    )
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Members not found: {', '.join(map(str, missing))}",
+        )
+    return links
 
 
 @router.get(
@@ -177,23 +251,21 @@ def get_meeting_participants(
     summary="Get a specific participant for a meeting",
     tags=["Meetings"],
 )
-def get_meeting_participant(
+async def get_meeting_participant(
     meeting_id: int,
     member_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    meeting = crud_meeting.get_meeting(db, meeting_id=meeting_id)
+    meeting = await aio.crud_meeting.get_meeting(db, meeting_id=meeting_id)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
-    participant = (
-        db.query(MeetingParticipant)
-        .filter_by(meeting_id=meeting_id, member_id=member_id)
-        .first()
+    participant = await aio.crud_meeting.get_participant(
+        db, meeting_id=meeting_id, member_id=member_id
     )
     if not participant:
         raise HTTPException(status_code=404, detail="Participant not found")
-    return schemas.meeting.MeetingParticipant.model_validate(participant)
+    return participant
 
 
 # Objectives
@@ -204,13 +276,13 @@ def get_meeting_participant(
     summary="Add objective association",
     tags=["Meetings"],
 )
-def add_objective(
+async def add_objective(
     meeting_id: int,
     objective_in: schemas.meeting.MeetingObjectiveCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    return crud_meeting.add_objective(
+    return await aio.crud_meeting.add_objective(
         db, meeting_id=meeting_id, objective_in=objective_in
     )
 
@@ -221,13 +293,15 @@ def add_objective(
     summary="Remove objective association",
     tags=["Meetings"],
 )
-def remove_objective(
+async def remove_objective(
     meeting_id: int,
     objective_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    crud_meeting.remove_objective(db, meeting_id=meeting_id, objective_id=objective_id)
+    await aio.crud_meeting.remove_objective(
+        db, meeting_id=meeting_id, objective_id=objective_id
+    )
     return None
 
 
@@ -237,24 +311,19 @@ def remove_objective(
     summary="Update meeting-objective association note",
     tags=["Meetings"],
 )
-def update_objective_association(
+async def update_objective_association(
     meeting_id: int,
     objective_id: int,
     update_in: schemas.meeting.MeetingObjectiveCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    obj = (
-        db.query(crud_meeting.MeetingObjective)
-        .filter_by(meeting_id=meeting_id, objective_id=objective_id)
-        .first()
+    obj = await aio.crud_meeting.get_objective_link(
+        db, meeting_id=meeting_id, objective_id=objective_id
     )
     if not obj:
         raise HTTPException(status_code=404, detail="Association not found")
-    obj.note = update_in.note
-    db.commit()
-    db.refresh(obj)
-    return obj
+    return await aio.crud_meeting.update_link_note(db, link=obj, note=update_in.note)
 
 
 @router.get(
@@ -263,16 +332,48 @@ def update_objective_association(
     summary="Get all objective associations for a meeting",
     tags=["Meetings"],
 )
-def get_meeting_objectives(
+async def get_meeting_objectives(
     meeting_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    meeting = crud_meeting.get_meeting(db, meeting_id=meeting_id)
+    meeting = await aio.crud_meeting.get_meeting(db, meeting_id=meeting_id)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
-    objectives = db.query(MeetingObjective).filter_by(meeting_id=meeting_id).all()
-    return [schemas.meeting.MeetingObjective.model_validate(o) for o in objectives]
+    objectives = await aio.crud_meeting.get_objective_links(db, meeting_id=meeting_id)
+    return objectives
+
+
+@router.put(
+    "/meetings/{meeting_id}/objectives",
+    response_model=List[schemas.meeting.MeetingObjective],
+    summary="Replace all objective associations of a meeting",
+    tags=["Meetings"],
+)
+async def replace_meeting_objectives(
+    meeting_id: int,
+    objectives_in: List[schemas.meeting.MeetingObjectiveCreate],
+    db: DbSession = Depends(get_db),
+    current_user: schemas.user.User = Depends(read_users_me),
+):
+    """
+    Replace the objective associations of a meeting with the given set in one transaction.
+    - **Returns**: the resulting objective associations
+    - **Raises**: 404 if meeting or any listed objective not found,
+      in which case nothing is changed
+    """
+    meeting = await aio.crud_meeting.get_meeting(db, meeting_id=meeting_id)
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    links, missing = await aio.crud_meeting.replace_objectives(
+        db, meeting_id=meeting_id, objectives_in=objectives_in
+    )
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Objectives not found: {', '.join(map(str, missing))}",
+        )
+    return links
 
 
 @router.get(
@@ -281,23 +382,21 @@ def get_meeting_objectives(
     summary="Get a specific objective association for a meeting",
     tags=["Meetings"],
 )
-def get_meeting_objective(
+async def get_meeting_objective(
     meeting_id: int,
     objective_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    meeting = crud_meeting.get_meeting(db, meeting_id=meeting_id)
+    meeting = await aio.crud_meeting.get_meeting(db, meeting_id=meeting_id)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
-    objective = (
-        db.query(MeetingObjective)
-        .filter_by(meeting_id=meeting_id, objective_id=objective_id)
-        .first()
+    objective = await aio.crud_meeting.get_objective_link(
+        db, meeting_id=meeting_id, objective_id=objective_id
     )
     if not objective:
         raise HTTPException(status_code=404, detail="Objective association not found")
-    return schemas.meeting.MeetingObjective.model_validate(objective)
+    return objective
 
 
 # Key Results
@@ -308,13 +407,13 @@ def get_meeting_objective(
     summary="Add key result association",
     tags=["Meetings"],
 )
-def add_key_result(
+async def add_key_result(
     meeting_id: int,
     key_result_in: schemas.meeting.MeetingKeyResultCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    return crud_meeting.add_key_result(
+    return await aio.crud_meeting.add_key_result(
         db, meeting_id=meeting_id, key_result_in=key_result_in
     )
 
@@ -325,13 +424,13 @@ def add_key_result(
     summary="Remove key result association",
     tags=["Meetings"],
 )
-def remove_key_result(
+async def remove_key_result(
     meeting_id: int,
     key_result_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    crud_meeting.remove_key_result(
+    await aio.crud_meeting.remove_key_result(
         db, meeting_id=meeting_id, key_result_id=key_result_id
     )
     return None
@@ -343,24 +442,19 @@ def remove_key_result(
     summary="Update meeting-key_result association note",
     tags=["Meetings"],
 )
-def update_key_result_association(
+async def update_key_result_association(
     meeting_id: int,
     key_result_id: int,
     update_in: schemas.meeting.MeetingKeyResultCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    kr = (
-        db.query(crud_meeting.MeetingKeyResult)
-        .filter_by(meeting_id=meeting_id, key_result_id=key_result_id)
-        .first()
+    kr = await aio.crud_meeting.get_key_result_link(
+        db, meeting_id=meeting_id, key_result_id=key_result_id
     )
     if not kr:
         raise HTTPException(status_code=404, detail="Association not found")
-    kr.note = update_in.note
-    db.commit()
-    db.refresh(kr)
-    return kr
+    return await aio.crud_meeting.update_link_note(db, link=kr, note=update_in.note)
 
 
 @router.get(
@@ -369,16 +463,48 @@ def update_key_result_association(
     summary="Get all key result associations for a meeting",
     tags=["Meetings"],
 )
-def get_meeting_key_results(
+async def get_meeting_key_results(
     meeting_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    meeting = crud_meeting.get_meeting(db, meeting_id=meeting_id)
+    meeting = await aio.crud_meeting.get_meeting(db, meeting_id=meeting_id)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
-    key_results = db.query(MeetingKeyResult).filter_by(meeting_id=meeting_id).all()
-    return [schemas.meeting.MeetingKeyResult.model_validate(kr) for kr in key_results]
+    key_results = await aio.crud_meeting.get_key_result_links(db, meeting_id=meeting_id)
+    return key_results
+
+
+@router.put(
+    "/meetings/{meeting_id}/key-results",
+    response_model=List[schemas.meeting.MeetingKeyResult],
+    summary="Replace all key result associations of a meeting",
+    tags=["Meetings"],
+)
+async def replace_meeting_key_results(
+    meeting_id: int,
+    key_results_in: List[schemas.meeting.MeetingKeyResultCreate],
+    db: DbSession = Depends(get_db),
+    current_user: schemas.user.User = Depends(read_users_me),
+):
+    """
+    Replace the key result associations of a meeting with the given set in one transaction.
+    - **Returns**: the resulting key result associations
+    - **Raises**: 404 if meeting or any listed key result not found,
+      in which case nothing is changed
+    """
+    meeting = await aio.crud_meeting.get_meeting(db, meeting_id=meeting_id)
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    links, missing = await aio.crud_meeting.replace_key_results(
+        db, meeting_id=meeting_id, key_results_in=key_results_in
+    )
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Key results not found: {', '.join(map(str, missing))}",
+        )
+    return links
 
 
 @router.get(
@@ -387,50 +513,42 @@ def get_meeting_key_results(
     summary="Get a specific key result association for a meeting",
     tags=["Meetings"],
 )
-def get_meeting_key_result(
+async def get_meeting_key_result(
     meeting_id: int,
     key_result_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    meeting = crud_meeting.get_meeting(db, meeting_id=meeting_id)
+    meeting = await aio.crud_meeting.get_meeting(db, meeting_id=meeting_id)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
-    key_result = (
-        db.query(MeetingKeyResult)
-        .filter_by(meeting_id=meeting_id, key_result_id=key_result_id)
-        .first()
+    key_result = await aio.crud_meeting.get_key_result_link(
+        db, meeting_id=meeting_id, key_result_id=key_result_id
     )
     if not key_result:
         raise HTTPException(status_code=404, detail="Key result association not found")
-    return schemas.meeting.MeetingKeyResult.model_validate(key_result)
+    return key_result
 
 
 @router.get(
     "/meetings/{meeting_id}/associations",
-    response_model=dict,
+    response_model=schemas.meeting.MeetingAssociations,
     summary="Get all associations for a meeting",
     tags=["Meetings"],
 )
-def get_meeting_associations(
+async def get_meeting_associations(
     meeting_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    meeting = crud_meeting.get_meeting(db, meeting_id=meeting_id)
+    meeting = await aio.crud_meeting.get_meeting(db, meeting_id=meeting_id)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
-    participants = db.query(MeetingParticipant).filter_by(meeting_id=meeting_id).all()
-    objectives = db.query(MeetingObjective).filter_by(meeting_id=meeting_id).all()
-    key_results = db.query(MeetingKeyResult).filter_by(meeting_id=meeting_id).all()
+    participants = await aio.crud_meeting.get_participants(db, meeting_id=meeting_id)
+    objectives = await aio.crud_meeting.get_objective_links(db, meeting_id=meeting_id)
+    key_results = await aio.crud_meeting.get_key_result_links(db, meeting_id=meeting_id)
     return {
-        "participants": [
-            schemas.meeting.MeetingParticipant.model_validate(p) for p in participants
-        ],
-        "objectives": [
-            schemas.meeting.MeetingObjective.model_validate(o) for o in objectives
-        ],
-        "key_results": [
-            schemas.meeting.MeetingKeyResult.model_validate(kr) for kr in key_results
-        ],
+        "participants": participants,
+        "objectives": objectives,
+        "key_results": key_results,
     }
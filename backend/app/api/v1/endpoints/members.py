@@ -1,9 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Response
+from typing import List, Optional
 from app import schemas
-from app.crud import crud_member
-from app.api.v1.deps import get_db
+from app.crud import aio
+from app.crud.crud_member import SupervisorCycle
+from app.api.v1.deps import Conditional, DbSession, Page, get_db
 from app.api.v1.endpoints.oauth import read_users_me
 import logging
 
@@ -19,13 +19,25 @@ router = APIRouter()
     summary="List members",
     tags=["Members"],
 )
-def read_members(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+async def read_members(
+    response: Response,
+    page: Page = Depends(),
+    conditional: Conditional = Depends(),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    return crud_member.get_members(db, skip=skip, limit=limit)
+    version = await aio.crud_member.get_members_version(db)
+    not_modified = conditional.check(*version)
+    if not_modified is not None:
+        return not_modified
+    members = await aio.crud_member.get_members(
+        db, skip=page.skip, limit=page.limit, after=page.after
+    )
+    total = None
+    if page.total:
+        total = await aio.crud_member.count_members(db, exact=page.exact)
+    page.set_headers(response, members, total)
+    return members
 
 
 @router.post(
@@ -35,12 +47,12 @@ def read_members(
     summary="Create member",
     tags=["Members"],
 )
-def create_member(
+async def create_member(
     member_in: schemas.member.MemberCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    return crud_member.create_member(db, member_in=member_in)
+    return await aio.crud_member.create_member(db, member_in=member_in)
 
 
 @router.get(
@@ -49,14 +61,18 @@ def create_member(
     summary="Get member by ID",
     tags=["Members"],
 )
-def read_member(
+async def read_member(
     member_id: int,
-    db: Session = Depends(get_db),
+    conditional: Conditional = Depends(),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    db_member = crud_member.get_member(db, member_id=member_id)
+    db_member = await aio.crud_member.get_member(db, member_id=member_id)
     if not db_member:
         raise HTTPException(status_code=404, detail="Member not found")
+    not_modified = conditional.check(db_member.updated_at)
+    if not_modified is not None:
+        return not_modified
     return db_member
 
 
@@ -66,16 +82,24 @@ def read_member(
     summary="Update member",
     tags=["Members"],
 )
-def update_member(
+async def update_member(
     member_id: int,
     member_in: schemas.member.MemberUpdate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    db_member = crud_member.get_member(db, member_id=member_id)
+    db_member = await aio.crud_member.get_member(db, member_id=member_id)
     if not db_member:
         raise HTTPException(status_code=404, detail="Member not found")
-    return crud_member.update_member(db, db_member=db_member, member_in=member_in)
+    try:
+        return await aio.crud_member.update_member(
+            db, db_member=db_member, member_in=member_in
+        )
+    except SupervisorCycle:
+        raise HTTPException(
+            status_code=400,
+            detail="Supervisor cannot be the member or one of its subordinates",
+        )
 
 
 @router.delete(
@@ -84,15 +108,15 @@ def update_member(
     summary="Delete member",
     tags=["Members"],
 )
-def delete_member(
+async def delete_member(
     member_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    db_member = crud_member.get_member(db, member_id=member_id)
+    db_member = await aio.crud_member.get_member(db, member_id=member_id)
     if not db_member:
         raise HTTPException(status_code=404, detail="Member not found")
-    crud_member.delete_member(db, db_member=db_member)
+    await aio.crud_member.delete_member(db, db_member=db_member)
     return None
 
 
@@ -102,21 +126,19 @@ def delete_member(
     summary="Get supervisor of a member",
     tags=["Members"],
 )
-def get_member_supervisor(
+async def get_member_supervisor(
     member_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    db_member = crud_member.get_member(db, member_id=member_id)
+    db_member = await aio.crud_member.get_member(
+        db, member_id=member_id, load="with_supervisor"
+    )
     if not db_member:
         raise HTTPException(status_code=404, detail="Member not found")
-    supervisor_id = getattr(db_member, "supervisor_id", None)
-    if not supervisor_id:
+    if not db_member.supervisor:
         raise HTTPException(status_code=404, detail="Supervisor not found")
-    db_supervisor = crud_member.get_member(db, member_id=supervisor_id)
-    if not db_supervisor:
-        raise HTTPException(status_code=404, detail="Supervisor not found")
-    return db_supervisor
+    return db_member.supervisor
 
 
 @router.get(
@@ -125,12 +147,14 @@ def get_member_supervisor(
     summary="Get subordinates of a member",
     tags=["Members"],
 )
-def get_member_subordinates(
+async def get_member_subordinates(
     member_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    subordinates = crud_member.get_members_by_supervisor(db, supervisor_id=member_id)
+    subordinates = await aio.crud_member.get_members_by_supervisor(
+        db, supervisor_id=member_id
+    )
     return subordinates
 
 
@@ -140,23 +164,37 @@ def get_member_subordinates(
     summary="Get top manager for a member (recursive supervisor lookup)",
     tags=["Members"],
 )
-def get_top_manager(
+async def get_top_manager(
     member_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    current_id = member_id
-    visited = set()
-    while True:
-        db_member = crud_member.get_member(db, member_id=current_id)
-        if not db_member:
-            raise HTTPException(status_code=404, detail="Member not found")
-        supervisor_id = getattr(db_member, "supervisor_id", None)
-        if not supervisor_id or supervisor_id in visited:
-            # No supervisor or circular reference, return current member as top manager
-            return db_member
-        visited.add(current_id)
-        current_id = supervisor_id
+    chain = await aio.crud_member.get_supervisor_chain(db, member_id=member_id)
+    if not chain:
+        raise HTTPException(status_code=404, detail="Member not found")
+    return chain[-1]
+
+
+@router.get(
+    "/members/{member_id}/ancestors",
+    response_model=List[schemas.member.Member],
+    summary="Get supervisors of a member up to the top manager",
+    tags=["Members"],
+)
+async def get_member_ancestors(
+    member_id: int,
+    db: DbSession = Depends(get_db),
+    current_user: schemas.user.User = Depends(read_users_me),
+):
+    """
+    Get the supervisor chain of a member.
+    - **Returns**: supervisors ordered from the direct supervisor to the top manager
+    - **Raises**: 404 if member not found
+    """
+    chain = await aio.crud_member.get_supervisor_chain(db, member_id=member_id)
+    if not chain:
+        raise HTTPException(status_code=404, detail="Member not found")
+    return chain[1:]
 
 
 @router.get(
@@ -165,12 +203,12 @@ def get_top_manager(
     summary="Get member by user id",
     tags=["Members"],
 )
-def get_member_by_user(
+async def get_member_by_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    db_member = crud_member.get_member_by_user_id(db, user_id=user_id)
+    db_member = await aio.crud_member.get_member_by_user_id(db, user_id=user_id)
     if not db_member:
         raise HTTPException(status_code=404, detail="Member not found for user")
     return db_member
@@ -182,22 +220,39 @@ def get_member_by_user(
     summary="Get organization tree for a member (all subordinates recursively)",
     tags=["Members"],
 )
-def get_org_tree(
+async def get_org_tree(
+    member_id: int,
+    max_depth: Optional[int] = Query(None, ge=0),
+    db: DbSession = Depends(get_db),
+    current_user: schemas.user.User = Depends(read_users_me),
+):
+    return await aio.crud_member.get_subtree(
+        db, member_id=member_id, max_depth=max_depth
+    )
+
+
+@router.get(
+    "/members/{member_id}/org-chart",
+    response_model=schemas.member.OrgChartNode,
+    summary="Get nested organization chart for a member",
+    tags=["Members"],
+)
+async def get_org_chart(
     member_id: int,
-    db: Session = Depends(get_db),
+    depth: int = Query(2, ge=0),
+    expand: List[int] = Query([]),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    def collect_subtree(mid, visited):
-        if mid in visited:
-            return []
-        visited.add(mid)
-        member = crud_member.get_member(db, member_id=mid)
-        if not member:
-            return []
-        subs = crud_member.get_members_by_supervisor(db, supervisor_id=mid)
-        subtree = [member]
-        for sub in subs:
-            subtree.extend(collect_subtree(sub.id, visited))
-        return subtree
-
-    return collect_subtree(member_id, set())
+    """
+    Get the organization chart below a member as a nested tree.
+    - **depth**: number of levels below the member to include
+    - **expand**: member IDs whose direct subordinates are included beyond depth
+    - **Raises**: 404 if member not found
+    """
+    chart = await aio.crud_member.get_org_chart(
+        db, member_id=member_id, depth=depth, expand=expand
+    )
+    if not chart:
+        raise HTTPException(status_code=404, detail="Member not found")
+    return chart
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Response
 from typing import List
 from app.schemas.message import Message, MessageCreate, MessageUpdate
-from app.crud import crud_message
-from app.api.v1.deps import get_db
+from app.core.cache import active_messages_cache
+from app.core.config import settings
+from app.core.serialization import dump_json
+from app.crud import aio
+from app.api.v1.deps import Conditional, DbSession, Page, etag_matches, get_db
 from app.api.v1.endpoints.oauth import read_users_me
-from app.models.message_enums import MessagePriority
+from app.api.v1.endpoints.enums import enum_response
+import hashlib
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,8 +24,54 @@ router = APIRouter()
     summary="List messages",
     tags=["Messages"],
 )
-def list_messages(db: Session = Depends(get_db)):
-    return crud_message.get_messages(db)
+async def list_messages(
+    response: Response,
+    page: Page = Depends(),
+    conditional: Conditional = Depends(),
+    db: DbSession = Depends(get_db),
+):
+    """
+    List messages.
+    - **Returns**: a page of messages; 304 when If-None-Match matches
+    """
+    version = await aio.crud_message.get_messages_version(db)
+    not_modified = conditional.check(*version)
+    if not_modified is not None:
+        return not_modified
+    messages = await aio.crud_message.get_messages(
+        db, skip=page.skip, limit=page.limit, after=page.after
+    )
+    total = None
+    if page.total:
+        total = await aio.crud_message.count_messages(db, exact=page.exact)
+    page.set_headers(response, messages, total)
+    return messages
+
+
+@router.get(
+    "/messages/active",
+    response_model=List[Message],
+    summary="List messages to display today",
+    tags=["Messages"],
+)
+async def list_active_messages(request: Request, db: DbSession = Depends(get_db)):
+    """
+    Messages whose display window includes today, highest priority first.
+    - **Returns**: cacheable list with ETag; 304 when If-None-Match matches
+    """
+    today = date.today()
+    cached = active_messages_cache.get(today)
+    if cached is None:
+        messages = await aio.crud_message.get_active_messages(db, on=today)
+        body = dump_json(List[Message], messages)
+        cached = (f'"{hashlib.sha1(body).hexdigest()}"', body)
+        active_messages_cache.set(today, cached)
+    etag, body = cached
+    max_age = settings.ACTIVE_MESSAGES_CACHE_TTL_SECONDS
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={max_age}"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get(
@@ -30,10 +80,17 @@ def list_messages(db: Session = Depends(get_db)):
     summary="Get message",
     tags=["Messages"],
 )
-def get_message(message_id: int, db: Session = Depends(get_db)):
-    db_message = crud_message.get_message(db, message_id)
+async def get_message(
+    message_id: int,
+    conditional: Conditional = Depends(),
+    db: DbSession = Depends(get_db),
+):
+    db_message = await aio.crud_message.get_message(db, message_id)
     if not db_message:
         raise HTTPException(status_code=404, detail="Message not found")
+    not_modified = conditional.check(db_message.updated_at)
+    if not_modified is not None:
+        return not_modified
     return db_message
 
 
@@ -44,12 +101,12 @@ def get_message(message_id: int, db: Session = Depends(get_db)):
     summary="Create message",
     tags=["Messages"],
 )
-def create_message(
+async def create_message(
     message_in: MessageCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user=Depends(read_users_me),
 ):
-    return crud_message.create_message(db, message_in)
+    return await aio.crud_message.create_message(db, message_in)
 
 
 @router.put(
@@ -58,16 +115,16 @@ def create_message(
     summary="Update message",
     tags=["Messages"],
 )
-def update_message(
+async def update_message(
     message_id: int,
     message_in: MessageUpdate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user=Depends(read_users_me),
 ):
-    db_message = crud_message.get_message(db, message_id)
+    db_message = await aio.crud_message.get_message(db, message_id)
     if not db_message:
         raise HTTPException(status_code=404, detail="Message not found")
-    return crud_message.update_message(db, db_message, message_in)
+    return await aio.crud_message.update_message(db, db_message, message_in)
 
 
 @router.delete(
@@ -76,19 +133,21 @@ def update_message(
     summary="Delete message",
     tags=["Messages"],
 )
-def delete_message(
-    message_id: int, db: Session = Depends(get_db), current_user=Depends(read_users_me)
+async def delete_message(
+    message_id: int,
+    db: DbSession = Depends(get_db),
+    current_user=Depends(read_users_me),
 ):
-    db_message = crud_message.get_message(db, message_id)
+    db_message = await aio.crud_message.get_message(db, message_id)
     if not db_message:
         raise HTTPException(status_code=404, detail="Message not found")
-    crud_message.delete_message(db, db_message)
+    await aio.crud_message.delete_message(db, db_message)
     return None
 
 
 @router.get("/message-enums/priorities", response_model=list[str], tags=["Messages"], summary="Get possible message priorities")
-def get_message_priorities():
+async def get_message_priorities(request: Request):
     """
     Get all possible values for MessagePriority enum.
     """
-    return [priority.value for priority in MessagePriority]
+    return enum_response(request, "message_priorities")
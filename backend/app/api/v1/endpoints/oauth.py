@@ -1,13 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Cookie
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
 from datetime import timedelta, datetime
-from app.api.v1.deps import get_db
-from app.crud import crud_user
+from app.api.v1.deps import DbSession, get_db
+from app.crud import aio
 from app.schemas.user import User as UserSchema, UserPasswordChange
 from app.core.config import settings
+from app.core.cache import principal_cache
+from app.core.security import get_password_hash_async, verify_password_async
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,21 +20,12 @@ ALGORITHM = settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 REFRESH_TOKEN_EXPIRE_MINUTES = settings.REFRESH_TOKEN_EXPIRE_MINUTES
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=settings.OAUTH2_TOKEN_URL)
 
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
-
-
-def authenticate_user(db, user_name: str, password: str):
-    user = (
-        db.query(crud_user.User).filter(crud_user.User.user_name == user_name).first()
-        if hasattr(crud_user, "User")
-        else crud_user.get_user_by_email(db, email=user_name)
-    )
-    if not user or not verify_password(password, user.hashed_password):
+async def authenticate_user(db: DbSession, user_name: str, password: str):
+    user = await aio.crud_user.get_user_by_user_name(db, user_name=user_name)
+    if not user or not await verify_password_async(password, user.hashed_password):
         return None
     return user
 
@@ -67,17 +58,17 @@ def create_refresh_token(data: dict, expires_delta: timedelta = None):
     tags=["OAuth2"],
     response_description="JWT access token",
 )
-def login_for_access_token(
+async def login_for_access_token(
     response: Response,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ):
     """
     Obtain a JWT access token by providing user credentials (user_name and password).
     - **Returns**: access token and token type
     - **Raises**: 401 if authentication fails
     """
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -140,10 +131,12 @@ def refresh_access_token(
     tags=["OAuth2"],
     response_description="Current authenticated user info",
 )
-def read_users_me(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def read_users_me(
+    token: str = Depends(oauth2_scheme), db: DbSession = Depends(get_db)
+):
     """
     Get information about the current authenticated user.
-    - **Returns**: user details
+    - **Returns**: user details, served from the principal cache when possible
     - **Raises**: 401 if token is invalid or user not found
     """
     credentials_exception = HTTPException(
@@ -158,14 +151,16 @@ def read_users_me(token: str = Depends(oauth2_scheme), db: Session = Depends(get
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = (
-        db.query(crud_user.User).filter(crud_user.User.user_name == user_name).first()
-        if hasattr(crud_user, "User")
-        else None
-    )
+    cached_user = principal_cache.get(user_name)
+    if cached_user is not None:
+        return cached_user
+    user = await aio.crud_user.get_user_by_user_name(db, user_name=user_name)
     if user is None:
         raise credentials_exception
-    return user
+    # Cache a detached copy so it can be shared across requests
+    current_user = UserSchema.model_validate(user)
+    principal_cache.set(user_name, current_user)
+    return current_user
 
 
 @router.patch(
@@ -175,17 +170,18 @@ def read_users_me(token: str = Depends(oauth2_scheme), db: Session = Depends(get
     tags=["OAuth2"],
     response_description="Updated user profile",
 )
-def update_own_profile(
+async def update_own_profile(
     user_update: dict,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: UserSchema = Depends(read_users_me),
 ):
     """
     Update the profile of the currently authenticated user.
     - **Requires authentication**
+    - **422** if password is empty or null
     """
     user_id = current_user.id
-    db_user = crud_user.get_user(db, user_id=user_id)
+    db_user = await aio.crud_user.get_user(db, user_id=user_id)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -194,7 +190,15 @@ def update_own_profile(
 
     user_update_model = UserUpdate(**user_update)
 
-    return crud_user.update_user(db, db_user=db_user, user_in=user_update_model)
+    # Hash here, off the event loop; an empty or null password is refused
+    hashed_password = None
+    if "password" in user_update_model.model_fields_set:
+        if not user_update_model.password:
+            raise HTTPException(status_code=422, detail="Password must not be empty")
+        hashed_password = await get_password_hash_async(user_update_model.password)
+    return await aio.crud_user.update_user(
+        db, db_user=db_user, user_in=user_update_model, hashed_password=hashed_password
+    )
 
 
 @router.post(
@@ -204,9 +208,9 @@ def update_own_profile(
     tags=["OAuth2"],
     response_description="Password changed successfully",
 )
-def change_own_password(
+async def change_own_password(
     password_data: UserPasswordChange,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: UserSchema = Depends(read_users_me),
 ):
     """
@@ -215,20 +219,22 @@ def change_own_password(
     - **current_password must match the current password**
     """
     user_id = current_user.id
-    db_user = crud_user.get_user(db, user_id=user_id)
+    db_user = await aio.crud_user.get_user(db, user_id=user_id)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
 
     # Verify current password
-    if not pwd_context.verify(password_data.current_password, db_user.hashed_password):
+    if not await verify_password_async(
+        password_data.current_password, db_user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Incorrect current password"
         )
 
     # Update password
-    hashed_password = pwd_context.hash(password_data.new_password)
-    db_user.hashed_password = hashed_password
-    db.commit()
-    db.refresh(db_user)
+    hashed_password = await get_password_hash_async(password_data.new_password)
+    await aio.crud_user.set_password(
+        db, db_user=db_user, hashed_password=hashed_password
+    )
 
     return {"message": "Password updated successfully"}
@@ -1,11 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, Response
+from typing import Annotated, List, Optional
 from app import schemas
-from app.api.v1.deps import get_db
-from app.crud import crud_objective
+from app.api.v1.deps import Conditional, DbSession, Page, get_db
+from app.crud import aio
+from app.crud.pagination import parse_sort
 from app.api.v1.endpoints.oauth import read_users_me
-from app.models.objective_enums import ObjectivePriority, ObjectiveStatus
+from app.api.v1.endpoints.enums import enum_response
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,13 +19,43 @@ router = APIRouter()
     summary="List objectives",
     tags=["Objectives"],
 )
-def read_objectives(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+async def read_objectives(
+    response: Response,
+    filters: Annotated[schemas.objective.ObjectiveFilter, Query()],
+    page: Page = Depends(),
+    conditional: Conditional = Depends(),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    return crud_objective.get_objectives(db, skip=skip, limit=limit)
+    """
+    List objectives, filtered and sorted in the database.
+    - **member_id**: repeat to include several members, e.g. a team
+    - **status**, **priority**: repeat to match any of the values
+    - **active_from**, **active_to**: only objectives whose dates overlap this range
+    - **sort**: comma-separated fields, ``-`` descending, e.g. ``-priority,end_date``
+    - **Returns**: a page of objectives; see X-Next-Cursor and X-Total-Count
+    - **304** if If-None-Match matches the ETag
+    """
+    sort = parse_sort(filters.sort, schemas.objective.OBJECTIVE_SORT_FIELDS)
+    version = await aio.crud_objective.get_objectives_version(db, filters=filters)
+    not_modified = conditional.check(*version)
+    if not_modified is not None:
+        return not_modified
+    objectives = await aio.crud_objective.get_objectives(
+        db,
+        skip=page.skip,
+        limit=page.limit,
+        after=page.after,
+        filters=filters,
+        sort=sort,
+    )
+    total = None
+    if page.total:
+        total = await aio.crud_objective.count_objectives(
+            db, exact=page.exact, filters=filters
+        )
+    page.set_headers(response, objectives, total, sort=sort)
+    return objectives
 
 @router.post(
     "/objectives",
@@ -34,12 +64,12 @@ def read_objectives(
     summary="Create objective",
     tags=["Objectives"],
 )
-def create_objective(
+async def create_objective(
     objective_in: schemas.objective.ObjectiveCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    return crud_objective.create_objective(db, objective_in=objective_in)
+    return await aio.crud_objective.create_objective(db, objective_in=objective_in)
 
 @router.get(
     "/objectives/{objective_id}",
@@ -47,32 +77,92 @@ def create_objective(
     summary="Get objective by ID",
     tags=["Objectives"],
 )
-def read_objective(
+async def read_objective(
     objective_id: int,
-    db: Session = Depends(get_db),
+    conditional: Conditional = Depends(),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    db_obj = crud_objective.get_objective(db, objective_id=objective_id)
+    db_obj = await aio.crud_objective.get_objective(db, objective_id=objective_id)
     if not db_obj:
         raise HTTPException(status_code=404, detail="Objective not found")
+    not_modified = conditional.check(db_obj.updated_at)
+    if not_modified is not None:
+        return not_modified
     return db_obj
 
+@router.get(
+    "/objectives/{objective_id}/tree",
+    response_model=schemas.objective.ObjectiveTreeNode,
+    summary="Get objective hierarchy",
+    tags=["Objectives"],
+)
+async def read_objective_tree(
+    objective_id: int,
+    max_depth: Optional[int] = Query(None, ge=0),
+    db: DbSession = Depends(get_db),
+    current_user: schemas.user.User = Depends(read_users_me),
+):
+    """
+    Get an objective and its descendants as a nested tree.
+    - **max_depth**: number of levels below the objective to include
+    - **Returns**: nodes with their direct child and key result counts
+    - **Raises**: 404 if objective not found
+    """
+    tree = await aio.crud_objective.get_objective_tree(
+        db, objective_id=objective_id, max_depth=max_depth
+    )
+    if not tree:
+        raise HTTPException(status_code=404, detail="Objective not found")
+    return tree
+
+@router.get(
+    "/members/{member_id}/objective-tree",
+    response_model=List[schemas.objective.ObjectiveTreeNode],
+    summary="Get a member's objective hierarchy",
+    tags=["Objectives"],
+)
+async def read_member_objective_forest(
+    member_id: int,
+    max_depth: Optional[int] = Query(None, ge=0),
+    db: DbSession = Depends(get_db),
+    current_user: schemas.user.User = Depends(read_users_me),
+):
+    """
+    Get the member's top-level objectives, each with its descendants nested.
+    - **max_depth**: number of levels below each top-level objective to include
+    - **Returns**: nodes with their direct child and key result counts
+    """
+    return await aio.crud_objective.get_objective_forest(
+        db, member_id=member_id, max_depth=max_depth
+    )
+
 @router.put(
     "/objectives/{objective_id}",
     response_model=schemas.objective.Objective,
     summary="Update objective",
     tags=["Objectives"],
 )
-def update_objective(
+async def update_objective(
     objective_id: int,
     objective_in: schemas.objective.ObjectiveUpdate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    db_obj = crud_objective.get_objective(db, objective_id=objective_id)
+    db_obj = await aio.crud_objective.get_objective(db, objective_id=objective_id)
     if not db_obj:
         raise HTTPException(status_code=404, detail="Objective not found")
-    return crud_objective.update_objective(db, db_obj=db_obj, objective_in=objective_in)
+    parent_id = objective_in.parent_id
+    if parent_id is not None and await aio.crud_objective.is_in_subtree(
+        db, objective_id=parent_id, root_id=objective_id
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail="Parent cannot be the objective or one of its descendants",
+        )
+    return await aio.crud_objective.update_objective(
+        db, db_obj=db_obj, objective_in=objective_in
+    )
 
 @router.delete(
     "/objectives/{objective_id}",
@@ -80,15 +170,15 @@ def update_objective(
     summary="Delete objective",
     tags=["Objectives"],
 )
-def delete_objective(
+async def delete_objective(
     objective_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
-    db_obj = crud_objective.get_objective(db, objective_id=objective_id)
+    db_obj = await aio.crud_objective.get_objective(db, objective_id=objective_id)
     if not db_obj:
         raise HTTPException(status_code=404, detail="Objective not found")
-    crud_objective.delete_objective(db, db_obj=db_obj)
+    await aio.crud_objective.delete_objective(db, db_obj=db_obj)
     return None
 
 @router.get(
@@ -97,11 +187,11 @@ def delete_objective(
     tags=["Objectives"],
     summary="Get possible objective priorities"
 )
-def get_objective_priorities():
+async def get_objective_priorities(request: Request):
     """
     Get all possible values for ObjectivePriority enum.
     """
-    return [priority.value for priority in ObjectivePriority]
+    return enum_response(request, "objective_priorities")
 
 @router.get(
     "/objective-enums/statuses",
@@ -109,8 +199,8 @@ def get_objective_priorities():
     tags=["Objectives"],
     summary="Get possible objective statuses"
 )
-def get_objective_statuses():
+async def get_objective_statuses(request: Request):
     """
     Get all possible values for ObjectiveStatus enum.
     """
-    return [status.value for status in ObjectiveStatus]
+    return enum_response(request, "objective_statuses")
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, Query, status
+from typing import Annotated
+from app import schemas
+from app.api.v1.deps import DbSession, get_db
+from app.crud import aio
+from app.api.v1.endpoints.oauth import read_users_me
+from app.schemas.report import StatusReport, StatusReportFilter
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+router = APIRouter()
+
+
+@router.get(
+    "/reports/status",
+    response_model=StatusReport,
+    summary="Objective and key result status report",
+    tags=["Reports"],
+)
+async def read_status_report(
+    filters: Annotated[StatusReportFilter, Query()],
+    db: DbSession = Depends(get_db),
+    current_user: schemas.user.User = Depends(read_users_me),
+):
+    """
+    Counts and average progress of objectives and key results, grouped.
+    - **group_by**: repeat to choose the grouping among member_id, status,
+      priority and period (quarter of start_date); all four by default
+    - **member_id**: repeat to include several members, e.g. a team
+    - **period_from**, **period_to**: only quarters in this range
+    - **Returns**: groups read from materialized views as of ``refreshed_at``
+    """
+    return await aio.crud_report.get_status_report(db, filters=filters)
+
+
+@router.post(
+    "/reports/status/refresh",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Refresh the status report",
+    tags=["Reports"],
+)
+async def refresh_status_report(
+    db: DbSession = Depends(get_db),
+    current_user: schemas.user.User = Depends(read_users_me),
+):
+    """
+    Rebuild the report views now instead of waiting for the scheduled refresh.
+    - **Returns**: whether a refresh ran; false if another one was in progress
+    """
+    refreshed = await aio.crud_report.refresh_status_reports(db, force=True)
+    return {"refreshed": refreshed}
@@ -1,9 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from typing import List
 from app import schemas
-from app.api.v1.deps import get_db
-from app.crud import crud_user
+from app.api.v1.deps import Conditional, DbSession, Page, get_db
+from app.crud import aio
+from app.core.security import get_password_hash_async
 from app.api.v1.endpoints.oauth import read_users_me
 import logging
 
@@ -20,19 +20,33 @@ router = APIRouter()
     tags=["Users"],
     response_description="List of users",
 )
-def read_users(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+async def read_users(
+    response: Response,
+    page: Page = Depends(),
+    conditional: Conditional = Depends(),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
     """
     Retrieve a list of users.
+    - **cursor**: X-Next-Cursor of the previous page (preferred over skip)
     - **skip**: Number of records to skip for pagination
-    - **limit**: Maximum number of users to return
+    - **limit**: Maximum number of users to return, capped at MAX_PAGE_SIZE
+    - **total**: Return the user count in X-Total-Count, estimated or exact
     - **Requires authentication**
+    - **304** if If-None-Match matches the ETag
     """
-    users = crud_user.get_users(db, skip=skip, limit=limit)
+    version = await aio.crud_user.get_users_version(db)
+    not_modified = conditional.check(*version)
+    if not_modified is not None:
+        return not_modified
+    users = await aio.crud_user.get_users(
+        db, skip=page.skip, limit=page.limit, after=page.after
+    )
+    total = None
+    if page.total:
+        total = await aio.crud_user.count_users(db, exact=page.exact)
+    page.set_headers(response, users, total)
     return users
 
 
@@ -44,9 +58,9 @@ def read_users(
     tags=["Users"],
     response_description="Created user",
 )
-def create_user(
+async def create_user(
     user_in: schemas.user.UserCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
     """
@@ -54,19 +68,18 @@ def create_user(
     - **Requires authentication**
     - **user_name and email must be unique**
     """
-    db_user_by_email = crud_user.get_user_by_email(db, email=user_in.email)
+    db_user_by_email = await aio.crud_user.get_user_by_email(db, email=user_in.email)
     if db_user_by_email:
         raise HTTPException(status_code=400, detail="Email already registered")
-    db_user_by_username = (
-        db.query(crud_user.User)
-        .filter(crud_user.User.user_name == user_in.user_name)
-        .first()
-        if hasattr(crud_user, "User")
-        else None
+    db_user_by_username = await aio.crud_user.get_user_by_user_name(
+        db, user_name=user_in.user_name
     )
     if db_user_by_username:
         raise HTTPException(status_code=400, detail="Username already registered")
-    return crud_user.create_user(db, user_in=user_in)
+    hashed_password = await get_password_hash_async(user_in.password)
+    return await aio.crud_user.create_user(
+        db, user_in=user_in, hashed_password=hashed_password
+    )
 
 
 @router.get(
@@ -76,19 +89,24 @@ def create_user(
     tags=["Users"],
     response_description="User details",
 )
-def read_user(
+async def read_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    conditional: Conditional = Depends(),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
     """
     Get a user by their ID.
     - **Requires authentication**
     - **404** if user not found
+    - **304** if If-None-Match matches the ETag
     """
-    db_user = crud_user.get_user(db, user_id=user_id)
+    db_user = await aio.crud_user.get_user(db, user_id=user_id)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
+    not_modified = conditional.check(db_user.updated_at)
+    if not_modified is not None:
+        return not_modified
     return db_user
 
 
@@ -99,21 +117,30 @@ def read_user(
     tags=["Users"],
     response_description="Updated user",
 )
-def update_user(
+async def update_user(
     user_id: int,
     user_in: schemas.user.UserUpdate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
     """
     Update a user's information.
     - **Requires authentication**
     - **404** if user not found
+    - **422** if password is empty or null
     """
-    db_user = crud_user.get_user(db, user_id=user_id)
+    db_user = await aio.crud_user.get_user(db, user_id=user_id)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
-    return crud_user.update_user(db, db_user=db_user, user_in=user_in)
+    # Hash here, off the event loop; an empty or null password is refused
+    hashed_password = None
+    if "password" in user_in.model_fields_set:
+        if not user_in.password:
+            raise HTTPException(status_code=422, detail="Password must not be empty")
+        hashed_password = await get_password_hash_async(user_in.password)
+    return await aio.crud_user.update_user(
+        db, db_user=db_user, user_in=user_in, hashed_password=hashed_password
+    )
 
 
 @router.delete(
@@ -123,9 +150,9 @@ def update_user(
     tags=["Users"],
     response_description="User deleted",
 )
-def delete_user(
+async def delete_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: schemas.user.User = Depends(read_users_me),
 ):
     """
@@ -133,8 +160,8 @@ def delete_user(
     - **Requires authentication**
     - **404** if user not found
     """
-    db_user = crud_user.get_user(db, user_id=user_id)
+    db_user = await aio.crud_user.get_user(db, user_id=user_id)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
-    crud_user.delete_user(db, db_user=db_user)
+    await aio.crud_user.delete_user(db, db_user=db_user)
     return None
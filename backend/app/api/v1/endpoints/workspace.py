@@ -0,0 +1,36 @@
+from datetime import date
+from fastapi import APIRouter, Depends, Query
+from app import schemas
+from app.api.v1.deps import DbSession, get_db
+from app.crud import aio
+from app.api.v1.endpoints.oauth import read_users_me
+from app.schemas.workspace import Workspace
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+router = APIRouter()
+
+
+@router.get(
+    "/me/workspace",
+    response_model=Workspace,
+    summary="Get the current user's workspace",
+    tags=["Workspace"],
+)
+async def read_workspace(
+    meetings: int = Query(10, ge=1, le=100),
+    db: DbSession = Depends(get_db),
+    current_user: schemas.user.User = Depends(read_users_me),
+):
+    """
+    Everything the dashboard needs for the signed-in user in one request.
+    - **meetings**: maximum number of upcoming meetings to return
+    - **Returns**: the user's member record and top manager id, their
+      objectives and key results, direct reports and upcoming meetings
+      they lead or attend; empty when the user has no member record
+    """
+    return await aio.crud_workspace.get_workspace(
+        db, user_id=current_user.id, today=date.today(), meeting_limit=meetings
+    )
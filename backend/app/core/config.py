@@ -1,6 +1,6 @@
 from pydantic import field_validator
 from pydantic_settings import BaseSettings
-from typing import List, Union
+from typing import List, Optional, Union
 import logging
 
 logger = logging.getLogger(__name__)
@@ -32,6 +32,24 @@ class Settings(BaseSettings):
     POSTGRES_DB: str
     LOGFIRE_WRITE_TOKEN: str
     LOGFIRE_ENVIRONMENT: str
+    PRINCIPAL_CACHE_SIZE: int = 1024  # cached authenticated users per worker
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PASSWORD_HASH_WORKERS: int = 2  # concurrent bcrypt operations per worker
+    PASSWORD_HASH_MAX_QUEUE: int = 16  # waiting operations before 503
+    DB_ASYNC: bool = True  # serve requests from asyncpg; False uses psycopg2
+    DB_POOL_SIZE: int = 5  # persistent connections per engine and worker
+    DB_MAX_OVERFLOW: int = 10  # extra connections opened under load
+    DB_POOL_TIMEOUT: float = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True  # test connections on checkout, else rely on recycle
+    DB_PGBOUNCER: bool = False  # no client-side pool or prepared statement cache
+    THREADPOOL_WORKERS: Optional[int] = None  # sync handler threads, default 40
+    MAX_PAGE_SIZE: int = 500  # upper bound for limit on list endpoints
+    ACTIVE_MESSAGES_CACHE_TTL_SECONDS: int = 60  # also the Cache-Control max-age
+    ENUMS_CACHE_MAX_AGE_SECONDS: int = 300  # then browsers revalidate /enums
+    REPORTS_REFRESH_INTERVAL_SECONDS: int = 300  # report view refresh check, 0 = off
+    EXPORT_BATCH_SIZE: int = 1000  # rows fetched per server-side cursor round trip
+    PROGRESS_WEIGHTS: str = ""  # rollup weighting: "", "priority", "complexity" or both
 
     class Config:
         case_sensitive = True
@@ -50,6 +68,9 @@ class Settings(BaseSettings):
     def assemble_db_connection(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    def assemble_async_db_connection(self) -> str:
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+
     # Parse BACKEND_CORS_ORIGINS env var (comma-separated string)
 
     def get_cors_origins(self) -> List[str]:
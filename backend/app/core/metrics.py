@@ -0,0 +1,29 @@
+from threading import Lock
+from typing import Dict
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyStats:
+    """Thread-safe running count, total and maximum of durations in seconds."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "count": self.count,
+                "avg_ms": self.total / self.count * 1000 if self.count else 0.0,
+                "max_ms": self.max * 1000,
+            }
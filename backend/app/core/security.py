@@ -0,0 +1,102 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+import asyncio
+from threading import BoundedSemaphore, Lock
+from typing import Any, Callable, Dict
+from passlib.context import CryptContext
+import time
+import logging
+
+from app.core.config import settings
+from app.core.metrics import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the password hashing queue is full."""
+
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated, size-limited thread pool.
+
+    At most ``workers`` hashes run at once and at most ``max_queue`` more
+    may wait. Beyond that, submissions fail fast with PasswordHasherBusy
+    so a login burst cannot pin every request worker.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.rejected = 0
+        self.queue_wait = LatencyStats()
+        self.hash_latency = LatencyStats()
+        self._slots = BoundedSemaphore(workers + max_queue)
+        self._in_flight = 0
+        self._lock = Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hasher"
+        )
+
+    def submit(self, fn: Callable[..., Any], *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHasherBusy()
+        with self._lock:
+            self._in_flight += 1
+        submitted = time.perf_counter()
+
+        def run():
+            started = time.perf_counter()
+            self.queue_wait.observe(started - submitted)
+            try:
+                return fn(*args)
+            finally:
+                self.hash_latency.observe(time.perf_counter() - started)
+                with self._lock:
+                    self._in_flight -= 1
+                self._slots.release()
+
+        return self._executor.submit(run)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight, rejected = self._in_flight, self.rejected
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": in_flight,
+            "rejected": rejected,
+            "queue_wait": self.queue_wait.stats(),
+            "hash_latency": self.hash_latency.stats(),
+        }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS, max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+)
+
+
+def get_password_hash(password: str) -> str:
+    return password_hasher.submit(pwd_context.hash, password).result()
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return password_hasher.submit(
+        pwd_context.verify, plain_password, hashed_password
+    ).result()
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await asyncio.wrap_future(
+        password_hasher.submit(pwd_context.hash, password)
+    )
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await asyncio.wrap_future(
+        password_hasher.submit(pwd_context.verify, plain_password, hashed_password)
+    )
@@ -0,0 +1,83 @@
+"""Async versions of the crud_* modules.
+
+``aio.crud_member.get_member(db, member_id=1)`` awaits the same query as
+``crud_member.get_member``. With an AsyncSession the function runs through
+``AsyncSession.run_sync`` on asyncpg, so the event loop is never blocked;
+with a sync Session it runs in the threadpool. Both database stacks share
+one implementation of every query. ``stream_rows`` reads large results in
+batches through a server-side cursor on either stack.
+"""
+from types import ModuleType
+from typing import Any, AsyncIterator, Callable, Sequence, Union
+from sqlalchemy import Executable, Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from app.crud import (
+    crud_export as _crud_export,
+    crud_import as _crud_import,
+    crud_key_result as _crud_key_result,
+    crud_meeting as _crud_meeting,
+    crud_member as _crud_member,
+    crud_message as _crud_message,
+    crud_objective as _crud_objective,
+    crud_report as _crud_report,
+    crud_user as _crud_user,
+    crud_workspace as _crud_workspace,
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def run_db(
+    db: Union[AsyncSession, Session], fn: Callable[..., Any], *args, **kwargs
+) -> Any:
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+async def stream_rows(
+    db: Union[AsyncSession, Session], statement: Executable, batch_size: int
+) -> AsyncIterator[Sequence[Row]]:
+    """Yield the rows of ``statement`` in batches of up to ``batch_size``.
+
+    ``yield_per`` makes psycopg2 use a named server-side cursor and asyncpg
+    a cursor within the session's transaction; only one batch is in memory.
+    """
+    statement = statement.execution_options(yield_per=batch_size)
+    if isinstance(db, AsyncSession):
+        result = await db.stream(statement)
+        async for rows in result.partitions():
+            yield rows
+    else:
+        result = await run_in_threadpool(db.execute, statement)
+        async for rows in iterate_in_threadpool(result.partitions()):
+            yield rows
+
+
+class AsyncCrud:
+    def __init__(self, module: ModuleType):
+        self._module = module
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        fn = getattr(self._module, name)
+
+        async def call(db: Union[AsyncSession, Session], *args, **kwargs) -> Any:
+            return await run_db(db, fn, *args, **kwargs)
+
+        call.__name__ = name
+        return call
+
+
+crud_export = AsyncCrud(_crud_export)
+crud_import = AsyncCrud(_crud_import)
+crud_key_result = AsyncCrud(_crud_key_result)
+crud_meeting = AsyncCrud(_crud_meeting)
+crud_member = AsyncCrud(_crud_member)
+crud_message = AsyncCrud(_crud_message)
+crud_objective = AsyncCrud(_crud_objective)
+crud_report = AsyncCrud(_crud_report)
+crud_user = AsyncCrud(_crud_user)
+crud_workspace = AsyncCrud(_crud_workspace)
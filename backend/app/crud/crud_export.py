@@ -0,0 +1,88 @@
+"""Whole-table exports read through a server-side cursor.
+
+``export_statement`` selects the columns of an entity's response schema,
+with the same filters as its list endpoint, ordered by id. Endpoints run it
+with ``aio.stream_rows`` inside ``begin_snapshot``, so an export sees one
+consistent state of the database and holds at most one batch of
+EXPORT_BATCH_SIZE rows in memory however large the table is.
+"""
+from typing import Optional, Type, Union
+from pydantic import BaseModel
+from sqlalchemy import Select, select, text
+from sqlalchemy.orm import Session
+from app.crud import crud_key_result, crud_objective
+from app.models.key_result import KeyResult
+from app.models.meeting import (
+    Meeting,
+    MeetingKeyResult,
+    MeetingObjective,
+    MeetingParticipant,
+)
+from app.models.member import Member
+from app.models.objective import Objective
+from app.schemas.key_result import KeyResult as KeyResultSchema, KeyResultFilter
+from app.schemas.meeting import (
+    Meeting as MeetingSchema,
+    MeetingKeyResult as MeetingKeyResultSchema,
+    MeetingObjective as MeetingObjectiveSchema,
+    MeetingParticipant as MeetingParticipantSchema,
+)
+from app.schemas.member import Member as MemberSchema
+from app.schemas.objective import Objective as ObjectiveSchema, ObjectiveFilter
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Exported entity -> (model, schema of one row)
+EXPORTS = {
+    "members": (Member, MemberSchema),
+    "objectives": (Objective, ObjectiveSchema),
+    "key-results": (KeyResult, KeyResultSchema),
+    "meetings": (Meeting, MeetingSchema),
+    "meeting-participants": (MeetingParticipant, MeetingParticipantSchema),
+    "meeting-objectives": (MeetingObjective, MeetingObjectiveSchema),
+    "meeting-key-results": (MeetingKeyResult, MeetingKeyResultSchema),
+}
+
+# List filters applied to an export, by entity
+FILTERED = {
+    "objectives": crud_objective.filtered_query,
+    "key-results": crud_key_result.filtered_query,
+}
+
+
+def export_schema(entity: str) -> Type[BaseModel]:
+    return EXPORTS[entity][1]
+
+
+def begin_snapshot(db: Session) -> None:
+    """Start a read-only REPEATABLE READ transaction for the export.
+
+    Every later statement on the session, including each cursor fetch,
+    then sees the same snapshot. The request's own transaction (e.g. the
+    principal lookup of read_users_me) is ended first, since the isolation
+    level can only be chosen before a transaction's first query.
+    """
+    db.rollback()
+    db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    db.execute(text("SET TRANSACTION READ ONLY"))
+    isolation = db.execute(text("SHOW transaction_isolation")).scalar()
+    if isolation != "repeatable read":
+        raise RuntimeError(f"Export snapshot not applied, isolation is {isolation}")
+
+
+def export_statement(
+    db: Session,
+    entity: str,
+    filters: Optional[Union[ObjectiveFilter, KeyResultFilter]] = None,
+) -> Select:
+    """Columns of the entity's schema only, so no relationship is loaded."""
+    model, schema = EXPORTS[entity]
+    columns = [model.__table__.c[field] for field in schema.model_fields]
+    if entity in FILTERED:
+        query = FILTERED[entity](db, filters).with_entities(*columns)
+        statement = query.statement
+    else:
+        statement = select(*columns)
+    return statement.order_by(model.__table__.c.id)
@@ -0,0 +1,339 @@
+"""Bulk import of members, objectives and key results.
+
+Every row of a CSV or NDJSON document has a ``type`` (member, objective or
+key_result) and the fields of its schema in app.schemas.bulk_import.
+Hierarchies are wired by import keys: ``supervisor_key``, ``member_key``,
+``parent_key`` and ``objective_key`` name other rows of the document, in any
+order, while the ``*_id`` fields refer to rows already in the database.
+
+The whole document is checked before anything is written and every problem
+is reported with its row, so one error writes nothing. Ids of the new
+members and objectives are drawn from their sequences up front; paths and
+references are then filled in here and each table is written parents first
+with multi-row INSERTs, all in one transaction.
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Tuple
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+from app.crud.progress import rollup
+from app.models.key_result import KeyResult
+from app.models.member import Member
+from app.models.objective import Objective
+from app.models.user import User
+from app.schemas.bulk_import import KeyResultImport, MemberImport, ObjectiveImport
+import csv
+import io
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+ImportFormat = Literal["ndjson", "csv"]
+
+ROW_TYPES = {
+    "member": MemberImport,
+    "objective": ObjectiveImport,
+    "key_result": KeyResultImport,
+}
+
+# Validated rows with their row numbers, by import key
+Keyed = Dict[str, Tuple[int, BaseModel]]
+
+
+def _error(
+    row: int, msg: str, row_type: Optional[str] = None, key: Any = None, loc=()
+) -> dict:
+    key = None if key is None else str(key)
+    return {"row": row, "type": row_type, "key": key, "loc": list(loc), "msg": msg}
+
+
+def _records(text: str, format: ImportFormat) -> Iterator[Tuple[int, Any]]:
+    if format == "csv":
+        for row, record in enumerate(csv.DictReader(io.StringIO(text)), start=1):
+            # Empty cells fall back to the schema defaults
+            yield row, {k: v for k, v in record.items() if k and v}
+        return
+    for row, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield row, json.loads(line)
+        except ValueError as exc:
+            yield row, exc
+
+
+def _validate(
+    records: Iterable[Tuple[int, Any]], errors: List[dict]
+) -> Dict[str, List[Tuple[int, BaseModel]]]:
+    rows = {row_type: [] for row_type in ROW_TYPES}
+    for row, record in records:
+        if isinstance(record, ValueError):
+            errors.append(_error(row, f"Invalid JSON: {record}"))
+            continue
+        if not isinstance(record, dict):
+            errors.append(_error(row, "Expected an object"))
+            continue
+        row_type = record.get("type")
+        if row_type not in ROW_TYPES:
+            msg = "Expected member, objective or key_result"
+            errors.append(_error(row, msg, loc=["type"]))
+            continue
+        try:
+            rows[row_type].append((row, ROW_TYPES[row_type].model_validate(record)))
+        except ValidationError as exc:
+            key = record.get("key")
+            for e in exc.errors():
+                errors.append(_error(row, e["msg"], row_type, key, e["loc"]))
+    return rows
+
+
+def _by_key(rows, row_type: str, errors: List[dict]) -> Keyed:
+    found: Keyed = {}
+    for row, item in rows:
+        if item.key is None:
+            continue
+        if item.key in found:
+            msg = f"Duplicate key {item.key!r}"
+            errors.append(_error(row, msg, row_type, item.key, ["key"]))
+        else:
+            found[item.key] = (row, item)
+    return found
+
+
+def _existing(db: Session, column, ids: Iterable[Optional[int]]) -> set:
+    ids = {i for i in ids if i is not None}
+    if not ids:
+        return set()
+    return set(db.execute(select(column).where(column.in_(ids))).scalars())
+
+
+def _supervisor_paths(db: Session, ids: Iterable[Optional[int]]) -> Dict[int, list]:
+    ids = {i for i in ids if i is not None}
+    if not ids:
+        return {}
+    # Lock the supervisors so a concurrent move cannot change their paths
+    rows = (
+        db.query(Member.id, Member.path)
+        .filter(Member.id.in_(ids))
+        .with_for_update()
+        .all()
+    )
+    return {member_id: list(path or []) for member_id, path in rows}
+
+
+def _check_reference(
+    errors: List[dict],
+    row_type: str,
+    row: int,
+    item: BaseModel,
+    field: str,
+    keys: Keyed,
+    existing,
+    required: bool = False,
+) -> None:
+    key, ref_id = getattr(item, f"{field}_key"), getattr(item, f"{field}_id")
+    if key is not None and ref_id is not None:
+        msg, loc = f"Set {field}_id or {field}_key, not both", f"{field}_key"
+    elif key is not None and key not in keys:
+        msg, loc = f"No row with key {key!r} for {field}_key", f"{field}_key"
+    elif ref_id is not None and ref_id not in existing:
+        msg, loc = f"{field}_id {ref_id} not found", f"{field}_id"
+    elif required and key is None and ref_id is None:
+        msg, loc = f"{field}_id or {field}_key is required", f"{field}_id"
+    else:
+        return
+    errors.append(_error(row, msg, row_type, item.key, [loc]))
+
+
+def _depths(keys: Keyed, parent_field: str) -> Dict[str, Optional[int]]:
+    """Depth of each row below its topmost imported ancestor.
+
+    Rows in or below a cycle get None. Unknown parent keys count as no
+    parent; they are reported by ``_check_reference``.
+    """
+    depths: Dict[str, Optional[int]] = {}
+    for start in keys:
+        chain: Dict[str, None] = {}
+        key = start
+        while key is not None and key not in depths and key not in chain:
+            chain[key] = None
+            parent = getattr(keys[key][1], parent_field)
+            key = parent if parent in keys else None
+        if key is None:
+            depth = -1
+        elif key in chain:
+            depth = None
+        else:
+            depth = depths[key]
+        for key in reversed(chain):
+            depth = None if depth is None else depth + 1
+            depths[key] = depth
+    return depths
+
+
+def _check_cycles(
+    errors: List[dict], row_type: str, keys: Keyed, depths, parent_field: str
+) -> None:
+    for key, depth in depths.items():
+        if depth is None:
+            row, item = keys[key]
+            msg = f"{parent_field} leads to a cycle"
+            errors.append(_error(row, msg, row_type, key, [parent_field]))
+
+
+def _next_ids(db: Session, model, count: int) -> List[int]:
+    if not count:
+        return []
+    sequence = func.pg_get_serial_sequence(model.__tablename__, "id")
+    return list(
+        db.execute(
+            select(func.nextval(sequence)).select_from(func.generate_series(1, count))
+        ).scalars()
+    )
+
+
+def import_document(
+    db: Session, text: str, format: ImportFormat, dry_run: bool = False
+) -> dict:
+    """Check and, unless ``dry_run`` or there are errors, write a document.
+
+    Returns the ImportResult fields plus ``errors``, a list of ImportRowError
+    fields; nothing is written when it is not empty.
+    """
+    errors: List[dict] = []
+    rows = _validate(_records(text, format), errors)
+    members = _by_key(rows["member"], "member", errors)
+    objectives = _by_key(rows["objective"], "objective", errors)
+    _by_key(rows["key_result"], "key_result", errors)
+
+    supervisor_ids = [item.supervisor_id for _, item in rows["member"]]
+    member_ids = _existing(
+        db,
+        Member.id,
+        supervisor_ids
+        + [item.member_id for _, item in rows["objective"] + rows["key_result"]],
+    )
+    objective_ids = _existing(
+        db,
+        Objective.id,
+        [item.parent_id for _, item in rows["objective"]]
+        + [item.objective_id for _, item in rows["key_result"]],
+    )
+    user_ids = _existing(db, User.id, (item.user_id for _, item in rows["member"]))
+
+    for row, item in rows["member"]:
+        _check_reference(errors, "member", row, item, "supervisor", members, member_ids)
+        if item.user_id is not None and item.user_id not in user_ids:
+            msg = f"user_id {item.user_id} not found"
+            errors.append(_error(row, msg, "member", item.key, ["user_id"]))
+    for row, item in rows["objective"]:
+        _check_reference(
+            errors, "objective", row, item, "member", members, member_ids, True
+        )
+        _check_reference(
+            errors, "objective", row, item, "parent", objectives, objective_ids
+        )
+    for row, item in rows["key_result"]:
+        _check_reference(
+            errors, "key_result", row, item, "member", members, member_ids, True
+        )
+        _check_reference(
+            errors, "key_result", row, item, "objective", objectives, objective_ids
+        )
+    member_depths = _depths(members, "supervisor_key")
+    objective_depths = _depths(objectives, "parent_key")
+    _check_cycles(errors, "member", members, member_depths, "supervisor_key")
+    _check_cycles(errors, "objective", objectives, objective_depths, "parent_key")
+
+    result = {
+        "dry_run": dry_run,
+        "members": len(rows["member"]),
+        "objectives": len(rows["objective"]),
+        "key_results": len(rows["key_result"]),
+        "ids": {},
+        "errors": sorted(errors, key=lambda e: e["row"]),
+    }
+    if errors or dry_run:
+        db.rollback()
+        return result
+
+    # Only now lock the supervisors, so rejected documents and dry runs
+    # never wait on or block a concurrent move
+    supervisor_paths = _supervisor_paths(db, supervisor_ids)
+    for row, item in rows["member"]:
+        # A supervisor deleted since the check above is reported the same way
+        _check_reference(
+            errors, "member", row, item, "supervisor", members, supervisor_paths
+        )
+    if errors:
+        db.rollback()
+        result["errors"] = errors
+        return result
+
+    new_members = dict(zip(members, _next_ids(db, Member, len(members))))
+    new_objectives = dict(zip(objectives, _next_ids(db, Objective, len(objectives))))
+
+    # Parents first, so every path and foreign key is already in place
+    paths: Dict[str, list] = {}
+    values = []
+    for key in sorted(members, key=member_depths.__getitem__):
+        item = members[key][1]
+        supervisor_id = new_members.get(item.supervisor_key, item.supervisor_id)
+        if item.supervisor_key is not None:
+            path = paths[item.supervisor_key]
+        else:
+            path = supervisor_paths.get(item.supervisor_id, [])
+        paths[key] = path + [new_members[key]]
+        values.append(
+            item.model_dump(exclude={"key", "supervisor_key"})
+            | {
+                "id": new_members[key],
+                "supervisor_id": supervisor_id,
+                "path": paths[key],
+            }
+        )
+    if values:
+        db.execute(insert(Member), values)
+
+    values = []
+    for key in sorted(objectives, key=objective_depths.__getitem__):
+        item = objectives[key][1]
+        values.append(
+            item.model_dump(exclude={"key", "member_key", "parent_key"})
+            | {
+                "id": new_objectives[key],
+                "member_id": new_members.get(item.member_key, item.member_id),
+                "parent_id": new_objectives.get(item.parent_key, item.parent_id),
+            }
+        )
+    if values:
+        db.execute(insert(Objective), values)
+
+    values = [
+        item.model_dump(exclude={"key", "member_key", "objective_key"})
+        | {
+            "member_id": new_members.get(item.member_key, item.member_id),
+            "objective_id": new_objectives.get(item.objective_key, item.objective_id),
+        }
+        for _, item in rows["key_result"]
+    ]
+    if values:
+        db.execute(insert(KeyResult), values)
+
+    # Deepest objectives first, so each ancestor is settled in as few passes
+    # as possible; existing objectives with new key results come last
+    deepest_first = sorted(objectives, key=objective_depths.__getitem__, reverse=True)
+    rollup(
+        db,
+        [new_objectives[key] for key in deepest_first]
+        + [value["objective_id"] for value in values],
+    )
+    db.commit()
+    result["ids"] = {"member": new_members, "objective": new_objectives}
+    logger.info(
+        f"Imported {result['members']} members, {result['objectives']} objectives "
+        f"and {result['key_results']} key results"
+    )
+    return result
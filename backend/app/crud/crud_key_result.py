@@ -1,35 +1,191 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    Float,
+    Integer,
+    Row,
+    cast,
+    column,
+    func,
+    or_,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.orm import Session, selectinload
 from app.models.key_result import KeyResult
-from app.schemas.key_result import KeyResultCreate, KeyResultUpdate
-from typing import List, Optional
+from app.schemas.key_result import (
+    KeyResultCheckIn,
+    KeyResultCreate,
+    KeyResultFilter,
+    KeyResultUpdate,
+)
+from typing import List, Optional, Sequence, Tuple
+from app.crud.pagination import (
+    Cursor,
+    SortKey,
+    collection_version,
+    count_rows,
+    paginate,
+)
+from app.crud.progress import rollup
 import logging
 
 logger = logging.getLogger(__name__)
 
 
 
-def get_key_result(db: Session, key_result_id: int) -> Optional[KeyResult]:
-    return db.query(KeyResult).filter(KeyResult.id == key_result_id).first()
+# Relationships to eager load per use case; models never load implicitly
+LOAD_PROFILES = {
+    "lean": [],
+    "full": [selectinload(KeyResult.member), selectinload(KeyResult.objective)],
+}
 
-def get_key_results(db: Session, skip: int = 0, limit: int = 100) -> List[KeyResult]:
-    return db.query(KeyResult).offset(skip).limit(limit).all()
+# Fields that feed the progress of the linked objective
+ROLLUP_FIELDS = {
+    "objective_id",
+    "start_value",
+    "current_value",
+    "target_value",
+    "priority",
+    "complexity",
+}
+
+
+def get_key_result(db: Session, key_result_id: int, load: str = "lean") -> Optional[KeyResult]:
+    return (
+        db.query(KeyResult)
+        .options(*LOAD_PROFILES[load])
+        .filter(KeyResult.id == key_result_id)
+        .first()
+    )
+
+def filtered_query(db: Session, filters: Optional[KeyResultFilter]):
+    """Key results matching the filters of GET /key-results, or every one."""
+    query = db.query(KeyResult)
+    if filters is None:
+        return query
+    if filters.member_id:
+        query = query.filter(KeyResult.member_id.in_(filters.member_id))
+    if filters.objective_id is not None:
+        query = query.filter(KeyResult.objective_id == filters.objective_id)
+    if filters.status:
+        query = query.filter(KeyResult.status.in_(filters.status))
+    if filters.priority:
+        query = query.filter(KeyResult.priority.in_(filters.priority))
+    if filters.complexity:
+        query = query.filter(KeyResult.complexity.in_(filters.complexity))
+    if filters.active_from is not None:
+        query = query.filter(
+            or_(
+                KeyResult.end_date >= filters.active_from,
+                KeyResult.end_date.is_(None),
+            )
+        )
+    if filters.active_to is not None:
+        query = query.filter(
+            or_(
+                KeyResult.start_date <= filters.active_to,
+                KeyResult.start_date.is_(None),
+            )
+        )
+    return query
+
+def get_key_results(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    load: str = "lean",
+    after: Optional[Cursor] = None,
+    filters: Optional[KeyResultFilter] = None,
+    sort: Sequence[SortKey] = (),
+) -> List[KeyResult]:
+    query = filtered_query(db, filters).options(*LOAD_PROFILES[load])
+    return paginate(query, KeyResult, skip, limit, after, sort).all()
+
+def count_key_results(
+    db: Session, exact: bool = False, filters: Optional[KeyResultFilter] = None
+) -> int:
+    query = filtered_query(db, filters) if filters is not None else None
+    return count_rows(db, KeyResult, exact=exact, query=query)
+
+def get_key_results_version(db: Session, filters: Optional[KeyResultFilter] = None):
+    query = filtered_query(db, filters) if filters is not None else None
+    return collection_version(db, KeyResult, query=query)
 
 def create_key_result(db: Session, key_result_in: KeyResultCreate) -> KeyResult:
     db_obj = KeyResult(**key_result_in.dict())
     db.add(db_obj)
+    rollup(db, [db_obj.objective_id])
     db.commit()
     db.refresh(db_obj)
     return db_obj
 
 def update_key_result(db: Session, db_obj: KeyResult, key_result_in: KeyResultUpdate) -> KeyResult:
     update_data = key_result_in.dict(exclude_unset=True)
+    old_objective_id = db_obj.objective_id
     for field, value in update_data.items():
         setattr(db_obj, field, value)
     db.add(db_obj)
+    if ROLLUP_FIELDS.intersection(update_data):
+        rollup(db, [old_objective_id, db_obj.objective_id])
     db.commit()
     db.refresh(db_obj)
     return db_obj
 
+def check_in_key_results(
+    db: Session, check_ins: Sequence[KeyResultCheckIn]
+) -> Tuple[List[Row], List[int]]:
+    """Apply current_value/status changes to many key results at once.
+
+    Returns the updated rows by id and the ids that do not exist; if there
+    are any, nothing is written. The key results are locked in id order
+    first and changed with one UPDATE ... FROM (VALUES ...) RETURNING; the
+    rollup then locks the affected objectives and their ancestors, also in
+    id order. Like every writer, key result rows are locked before objective
+    rows, so overlapping check-ins and edits wait instead of deadlocking.
+    """
+    ids = sorted(check_in.id for check_in in check_ins)
+    locked = set(
+        db.execute(
+            select(KeyResult.id)
+            .where(KeyResult.id.in_(ids))
+            .order_by(KeyResult.id)
+            .with_for_update()
+        ).scalars()
+    )
+    missing = [key_result_id for key_result_id in ids if key_result_id not in locked]
+    if missing:
+        db.rollback()
+        return [], missing
+    table = KeyResult.__table__
+    changes = values(
+        column("id", Integer),
+        column("current_value", Float),
+        column("status", table.c.status.type),
+        name="check_in",
+    ).data([(c.id, c.current_value, c.status) for c in check_ins])
+    # NULL keeps the stored value; the casts type all-NULL VALUES columns
+    rows = db.execute(
+        update(table)
+        .where(table.c.id == changes.c.id)
+        .values(
+            current_value=func.coalesce(
+                cast(changes.c.current_value, Float), table.c.current_value
+            ),
+            status=func.coalesce(
+                cast(changes.c.status, table.c.status.type), table.c.status
+            ),
+            updated_at=func.now(),
+        )
+        .returning(*table.c)
+    ).all()
+    # Only current_value feeds progress; status changes need no rollup
+    moved = {c.id for c in check_ins if c.current_value is not None}
+    rollup(db, {row.objective_id for row in rows if row.id in moved})
+    db.commit()
+    return sorted(rows, key=lambda row: row.id), []
+
 def delete_key_result(db: Session, db_obj: KeyResult) -> None:
+    objective_id = db_obj.objective_id
     db.delete(db_obj)
+    rollup(db, [objective_id])
     db.commit()
@@ -1,10 +1,15 @@
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
 from sqlalchemy.orm import Session
+from app.models.key_result import KeyResult
 from app.models.meeting import (
     Meeting,
     MeetingParticipant,
     MeetingObjective,
     MeetingKeyResult,
 )
+from app.models.member import Member
+from app.models.objective import Objective
 from app.schemas.meeting import (
     MeetingCreate,
     MeetingUpdate,
@@ -12,19 +17,64 @@ from app.schemas.meeting import (
     MeetingObjectiveCreate,
     MeetingKeyResultCreate,
 )
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+from app.crud.pagination import Cursor, count_rows, paginate
 import logging
 
 logger = logging.getLogger(__name__)
 
 
 
+class ParticipantConflict(ValueError):
+    """Raised when a member would be linked to a meeting twice."""
+
+
+def _lock_meeting(db: Session, meeting_id: int) -> None:
+    # Serialize concurrent changes to the links of the same meeting
+    db.query(Meeting.id).filter(Meeting.id == meeting_id).with_for_update().all()
+
+
+def _missing(db: Session, column, ids: List[int]) -> List[int]:
+    """The given ids that have no row, in order."""
+    if not ids:
+        return []
+    found = set(db.execute(select(column).where(column.in_(ids))).scalars())
+    return sorted(set(ids) - found)
+
+
 def get_meeting(db: Session, meeting_id: int) -> Optional[Meeting]:
     return db.query(Meeting).filter(Meeting.id == meeting_id).first()
 
 
-def get_meetings(db: Session, skip: int = 0, limit: int = 100) -> List[Meeting]:
-    return db.query(Meeting).offset(skip).limit(limit).all()
+def get_meetings(
+    db: Session, skip: int = 0, limit: int = 100, after: Optional[Cursor] = None
+) -> List[Meeting]:
+    return paginate(db.query(Meeting), Meeting, skip, limit, after).all()
+
+
+def count_meetings(db: Session, exact: bool = False) -> int:
+    return count_rows(db, Meeting, exact=exact)
+
+
+def get_meetings_version(db: Session, meeting_id: Optional[int] = None) -> tuple:
+    """Newest change and row count of meetings and their associations.
+
+    Listed meetings carry their association IDs, so adding or removing a
+    link must change the version too. One query, one aggregate per table.
+    """
+    columns = []
+    for model, column in [
+        (Meeting, Meeting.id),
+        (MeetingParticipant, MeetingParticipant.meeting_id),
+        (MeetingObjective, MeetingObjective.meeting_id),
+        (MeetingKeyResult, MeetingKeyResult.meeting_id),
+    ]:
+        aggregate = select(func.max(model.updated_at), func.count(model.id))
+        if meeting_id is not None:
+            aggregate = aggregate.where(column == meeting_id)
+        aggregate = aggregate.subquery()
+        columns.extend(aggregate.c)
+    return tuple(db.execute(select(*columns)).one())
 
 
 def create_meeting(db: Session, meeting_in: MeetingCreate) -> Meeting:
@@ -62,6 +112,43 @@ def add_participant(
     return participant
 
 
+def update_participant(
+    db: Session,
+    meeting_id: int,
+    member_id: int,
+    participant_in: MeetingParticipantCreate,
+) -> Optional[MeetingParticipant]:
+    """Swap the member of an existing link, or add it, in a single transaction.
+
+    Returns None if the new member does not exist. Raises
+    ParticipantConflict if another link already has the new member; naming
+    the current member again leaves the link as it is.
+    """
+    _lock_meeting(db, meeting_id)
+    new_member_id = participant_in.member_id
+    linked = get_participant(db, meeting_id, new_member_id)
+    if linked is not None and new_member_id == member_id:
+        db.commit()
+        return linked
+    if linked is not None:
+        db.rollback()
+        raise ParticipantConflict(new_member_id)
+    if _missing(db, Member.id, [new_member_id]):
+        db.rollback()
+        return None
+    participant = get_participant(db, meeting_id, member_id)
+    if participant:
+        participant.member_id = participant_in.member_id
+    else:
+        participant = MeetingParticipant(
+            meeting_id=meeting_id, member_id=participant_in.member_id
+        )
+        db.add(participant)
+    db.commit()
+    db.refresh(participant)
+    return participant
+
+
 def remove_participant(db: Session, meeting_id: int, member_id: int) -> None:
     db.query(MeetingParticipant).filter_by(
         meeting_id=meeting_id, member_id=member_id
@@ -103,33 +190,187 @@ def remove_key_result(db: Session, meeting_id: int, key_result_id: int) -> None:
     db.commit()
 
 
+def get_participants(db: Session, meeting_id: int) -> List[MeetingParticipant]:
+    return db.query(MeetingParticipant).filter_by(meeting_id=meeting_id).all()
+
+
+def get_participant(
+    db: Session, meeting_id: int, member_id: int
+) -> Optional[MeetingParticipant]:
+    return (
+        db.query(MeetingParticipant)
+        .filter_by(meeting_id=meeting_id, member_id=member_id)
+        .first()
+    )
+
+
+def get_objective_links(db: Session, meeting_id: int) -> List[MeetingObjective]:
+    return db.query(MeetingObjective).filter_by(meeting_id=meeting_id).all()
+
+
+def get_objective_link(
+    db: Session, meeting_id: int, objective_id: int
+) -> Optional[MeetingObjective]:
+    return (
+        db.query(MeetingObjective)
+        .filter_by(meeting_id=meeting_id, objective_id=objective_id)
+        .first()
+    )
+
+
+def get_key_result_links(db: Session, meeting_id: int) -> List[MeetingKeyResult]:
+    return db.query(MeetingKeyResult).filter_by(meeting_id=meeting_id).all()
+
+
+def get_key_result_link(
+    db: Session, meeting_id: int, key_result_id: int
+) -> Optional[MeetingKeyResult]:
+    return (
+        db.query(MeetingKeyResult)
+        .filter_by(meeting_id=meeting_id, key_result_id=key_result_id)
+        .first()
+    )
+
+
+def update_link_note(db: Session, link, note: Optional[str]):
+    link.note = note
+    db.commit()
+    db.refresh(link)
+    return link
+
+
+def _related_ids(
+    db: Session, model, column, meeting_ids: List[int]
+) -> Dict[int, List[int]]:
+    # One grouped query per association table, whatever the number of meetings
+    if not meeting_ids:
+        return {}
+    rows = (
+        db.query(
+            model.meeting_id,
+            func.array_agg(aggregate_order_by(column, model.id)),
+        )
+        .filter(model.meeting_id.in_(meeting_ids))
+        .group_by(model.meeting_id)
+    )
+    return {meeting_id: ids for meeting_id, ids in rows}
+
+
+def _with_related_ids(db: Session, meetings: List[Meeting]) -> List[dict]:
+    meeting_ids = [m.id for m in meetings]
+    participant_ids = _related_ids(
+        db, MeetingParticipant, MeetingParticipant.member_id, meeting_ids
+    )
+    objective_ids = _related_ids(
+        db, MeetingObjective, MeetingObjective.objective_id, meeting_ids
+    )
+    key_result_ids = _related_ids(
+        db, MeetingKeyResult, MeetingKeyResult.key_result_id, meeting_ids
+    )
+    result = []
+    for meeting in meetings:
+        # Return a dict with meeting fields and related IDs
+        meeting_dict = meeting.__dict__.copy()
+        # Remove SQLAlchemy internal state if present
+        meeting_dict.pop("_sa_instance_state", None)
+        meeting_dict["participant_ids"] = participant_ids.get(meeting.id, [])
+        meeting_dict["objective_ids"] = objective_ids.get(meeting.id, [])
+        meeting_dict["key_result_ids"] = key_result_ids.get(meeting.id, [])
+        result.append(meeting_dict)
+    return result
+
+
+def get_meetings_with_related_ids(
+    db: Session, skip: int = 0, limit: int = 100, after: Optional[Cursor] = None
+) -> List[dict]:
+    """Load a page of meetings with their association IDs in four queries."""
+    meetings = get_meetings(db, skip=skip, limit=limit, after=after)
+    return _with_related_ids(db, meetings)
+
+
 def get_meeting_with_related_ids(db: Session, meeting_id: int):
     meeting = get_meeting(db, meeting_id)
     if not meeting:
         return None
-    participant_ids = [
-        row.member_id
-        for row in db.query(MeetingParticipant.member_id).filter_by(
-            meeting_id=meeting_id
-        )
-    ]
-    objective_ids = [
-        row.objective_id
-        for row in db.query(MeetingObjective.objective_id).filter_by(
-            meeting_id=meeting_id
-        )
-    ]
-    key_result_ids = [
-        row.key_result_id
-        for row in db.query(MeetingKeyResult.key_result_id).filter_by(
-            meeting_id=meeting_id
+    return _with_related_ids(db, [meeting])[0]
+
+
+def _replace_links(
+    db: Session, meeting_id: int, model, column, target, rows: List[dict]
+) -> Tuple[list, List[int]]:
+    """Make the links of a meeting exactly ``rows`` in one transaction.
+
+    Returns the resulting links and the linked ids with no ``target`` row;
+    if there are any, nothing is written. Links missing from ``rows`` are
+    removed with one DELETE, and the rest are written with one multi-row
+    INSERT ... ON CONFLICT that only touches rows whose note actually
+    changed.
+    """
+    _lock_meeting(db, meeting_id)
+    # Last entry wins when the same link is listed twice
+    rows = list({row[column.key]: row for row in rows}.values())
+    missing = _missing(db, target, [row[column.key] for row in rows])
+    if missing:
+        db.rollback()
+        return [], missing
+    db.query(model).filter(
+        model.meeting_id == meeting_id,
+        column.notin_([row[column.key] for row in rows]),
+    ).delete(synchronize_session=False)
+    if rows:
+        stmt = insert(model).values(
+            [{"meeting_id": meeting_id, **row} for row in rows]
         )
-    ]
-    # Return a dict with meeting fields and related IDs
-    meeting_dict = meeting.__dict__.copy()
-    # Remove SQLAlchemy internal state if present
-    meeting_dict.pop("_sa_instance_state", None)
-    meeting_dict["participant_ids"] = participant_ids
-    meeting_dict["objective_ids"] = objective_ids
-    meeting_dict["key_result_ids"] = key_result_ids
-    return meeting_dict
+        if "note" in model.__table__.c:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[model.meeting_id, column],
+                set_={"note": stmt.excluded.note, "updated_at": func.now()},
+                where=model.note.is_distinct_from(stmt.excluded.note),
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(
+                index_elements=[model.meeting_id, column]
+            )
+        db.execute(stmt)
+    db.commit()
+    links = db.query(model).filter_by(meeting_id=meeting_id).order_by(model.id).all()
+    return links, []
+
+
+def replace_participants(
+    db: Session, meeting_id: int, participants_in: List[MeetingParticipantCreate]
+) -> Tuple[List[MeetingParticipant], List[int]]:
+    return _replace_links(
+        db,
+        meeting_id,
+        MeetingParticipant,
+        MeetingParticipant.member_id,
+        Member.id,
+        [p.dict() for p in participants_in],
+    )
+
+
+def replace_objectives(
+    db: Session, meeting_id: int, objectives_in: List[MeetingObjectiveCreate]
+) -> Tuple[List[MeetingObjective], List[int]]:
+    return _replace_links(
+        db,
+        meeting_id,
+        MeetingObjective,
+        MeetingObjective.objective_id,
+        Objective.id,
+        [o.dict() for o in objectives_in],
+    )
+
+
+def replace_key_results(
+    db: Session, meeting_id: int, key_results_in: List[MeetingKeyResultCreate]
+) -> Tuple[List[MeetingKeyResult], List[int]]:
+    return _replace_links(
+        db,
+        meeting_id,
+        MeetingKeyResult,
+        MeetingKeyResult.key_result_id,
+        KeyResult.id,
+        [kr.dict() for kr in key_results_in],
+    )
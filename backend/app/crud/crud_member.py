@@ -1,30 +1,118 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import Integer, any_, cast, func, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session, aliased, selectinload
 from app.models.member import Member
 from app.schemas.member import MemberCreate, MemberUpdate
-from typing import List, Optional
+from typing import List, Optional, Sequence
+from app.crud.pagination import Cursor, collection_version, count_rows, paginate
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-def get_member(db: Session, member_id: int) -> Optional[Member]:
-    return db.query(Member).filter(Member.id == member_id).first()
+class SupervisorCycle(ValueError):
+    """Raised when a member would be supervised by itself or a subordinate."""
 
 
-def get_members(db: Session, skip: int = 0, limit: int = 100) -> List[Member]:
-    return db.query(Member).offset(skip).limit(limit).all()
+# Relationships to eager load per use case; models never load implicitly
+LOAD_PROFILES = {
+    "lean": [],
+    "with_supervisor": [selectinload(Member.supervisor)],
+    "with_children": [selectinload(Member.subordinates)],
+    "full": [
+        selectinload(Member.supervisor),
+        selectinload(Member.user),
+        selectinload(Member.objectives),
+        selectinload(Member.key_results),
+    ],
+}
+
+
+def get_member(
+    db: Session, member_id: int, load: str = "lean"
+) -> Optional[Member]:
+    return (
+        db.query(Member)
+        .options(*LOAD_PROFILES[load])
+        .filter(Member.id == member_id)
+        .first()
+    )
+
+
+def get_members(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    load: str = "lean",
+    after: Optional[Cursor] = None,
+) -> List[Member]:
+    query = db.query(Member).options(*LOAD_PROFILES[load])
+    return paginate(query, Member, skip, limit, after).all()
+
+
+def count_members(db: Session, exact: bool = False) -> int:
+    return count_rows(db, Member, exact=exact)
+
+
+def get_members_version(db: Session):
+    return collection_version(db, Member)
+
+
+def _supervisor_path(db: Session, supervisor_id: Optional[int]) -> List[int]:
+    if supervisor_id is None:
+        return []
+    # Lock the supervisor row so a concurrent move cannot change its path
+    path = (
+        db.query(Member.path)
+        .filter(Member.id == supervisor_id)
+        .with_for_update()
+        .scalar()
+    )
+    return list(path or [])
+
+
+def _replace_path_prefix(
+    db: Session, old_prefix: List[int], new_prefix: List[int]
+) -> None:
+    # Rewrite the paths of the whole subtree under old_prefix in one statement
+    suffix = Member.path[len(old_prefix) + 1 : func.cardinality(Member.path)]
+    db.execute(
+        update(Member)
+        .where(Member.path.contains([old_prefix[-1]]))
+        .values(path=cast(new_prefix, ARRAY(Integer)).op("||")(suffix))
+        .execution_options(synchronize_session=False)
+    )
 
 
 def create_member(db: Session, member_in: MemberCreate) -> Member:
     db_member = Member(**member_in.dict())
     db.add(db_member)
+    db.flush()
+    db_member.path = _supervisor_path(db, db_member.supervisor_id) + [db_member.id]
     db.commit()
     db.refresh(db_member)
     return db_member
 
 
 def update_member(db: Session, db_member: Member, member_in: MemberUpdate) -> Member:
-    for field, value in member_in.dict(exclude_unset=True).items():
+    """Apply the set fields of ``member_in``, moving the subtree if needed.
+
+    Raises SupervisorCycle, writing nothing, if the new supervisor is the
+    member or one of its subordinates.
+    """
+    update_data = member_in.dict(exclude_unset=True)
+    if (
+        "supervisor_id" in update_data
+        and update_data["supervisor_id"] != db_member.supervisor_id
+    ):
+        # Move the whole subtree in the same transaction as the member update
+        new_path = _supervisor_path(db, update_data["supervisor_id"])
+        # Checked on the locked path, so a concurrent move cannot slip past
+        if db_member.id in new_path:
+            db.rollback()
+            raise SupervisorCycle(update_data["supervisor_id"])
+        _replace_path_prefix(db, db_member.path, new_path + [db_member.id])
+    for field, value in update_data.items():
         setattr(db_member, field, value)
     db.commit()
     db.refresh(db_member)
@@ -32,6 +120,8 @@ def update_member(db: Session, db_member: Member, member_in: MemberUpdate) -> Me
 
 
 def delete_member(db: Session, db_member: Member) -> None:
+    # Direct subordinates lose their supervisor and become top managers
+    _replace_path_prefix(db, db_member.path, [])
     db.delete(db_member)
     db.commit()
 
@@ -42,3 +132,98 @@ def get_members_by_supervisor(db: Session, supervisor_id: int) -> List[Member]:
 
 def get_member_by_user_id(db: Session, user_id: int):
     return db.query(Member).filter(Member.user_id == user_id).first()
+
+
+def is_in_subtree(db: Session, member_id: int, root_id: int) -> bool:
+    """Return True if ``member_id`` is ``root_id`` or one of its subordinates."""
+    return (
+        db.query(Member.id)
+        .filter(Member.id == member_id, Member.path.contains([root_id]))
+        .first()
+        is not None
+    )
+
+
+def get_subtree(
+    db: Session, member_id: int, max_depth: Optional[int] = None
+) -> List[Member]:
+    """Return a member and all subordinates in depth-first order.
+
+    The subtree is an indexed lookup on the materialized ``path`` column.
+    ``max_depth`` limits how many levels below the member are returned.
+    """
+    query = db.query(Member).filter(Member.path.contains([member_id]))
+    if max_depth is not None:
+        depth = func.cardinality(Member.path) - func.array_position(
+            Member.path, member_id
+        )
+        query = query.filter(depth <= max_depth)
+    return query.order_by(Member.path).all()
+
+
+def get_supervisor_chain(db: Session, member_id: int) -> List[Member]:
+    """Return a member followed by its supervisors up to the top manager.
+
+    The chain is read from the member's materialized ``path`` in one query.
+    """
+    path = cast(
+        select(Member.path).where(Member.id == member_id).scalar_subquery(),
+        ARRAY(Integer),
+    )
+    return (
+        db.query(Member)
+        .filter(Member.id == any_(path))
+        .order_by(func.array_position(path, Member.id).desc())
+        .all()
+    )
+
+
+def get_org_chart(
+    db: Session, member_id: int, depth: int, expand: Sequence[int] = ()
+) -> Optional[dict]:
+    """Return the nested org chart under a member, or None if not found.
+
+    Levels down to ``depth`` are included, plus the direct subordinates of
+    every member listed in ``expand``. Each node carries its total number
+    of direct subordinates, so the client knows which nodes it can expand.
+    """
+    subordinate = aliased(Member)
+    child_count = (
+        select(func.count(subordinate.id))
+        .where(subordinate.supervisor_id == Member.id)
+        .correlate(Member)
+        .scalar_subquery()
+    )
+    level = func.cardinality(Member.path) - func.array_position(
+        Member.path, member_id
+    )
+    rows = (
+        db.query(
+            Member.id,
+            Member.first_name,
+            Member.last_name,
+            Member.position,
+            Member.supervisor_id,
+            child_count.label("child_count"),
+        )
+        .filter(Member.path.contains([member_id]))
+        .filter(or_(level <= depth, Member.supervisor_id.in_(expand)))
+        .order_by(Member.path)
+    )
+    # Rows arrive in depth-first order, so every parent precedes its children
+    nodes = {}
+    for row in rows:
+        parent = nodes.get(row.supervisor_id)
+        if row.id != member_id and parent is None:
+            continue
+        node = {
+            "id": row.id,
+            "name": f"{row.first_name} {row.last_name}",
+            "position": row.position,
+            "child_count": row.child_count,
+            "children": [],
+        }
+        nodes[row.id] = node
+        if row.id != member_id:
+            parent["children"].append(node)
+    return nodes.get(member_id)
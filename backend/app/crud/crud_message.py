@@ -1,7 +1,11 @@
+from datetime import date
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
+from app.core.cache import active_messages_cache
 from app.models.message import Message
 from app.schemas.message import MessageCreate, MessageUpdate
 from typing import List, Optional
+from app.crud.pagination import Cursor, collection_version, count_rows, paginate
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,14 +16,45 @@ def get_message(db: Session, message_id: int) -> Optional[Message]:
     return db.query(Message).filter(Message.id == message_id).first()
 
 
-def get_messages(db: Session, skip: int = 0, limit: int = 100) -> List[Message]:
-    return db.query(Message).offset(skip).limit(limit).all()
+def get_messages(
+    db: Session, skip: int = 0, limit: int = 100, after: Optional[Cursor] = None
+) -> List[Message]:
+    return paginate(db.query(Message), Message, skip, limit, after).all()
+
+
+def count_messages(db: Session, exact: bool = False) -> int:
+    return count_rows(db, Message, exact=exact)
+
+
+def get_messages_version(db: Session):
+    return collection_version(db, Message)
+
+
+def get_active_messages(db: Session, on: date) -> List[Message]:
+    """Messages whose display window includes ``on``, highest priority first.
+
+    A missing display_start or display_end leaves that side of the window
+    open. MessagePriority is a Postgres enum, so it sorts in declaration
+    order (Top first).
+    """
+    return (
+        db.query(Message)
+        .filter(or_(Message.display_start.is_(None), Message.display_start <= on))
+        .filter(or_(Message.display_end.is_(None), Message.display_end >= on))
+        .order_by(
+            Message.priority,
+            Message.display_start.desc().nulls_last(),
+            Message.id,
+        )
+        .all()
+    )
 
 
 def create_message(db: Session, message_in: MessageCreate) -> Message:
     db_message = Message(**message_in.dict())
     db.add(db_message)
     db.commit()
+    active_messages_cache.clear()
     db.refresh(db_message)
     return db_message
 
@@ -30,6 +65,7 @@ def update_message(
     for field, value in message_in.dict(exclude_unset=True).items():
         setattr(db_message, field, value)
     db.commit()
+    active_messages_cache.clear()
     db.refresh(db_message)
     return db_message
 
@@ -37,3 +73,4 @@ def update_message(
 def delete_message(db: Session, db_message: Message) -> None:
     db.delete(db_message)
     db.commit()
+    active_messages_cache.clear()
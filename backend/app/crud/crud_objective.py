@@ -1,34 +1,246 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import Integer, all_, and_, cast, func, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY, array
+from sqlalchemy.orm import Session, aliased, selectinload
+from app.models.key_result import KeyResult
 from app.models.objective import Objective
-from app.schemas.objective import ObjectiveCreate, ObjectiveUpdate
-from typing import List, Optional
+from app.schemas.objective import ObjectiveCreate, ObjectiveFilter, ObjectiveUpdate
+from typing import Dict, List, Optional, Sequence
+from app.crud.pagination import (
+    Cursor,
+    SortKey,
+    collection_version,
+    count_rows,
+    paginate,
+)
+from app.crud.progress import rollup
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-def get_objective(db: Session, objective_id: int) -> Optional[Objective]:
-    return db.query(Objective).filter(Objective.id == objective_id).first()
+# Relationships to eager load per use case; models never load implicitly
+LOAD_PROFILES = {
+    "lean": [],
+    "with_children": [selectinload(Objective.children)],
+    "with_key_results": [selectinload(Objective.key_results)],
+    "full": [
+        selectinload(Objective.parent),
+        selectinload(Objective.children),
+        selectinload(Objective.member),
+        selectinload(Objective.key_results),
+    ],
+}
 
-def get_objectives(db: Session, skip: int = 0, limit: int = 100) -> List[Objective]:
-    return db.query(Objective).offset(skip).limit(limit).all()
+# Fields that change this objective's or its parent's rolled-up progress
+ROLLUP_FIELDS = {"parent_id", "priority", "progress"}
+
+
+def get_objective(db: Session, objective_id: int, load: str = "lean") -> Optional[Objective]:
+    return (
+        db.query(Objective)
+        .options(*LOAD_PROFILES[load])
+        .filter(Objective.id == objective_id)
+        .first()
+    )
+
+def filtered_query(db: Session, filters: Optional[ObjectiveFilter]):
+    """Objectives matching the GET /objectives filters; all of them for None."""
+    query = db.query(Objective)
+    if filters is None:
+        return query
+    if filters.member_id:
+        query = query.filter(Objective.member_id.in_(filters.member_id))
+    if filters.parent_id is not None:
+        query = query.filter(Objective.parent_id == filters.parent_id)
+    if filters.status:
+        query = query.filter(Objective.status.in_(filters.status))
+    if filters.priority:
+        query = query.filter(Objective.priority.in_(filters.priority))
+    if filters.active_from is not None:
+        query = query.filter(Objective.end_date >= filters.active_from)
+    if filters.active_to is not None:
+        query = query.filter(Objective.start_date <= filters.active_to)
+    return query
+
+def get_objectives(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    load: str = "lean",
+    after: Optional[Cursor] = None,
+    filters: Optional[ObjectiveFilter] = None,
+    sort: Sequence[SortKey] = (),
+) -> List[Objective]:
+    query = filtered_query(db, filters).options(*LOAD_PROFILES[load])
+    return paginate(query, Objective, skip, limit, after, sort).all()
+
+def count_objectives(
+    db: Session, exact: bool = False, filters: Optional[ObjectiveFilter] = None
+) -> int:
+    query = filtered_query(db, filters) if filters is not None else None
+    return count_rows(db, Objective, exact=exact, query=query)
+
+def get_objectives_version(db: Session, filters: Optional[ObjectiveFilter] = None):
+    query = filtered_query(db, filters) if filters is not None else None
+    return collection_version(db, Objective, query=query)
 
 def create_objective(db: Session, objective_in: ObjectiveCreate) -> Objective:
     db_obj = Objective(**objective_in.dict())
     db.add(db_obj)
+    rollup(db, [db_obj.parent_id])
     db.commit()
     db.refresh(db_obj)
     return db_obj
 
 def update_objective(db: Session, db_obj: Objective, objective_in: ObjectiveUpdate) -> Objective:
     update_data = objective_in.dict(exclude_unset=True)
+    old_parent_id = db_obj.parent_id
     for field, value in update_data.items():
         setattr(db_obj, field, value)
     db.add(db_obj)
+    if ROLLUP_FIELDS.intersection(update_data):
+        # Derived progress wins over an entered value; parents re-weigh
+        rollup(db, [db_obj.id, old_parent_id, db_obj.parent_id])
     db.commit()
     db.refresh(db_obj)
     return db_obj
 
 def delete_objective(db: Session, db_obj: Objective) -> None:
+    parent_id = db_obj.parent_id
     db.delete(db_obj)
+    rollup(db, [parent_id])
     db.commit()
+
+
+def is_in_subtree(db: Session, objective_id: int, root_id: int) -> bool:
+    """Return True if ``objective_id`` is ``root_id`` or one of its descendants.
+
+    Walks up from ``objective_id`` with one recursive query; the visited
+    path stops on cycles already present in the data.
+    """
+    chain = (
+        select(
+            Objective.id,
+            Objective.parent_id,
+            cast(array([Objective.id]), ARRAY(Integer)).label("path"),
+        )
+        .where(Objective.id == objective_id)
+        .cte("objective_chain", recursive=True)
+    )
+    parent = aliased(Objective)
+    chain = chain.union_all(
+        select(
+            parent.id,
+            parent.parent_id,
+            func.array_append(chain.c.path, parent.id),
+        )
+        .join(chain, parent.id == chain.c.parent_id)
+        .where(parent.id != all_(chain.c.path))
+    )
+    found = db.execute(select(chain.c.id).where(chain.c.id == root_id)).first()
+    return found is not None
+
+
+def _objective_tree(db: Session, roots, max_depth: Optional[int]) -> List[dict]:
+    """Resolve the objectives under ``roots`` with one recursive query.
+
+    Rows come back in depth-first order with their direct child and key
+    result counts, and are nested into one dict per root.
+    """
+    tree = (
+        select(
+            Objective.id,
+            literal_column("0", Integer).label("depth"),
+            cast(array([Objective.id]), ARRAY(Integer)).label("path"),
+        )
+        .where(roots)
+        .cte("objective_tree", recursive=True)
+    )
+    child = aliased(Objective)
+    step = (
+        select(child.id, tree.c.depth + 1, func.array_append(tree.c.path, child.id))
+        .join(tree, child.parent_id == tree.c.id)
+        .where(child.id != all_(tree.c.path))
+    )
+    if max_depth is not None:
+        step = step.where(tree.c.depth < max_depth)
+    tree = tree.union_all(step)
+
+    sub = aliased(Objective)
+    child_count = (
+        select(func.count(sub.id))
+        .where(sub.parent_id == Objective.id)
+        .correlate(Objective)
+        .scalar_subquery()
+    )
+    key_result_count = (
+        select(func.count(KeyResult.id))
+        .where(KeyResult.objective_id == Objective.id)
+        .correlate(Objective)
+        .scalar_subquery()
+    )
+    rows = db.execute(
+        select(
+            Objective.id,
+            Objective.title,
+            Objective.member_id,
+            Objective.status,
+            Objective.priority,
+            Objective.progress,
+            tree.c.path,
+            child_count.label("child_count"),
+            key_result_count.label("key_result_count"),
+        )
+        .join(tree, Objective.id == tree.c.id)
+        .order_by(tree.c.path)
+    )
+    roots_out: List[dict] = []
+    nodes: Dict[int, dict] = {}
+    for row in rows:
+        node = {
+            "id": row.id,
+            "title": row.title,
+            "member_id": row.member_id,
+            "status": row.status,
+            "priority": row.priority,
+            "progress": row.progress,
+            "child_count": row.child_count,
+            "key_result_count": row.key_result_count,
+            "children": [],
+        }
+        nodes[row.id] = node
+        if len(row.path) == 1:
+            roots_out.append(node)
+        else:
+            nodes[row.path[-2]]["children"].append(node)
+    return roots_out
+
+
+def get_objective_tree(
+    db: Session, objective_id: int, max_depth: Optional[int] = None
+) -> Optional[dict]:
+    """Return the nested tree under an objective, or None if not found."""
+    trees = _objective_tree(db, Objective.id == objective_id, max_depth)
+    return trees[0] if trees else None
+
+
+def get_objective_forest(
+    db: Session, member_id: int, max_depth: Optional[int] = None
+) -> List[dict]:
+    """Return nested trees of a member's top-level objectives.
+
+    A member's objective is a root when it has no parent or its parent
+    belongs to someone else; descendants are included whoever owns them.
+    """
+    parent = aliased(Objective)
+    foreign_parent = (
+        select(parent.id)
+        .where(parent.id == Objective.parent_id, parent.member_id != member_id)
+        .correlate(Objective)
+        .exists()
+    )
+    roots = and_(
+        Objective.member_id == member_id,
+        or_(Objective.parent_id.is_(None), foreign_parent),
+    )
+    return _objective_tree(db, roots, max_depth)
@@ -0,0 +1,126 @@
+"""Status reports read from materialized views.
+
+``objective_status_report`` and ``key_result_status_report`` hold counts and
+progress sums per member, status, priority and quarter, so report reads
+never touch the base tables. ``refresh_status_reports`` rebuilds them with
+REFRESH MATERIALIZED VIEW CONCURRENTLY, which does not block readers; the
+app calls it on a schedule (REPORTS_REFRESH_INTERVAL_SECONDS) from the one
+worker that wins ``lead_refresh``, and it skips the work when the base
+tables have not changed since the last build.
+"""
+from datetime import date, datetime
+from enum import Enum
+from typing import List, Optional, Sequence
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+from app.crud.pagination import collection_version
+from app.models.key_result import KeyResult
+from app.models.objective import Objective
+from app.models.report import (
+    key_result_status_report,
+    objective_status_report,
+    status_report_version,
+)
+from app.schemas.report import StatusReportFilter
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Advisory lock key shared by the refresh leader and every refresh
+REFRESH_LOCK = "hashtext('status_report_refresh')"
+
+
+def _quarter(day: date) -> date:
+    return date(day.year, (day.month - 1) // 3 * 3 + 1, 1)
+
+
+def _report(db: Session, view, filters: StatusReportFilter) -> List[dict]:
+    columns = [view.c[field] for field in dict.fromkeys(filters.group_by)]
+    count = func.sum(view.c.item_count)
+    query = (
+        select(
+            *columns,
+            count.label("count"),
+            (func.sum(view.c.progress_sum) / count).label("average_progress"),
+        )
+        .group_by(*columns)
+        .order_by(*columns)
+    )
+    if filters.member_id:
+        query = query.where(view.c.member_id.in_(filters.member_id))
+    if filters.period_from is not None:
+        query = query.where(view.c.period >= _quarter(filters.period_from))
+    if filters.period_to is not None:
+        query = query.where(view.c.period <= _quarter(filters.period_to))
+    rows = []
+    for row in db.execute(query).mappings():
+        row = {k: v.value if isinstance(v, Enum) else v for k, v in row.items()}
+        rows.append(row)
+    return rows
+
+
+def get_status_report(db: Session, filters: StatusReportFilter) -> dict:
+    return {
+        "refreshed_at": get_refreshed_at(db),
+        "objectives": _report(db, objective_status_report, filters),
+        "key_results": _report(db, key_result_status_report, filters),
+    }
+
+
+def get_refreshed_at(db: Session) -> Optional[datetime]:
+    return db.execute(select(status_report_version.c.refreshed_at)).scalar()
+
+
+def _source_version(db: Session) -> Sequence:
+    return (*collection_version(db, Objective), *collection_version(db, KeyResult))
+
+
+def is_stale(db: Session) -> bool:
+    built_from = db.execute(
+        select(
+            status_report_version.c.objective_updated_at,
+            status_report_version.c.objective_count,
+            status_report_version.c.key_result_updated_at,
+            status_report_version.c.key_result_count,
+        )
+    ).first()
+    return built_from is None or tuple(built_from) != tuple(_source_version(db))
+
+
+def lead_refresh(db: Session) -> bool:
+    """Try to become the worker that runs the scheduled refreshes.
+
+    The session-level advisory lock outlives transactions and is released
+    only with the connection, so ``db`` must be bound to a connection of
+    its own, kept for as long as the worker leads.
+    """
+    locked = db.execute(text(f"SELECT pg_try_advisory_lock({REFRESH_LOCK})")).scalar()
+    # End the transaction; the lock stays with the connection
+    db.rollback()
+    return bool(locked)
+
+
+def refresh_status_reports(db: Session, force: bool = False) -> bool:
+    """Rebuild the report views; returns False if skipped.
+
+    Skips when the base tables are unchanged (unless ``force``) or when
+    another worker is already refreshing.
+    """
+    locked = db.execute(
+        text(f"SELECT pg_try_advisory_xact_lock({REFRESH_LOCK})")
+    ).scalar()
+    if not locked or not (force or is_stale(db)):
+        db.rollback()
+        return False
+    # Version first: a write landing mid-refresh then triggers another one.
+    # CONCURRENTLY keeps the views readable until the transaction commits.
+    for view in (
+        status_report_version,
+        objective_status_report,
+        key_result_status_report,
+    ):
+        db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view.name}"))
+    db.commit()
+    logger.info("Refreshed status report views")
+    return True
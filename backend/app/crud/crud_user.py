@@ -2,37 +2,46 @@ from sqlalchemy.orm import Session
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 from typing import Optional, List
-from passlib.context import CryptContext
+from app.core.cache import principal_cache
+from app.core.security import get_password_hash
+from app.crud.pagination import Cursor, collection_version, count_rows, paginate
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+def get_user(db: Session, user_id: int) -> Optional[User]:
+    return db.query(User).filter(User.id == user_id).first()
 
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+def get_user_by_user_name(db: Session, user_name: str) -> Optional[User]:
+    return db.query(User).filter(User.user_name == user_name).first()
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+def get_user_by_email(db: Session, email: str) -> Optional[User]:
+    return db.query(User).filter(User.email == email).first()
 
 
-def get_user(db: Session, user_id: int) -> Optional[User]:
-    return db.query(User).filter(User.id == user_id).first()
+def get_users(
+    db: Session, skip: int = 0, limit: int = 100, after: Optional[Cursor] = None
+) -> List[User]:
+    return paginate(db.query(User), User, skip, limit, after).all()
 
 
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
-    return db.query(User).filter(User.email == email).first()
+def count_users(db: Session, exact: bool = False) -> int:
+    return count_rows(db, User, exact=exact)
 
 
-def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
-    return db.query(User).offset(skip).limit(limit).all()
+def get_users_version(db: Session):
+    return collection_version(db, User)
 
 
-def create_user(db: Session, user_in: UserCreate) -> User:
-    hashed_password = get_password_hash(user_in.password)
+def create_user(
+    db: Session, user_in: UserCreate, hashed_password: Optional[str] = None
+) -> User:
+    # Async callers hash up front so bcrypt never runs on the event loop
+    if hashed_password is None:
+        hashed_password = get_password_hash(user_in.password)
     db_user = User(
         user_name=user_in.user_name,
         first_name=user_in.first_name,
@@ -48,18 +57,44 @@ def create_user(db: Session, user_in: UserCreate) -> User:
     return db_user
 
 
-def update_user(db: Session, db_user: User, user_in: UserUpdate) -> User:
+def update_user(
+    db: Session,
+    db_user: User,
+    user_in: UserUpdate,
+    hashed_password: Optional[str] = None,
+) -> User:
+    """Apply the set fields of ``user_in``.
+
+    A new password must come already hashed in ``hashed_password``: this
+    runs under AsyncSession.run_sync, so bcrypt is never called here.
+    """
+    old_user_name = db_user.user_name
     update_data = user_in.dict(exclude_unset=True)
-    if "password" in update_data:
-        update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+    if update_data.pop("password", None) is not None and hashed_password is None:
+        raise ValueError("update_user needs the new password hashed")
+    if hashed_password is not None:
+        update_data["hashed_password"] = hashed_password
     for field, value in update_data.items():
         setattr(db_user, field, value)
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    # After the commit, so a concurrent cache miss cannot re-cache the old row
+    principal_cache.invalidate(old_user_name)
+    principal_cache.invalidate(db_user.user_name)
     return db_user
 
 
 def delete_user(db: Session, db_user: User) -> None:
+    user_name = db_user.user_name
     db.delete(db_user)
     db.commit()
+    principal_cache.invalidate(user_name)
+
+
+def set_password(db: Session, db_user: User, hashed_password: str) -> User:
+    db_user.hashed_password = hashed_password
+    db.commit()
+    db.refresh(db_user)
+    principal_cache.invalidate(db_user.user_name)
+    return db_user
@@ -0,0 +1,69 @@
+"""The signed-in user's workspace, assembled in a fixed number of queries.
+
+Every lookup is by an indexed column: the member by ``user_id``, their
+objectives and key results by ``member_id``, direct reports by
+``supervisor_id`` and meetings by ``lead_member_id`` or participant
+``member_id``, so the cost does not grow with the size of the tables.
+"""
+from datetime import date
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+from app.crud.crud_member import get_member_by_user_id
+from app.models.key_result import KeyResult
+from app.models.meeting import Meeting, MeetingParticipant
+from app.models.member import Member
+from app.models.objective import Objective
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def get_workspace(db: Session, user_id: int, today: date, meeting_limit: int) -> dict:
+    """Return the user's member record and what they own or attend.
+
+    Users without a member record get ``member`` None and empty lists
+    after a single query.
+    """
+    member = get_member_by_user_id(db, user_id)
+    if member is None:
+        return {"member": None, "top_manager_id": None}
+    objectives = (
+        db.query(Objective)
+        .filter(Objective.member_id == member.id)
+        .order_by(Objective.end_date, Objective.id)
+        .all()
+    )
+    key_results = (
+        db.query(KeyResult)
+        .filter(KeyResult.member_id == member.id)
+        .order_by(KeyResult.end_date.nulls_last(), KeyResult.id)
+        .all()
+    )
+    direct_reports = (
+        db.query(Member)
+        .filter(Member.supervisor_id == member.id)
+        .order_by(Member.last_name, Member.first_name, Member.id)
+        .all()
+    )
+    attending = select(MeetingParticipant.meeting_id).where(
+        MeetingParticipant.member_id == member.id
+    )
+    upcoming_meetings = (
+        db.query(Meeting)
+        .filter(
+            Meeting.date >= today,
+            or_(Meeting.lead_member_id == member.id, Meeting.id.in_(attending)),
+        )
+        .order_by(Meeting.date, Meeting.time, Meeting.id)
+        .limit(meeting_limit)
+        .all()
+    )
+    return {
+        "member": member,
+        # The materialized path starts at the top manager
+        "top_manager_id": member.path[0] if member.path else member.id,
+        "objectives": objectives,
+        "key_results": key_results,
+        "direct_reports": direct_reports,
+        "upcoming_meetings": upcoming_meetings,
+    }
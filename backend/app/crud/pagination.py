@@ -0,0 +1,194 @@
+"""Keyset pagination shared by the list getters.
+
+Pages are ordered by the requested sort keys followed by primary key. A
+cursor encodes those values for the last row of the previous page, so the
+next page is a range predicate on the sort order and costs the same at any
+depth. ``skip`` is still honoured when no cursor is given so existing
+OFFSET callers keep working.
+"""
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple, Type
+from sqlalchemy import Date, DateTime, and_, false, func, or_, select, text, true
+from sqlalchemy.orm import Query, Session
+from app.db.base import Base
+import binascii
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# (field name, descending)
+SortKey = Tuple[str, bool]
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+class InvalidSort(ValueError):
+    """Raised when a sort expression names a field that cannot be sorted on."""
+
+
+class Cursor(NamedTuple):
+    id: int
+    values: Tuple[Any, ...] = ()
+    sort: str = ""
+
+
+def parse_sort(sort: Optional[str], allowed: Sequence[str]) -> List[SortKey]:
+    """Parse ``"-priority,end_date"`` into sort keys, ``-`` meaning descending."""
+    keys: List[SortKey] = []
+    for part in (sort or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        descending = part.startswith("-")
+        field = part.lstrip("+-")
+        if field not in allowed or field in {f for f, _ in keys}:
+            raise InvalidSort(field)
+        keys.append((field, descending))
+    return keys
+
+
+def format_sort(sort: Sequence[SortKey]) -> str:
+    return ",".join(("-" if descending else "") + field for field, descending in sort)
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(
+    last_id: int, values: Sequence[Any] = (), sort: Sequence[SortKey] = ()
+) -> str:
+    payload: dict = {"id": last_id}
+    if sort:
+        payload["k"] = [_dump(v) for v in values]
+        payload["s"] = format_sort(sort)
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    try:
+        payload = json.loads(urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        last_id = payload["id"]
+        values = tuple(payload.get("k", ()))
+        sort = payload.get("s", "")
+    except (binascii.Error, ValueError, KeyError, TypeError, AttributeError) as e:
+        raise InvalidCursor(cursor) from e
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise InvalidCursor(cursor)
+    if not isinstance(sort, str) or len(values) != len(sort.split(",") if sort else ()):
+        raise InvalidCursor(cursor)
+    return Cursor(last_id, values, sort)
+
+
+def _load(column, value: Any) -> Any:
+    # Drivers like asyncpg want real dates and enums, not their JSON form
+    if value is None:
+        return None
+    enum_class = getattr(column.type, "enum_class", None)
+    if enum_class is not None:
+        return enum_class(value)
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    if isinstance(column.type, Date):
+        return date.fromisoformat(value)
+    return value
+
+
+def _after(column, value: Any, descending: bool):
+    # Postgres sorts NULLs last ascending and first descending
+    if descending:
+        return column.is_not(None) if value is None else column < value
+    if value is None:
+        return false()
+    return or_(column > value, column.is_(None)) if column.nullable else column > value
+
+
+def _equal(column, value: Any):
+    return column.is_(None) if value is None else column == value
+
+
+def _keyset(model: Type[Base], sort: Sequence[SortKey], after: Cursor):
+    columns = [getattr(model, field) for field, _ in sort] + [model.id]
+    try:
+        values = [_load(c, v) for c, v in zip(columns, after.values)] + [after.id]
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(after) from e
+    directions = [descending for _, descending in sort] + [False]
+    clauses = []
+    for i, (column, value, descending) in enumerate(zip(columns, values, directions)):
+        prefix = [_equal(c, v) for c, v in zip(columns[:i], values[:i])]
+        clauses.append(and_(true(), *prefix, _after(column, value, descending)))
+    return or_(*clauses)
+
+
+def paginate(
+    query: Query,
+    model: Type[Base],
+    skip: int,
+    limit: int,
+    after: Optional[Cursor],
+    sort: Sequence[SortKey] = (),
+) -> Query:
+    if after is not None and after.sort != format_sort(sort):
+        raise InvalidCursor(after)
+    order = [
+        getattr(model, field).desc() if descending else getattr(model, field)
+        for field, descending in sort
+    ]
+    query = query.order_by(*order, model.id)
+    if after is not None:
+        query = query.filter(_keyset(model, sort, after))
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def count_rows(
+    db: Session, model: Type[Base], exact: bool = False, query: Optional[Query] = None
+) -> int:
+    """Row count of a table, exact or from the planner statistics.
+
+    The estimate reads ``pg_class.reltuples`` and costs nothing regardless
+    of table size; it falls back to an exact count for tables that have
+    never been analyzed. A filtered ``query`` is always counted exactly.
+    """
+    if query is not None:
+        return query.order_by(None).count()
+    if not exact:
+        estimate = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:t)"),
+            {"t": model.__tablename__},
+        ).scalar()
+        if estimate is not None and estimate >= 0:
+            return estimate
+    return db.execute(select(func.count()).select_from(model)).scalar_one()
+
+
+def collection_version(
+    db: Session, model: Type[Base], query: Optional[Query] = None
+) -> Tuple[Optional[datetime], int]:
+    """Newest ``updated_at`` and row count of a table or filtered query.
+
+    Any insert, update or delete changes one of the two, so together they
+    identify a version of the collection for ETags at the cost of a single
+    aggregate query.
+    """
+    if query is None:
+        query = db.query(model)
+    newest, count = (
+        query.order_by(None)
+        .with_entities(func.max(model.updated_at), func.count(model.id))
+        .one()
+    )
+    return newest, count
@@ -0,0 +1,180 @@
+"""Objective progress rollup.
+
+An objective's progress is derived from its key results and child
+objectives and stored in ``Objective.progress``, so reads never aggregate.
+Writers call ``rollup`` inside their transaction with the objectives whose
+inputs changed; only those objectives and their ancestors are recomputed,
+after locking all of them in id order.
+Objectives without key results or children keep their entered progress.
+
+Contributions are averaged, optionally weighted by priority and/or
+complexity (``settings.PROGRESS_WEIGHTS``, e.g. ``"priority,complexity"``).
+"""
+from typing import Dict, Iterable, Optional, Set
+from sqlalchemy import select
+from sqlalchemy.orm import Session, aliased
+from app.core.config import settings
+from app.models.key_result import KeyResult
+from app.models.key_result_enums import KeyResultComplexity, KeyResultPriority
+from app.models.objective import Objective
+from app.models.objective_enums import ObjectivePriority
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+
+PRIORITY_WEIGHTS = {
+    KeyResultPriority.low: 1,
+    KeyResultPriority.medium: 2,
+    KeyResultPriority.high: 3,
+    KeyResultPriority.critical: 4,
+}
+
+OBJECTIVE_PRIORITY_WEIGHTS = {
+    ObjectivePriority.low: 1,
+    ObjectivePriority.medium: 2,
+    ObjectivePriority.high: 3,
+    ObjectivePriority.critical: 4,
+}
+
+COMPLEXITY_WEIGHTS = {
+    KeyResultComplexity.trivial: 1,
+    KeyResultComplexity.easy: 2,
+    KeyResultComplexity.moderate: 3,
+    KeyResultComplexity.hard: 4,
+    KeyResultComplexity.extreme: 5,
+}
+
+
+def _weighting() -> Set[str]:
+    return {w.strip() for w in settings.PROGRESS_WEIGHTS.split(",") if w.strip()}
+
+
+def key_result_progress(start: float, current: float, target: float) -> float:
+    """Percent of the way from start_value to target_value, clamped to 0..100."""
+    if target == start:
+        return 100.0 if current == target else 0.0
+    return min(max((current - start) / (target - start), 0.0), 1.0) * 100
+
+
+def _objective_progress(db: Session, objective_id: int) -> Optional[int]:
+    weighting = _weighting()
+    total = weights = 0.0
+    key_results = (
+        db.query(
+            KeyResult.start_value,
+            KeyResult.current_value,
+            KeyResult.target_value,
+            KeyResult.priority,
+            KeyResult.complexity,
+        )
+        .filter(KeyResult.objective_id == objective_id)
+        .all()
+    )
+    for start, current, target, priority, complexity in key_results:
+        weight = 1
+        if "priority" in weighting:
+            weight *= PRIORITY_WEIGHTS[priority]
+        if "complexity" in weighting:
+            weight *= COMPLEXITY_WEIGHTS[complexity]
+        total += key_result_progress(start, current, target) * weight
+        weights += weight
+    children = (
+        db.query(Objective.progress, Objective.priority)
+        .filter(Objective.parent_id == objective_id)
+        .all()
+    )
+    for progress, priority in children:
+        weight = OBJECTIVE_PRIORITY_WEIGHTS[priority] if "priority" in weighting else 1
+        total += progress * weight
+        weights += weight
+    if not weights:
+        return None
+    # Half up, like SQL round(), which the backfill migration uses
+    return math.floor(total / weights + 0.5)
+
+
+def _with_ancestors(db: Session, objective_ids: Set[int]) -> Set[int]:
+    tree = (
+        select(Objective.id, Objective.parent_id)
+        .where(Objective.id.in_(objective_ids))
+        .cte("tree", recursive=True)
+    )
+    parent = aliased(Objective)
+    tree = tree.union(
+        select(parent.id, parent.parent_id).join(tree, parent.id == tree.c.parent_id)
+    )
+    return set(db.execute(select(tree.c.id)).scalars())
+
+
+def _lock(db: Session, objective_ids: Set[int]) -> Dict[int, Objective]:
+    """Lock the objectives and all their ancestors, in id order.
+
+    Every writer takes objective locks in the same order, so concurrent
+    rollups over overlapping trees wait for each other instead of
+    deadlocking. If a concurrent move re-parented a row between finding
+    the ancestors and locking them, the locks are released by rolling back
+    to a savepoint and the whole larger set is locked again in id order.
+    """
+    ids = set(objective_ids)
+    while True:
+        ids |= _with_ancestors(db, ids)
+        savepoint = db.begin_nested()
+        objectives = (
+            db.query(Objective)
+            .filter(Objective.id.in_(ids))
+            .order_by(Objective.id)
+            .with_for_update()
+            .populate_existing()
+            .all()
+        )
+        locked = {objective.id: objective for objective in objectives}
+        moved = {
+            o.parent_id
+            for o in objectives
+            if o.parent_id is not None and o.parent_id not in ids
+        }
+        if not moved:
+            savepoint.commit()
+            return locked
+        savepoint.rollback()
+        ids |= moved
+
+
+def _depth(locked: Dict[int, Objective], objective_id: int) -> int:
+    depth, seen = 0, {objective_id}
+    parent_id = locked[objective_id].parent_id
+    while parent_id in locked and parent_id not in seen:
+        seen.add(parent_id)
+        depth += 1
+        parent_id = locked[parent_id].parent_id
+    return depth
+
+
+def rollup(db: Session, objective_ids: Iterable[Optional[int]]) -> None:
+    """Recompute the given objectives and their ancestors; does not commit.
+
+    All affected objectives are locked up front, then recomputed deepest
+    first; an ancestor is only recomputed when one of its children is a
+    given objective or changed.
+    """
+    db.flush()
+    start = {objective_id for objective_id in objective_ids if objective_id is not None}
+    if not start:
+        return
+    locked = _lock(db, start)
+    dirty = set(start)
+    for objective_id in sorted(
+        locked, key=lambda i: _depth(locked, i), reverse=True
+    ):
+        if objective_id not in dirty:
+            continue
+        objective = locked[objective_id]
+        progress = _objective_progress(db, objective_id)
+        changed = progress is not None and progress != objective.progress
+        if changed:
+            objective.progress = progress
+            db.flush()
+        if changed or objective_id in start:
+            dirty.add(objective.parent_id)
@@ -0,0 +1,120 @@
+from threading import Lock
+from typing import Any, Dict
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from uuid import uuid4
+import time
+import logging
+
+from app.core.config import settings
+from app.core.metrics import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+
+class _MeteredPoolMixin:
+    """Records how long callers wait to check out a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = LatencyStats()
+        self.timeouts = 0
+        self._waiting = 0
+        self._metrics_lock = Lock()
+
+    def connect(self):
+        with self._metrics_lock:
+            self._waiting += 1
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            with self._metrics_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            self.checkout_wait.observe(time.perf_counter() - started)
+            with self._metrics_lock:
+                self._waiting -= 1
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._metrics_lock:
+            waiting, timeouts = self._waiting, self.timeouts
+        return {
+            "pool": type(self).__name__,
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "waiting": waiting,
+            "timeouts": timeouts,
+            "checkout_wait": self.checkout_wait.stats(),
+        }
+
+
+class MeteredQueuePool(_MeteredPoolMixin, QueuePool):
+    pass
+
+
+class MeteredAsyncQueuePool(_MeteredPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(is_async: bool = False) -> Dict[str, Any]:
+    """Keyword arguments for create_engine / create_async_engine from settings."""
+    if settings.DB_PGBOUNCER:
+        # PgBouncer does the pooling; in transaction mode a server connection
+        # is not ours between transactions, so asyncpg must not cache
+        # prepared statements on it
+        options: Dict[str, Any] = {"poolclass": NullPool}
+        if is_async:
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        return options
+    return {
+        "poolclass": MeteredAsyncQueuePool if is_async else MeteredQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def pool_metrics(engine: Engine) -> Dict[str, Any]:
+    pool = engine.pool
+    if isinstance(pool, _MeteredPoolMixin):
+        return pool.metrics()
+    return {"pool": type(pool).__name__}
+
+
+def check_pool_capacity(threadpool_workers: int) -> None:
+    """Warn when sync request threads and pooled connections are mismatched.
+
+    With DB_ASYNC disabled every threadpool worker may hold a connection
+    from the sync engine, so the pool should fit the threadpool.
+    """
+    capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    logger.info(
+        f"Threadpool workers: {threadpool_workers}, database pool capacity: "
+        f"{capacity} (DB_ASYNC={settings.DB_ASYNC}, "
+        f"DB_PGBOUNCER={settings.DB_PGBOUNCER})"
+    )
+    if settings.DB_ASYNC or settings.DB_PGBOUNCER:
+        return
+    if threadpool_workers > capacity:
+        logger.warning(
+            f"{threadpool_workers} threadpool workers share {capacity} database "
+            f"connections; requests may wait up to {settings.DB_POOL_TIMEOUT}s "
+            "for a connection. Raise DB_POOL_SIZE/DB_MAX_OVERFLOW or lower "
+            "THREADPOOL_WORKERS."
+        )
+    elif threadpool_workers < capacity:
+        logger.warning(
+            f"Database pool capacity {capacity} exceeds {threadpool_workers} "
+            "threadpool workers; the extra connections are never used."
+        )
@@ -1,6 +1,8 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.pool import engine_options
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,5 +13,18 @@ SQLALCHEMY_DATABASE_URL = settings.assemble_db_connection()
 logger.info(f"SQLALCHEMY_DATABASE_URL: {SQLALCHEMY_DATABASE_URL}")
 
 # Create a sync engine
-engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options())
+# Both factories keep loaded attributes after commit(), so crud code behaves
+# the same whichever stack serves the request; an AsyncSession cannot reload
+# expired attributes implicitly, and crud functions refresh() what they return
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
+
+# Create an async engine, used for requests when settings.DB_ASYNC is set
+async_engine = create_async_engine(
+    settings.assemble_async_db_connection(), **engine_options(is_async=True)
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
@@ -0,0 +1,45 @@
+"""Import members, objectives and key results from a CSV or NDJSON file.
+
+The same import as POST /api/v1/import, for onboarding from a shell:
+
+    python -m app.import_data department.csv --dry-run
+
+Run from the backend directory with the usual environment. Prints the
+result as JSON; on errors prints one per line to stderr, writes nothing
+and exits with status 1. See app.crud.crud_import for the row format.
+"""
+from pathlib import Path
+from app.crud import crud_import
+from app.db.session import SessionLocal
+import argparse
+import json
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file", type=Path)
+    parser.add_argument(
+        "--format",
+        choices=["ndjson", "csv"],
+        help="default from the file extension, otherwise ndjson",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="write nothing")
+    args = parser.parse_args()
+
+    format = args.format or ("csv" if args.file.suffix == ".csv" else "ndjson")
+    text = args.file.read_text(encoding="utf-8-sig")
+    with SessionLocal() as db:
+        result = crud_import.import_document(db, text, format, dry_run=args.dry_run)
+    errors = result.pop("errors")
+    for error in errors:
+        print(json.dumps(error), file=sys.stderr)
+    print(json.dumps(result, indent=2))
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
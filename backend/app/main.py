@@ -1,16 +1,27 @@
+import asyncio
 import logfire
 import logging
 import os
 import logging.config
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1 import api_v1_router
-from app.db.session import engine, SessionLocal
+from app.api.v1.deps import DbSession, get_db
+from app.crud import aio
+from app.db.session import engine, async_engine, SessionLocal
+from app.db.pool import check_pool_capacity
 import secrets
+from anyio import to_thread
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 from app.schemas.user import UserCreate
 from app.core.config import settings
+from app.core.security import PasswordHasherBusy
+from app.crud.pagination import InvalidCursor, InvalidSort
 
 # Configure logfire and logging as early as possible
 #print("Configuring logfire and logging...")
@@ -29,9 +40,12 @@ else:
     )
 
 logfire.instrument_sqlalchemy(engine)
+logfire.instrument_sqlalchemy(async_engine.sync_engine)
 logfire.instrument_psycopg()
+logfire.instrument_asyncpg()
 
 
+# Keep the default response class; see app.core.serialization
 app = FastAPI(
     title="FastAPI backend for project Lambda",
     description="""
@@ -63,9 +77,33 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
 
 
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    # Shed load quickly instead of queueing behind a burst of logins
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Too many concurrent password operations, retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(InvalidCursor)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+    return JSONResponse(
+        status_code=400,
+        content={"detail": "Invalid cursor, or cursor used with a different sort"},
+    )
+
+
+@app.exception_handler(InvalidSort)
+async def invalid_sort_handler(request: Request, exc: InvalidSort):
+    return JSONResponse(status_code=400, content={"detail": f"Cannot sort by {exc}"})
+
+
 # configure logfire
 #instrument_all(app=app, engine=engine)
 
@@ -107,6 +145,71 @@ def startup_event():
             logfire.error(f"Database connection failed: {e}")
             raise
 
+@app.on_event("startup")
+async def configure_threadpool():
+    """
+    Size the threadpool that runs sync handlers and check it against the
+    database pool.
+    """
+    limiter = to_thread.current_default_thread_limiter()
+    if settings.THREADPOOL_WORKERS:
+        limiter.total_tokens = settings.THREADPOOL_WORKERS
+    check_pool_capacity(int(limiter.total_tokens))
+
+@asynccontextmanager
+async def dedicated_db() -> AsyncIterator[DbSession]:
+    """A session on a connection of its own, closed on exit, not pooled."""
+    if settings.DB_ASYNC:
+        async with async_engine.connect() as connection:
+            async with AsyncSession(bind=connection, expire_on_commit=False) as db:
+                yield db
+    else:
+        connection = await run_in_threadpool(engine.connect)
+        db = SessionLocal(bind=connection)
+        try:
+            yield db
+        finally:
+            await run_in_threadpool(db.close)
+            await run_in_threadpool(connection.close)
+
+async def refresh_reports_periodically(interval: int):
+    """
+    Check and refresh the status reports from a single worker.
+
+    Each interval, workers that do not lead try for the refresh lock; the
+    leader keeps its connection, and with it the lock, and is the only one
+    that compares the base tables with the views. If it exits, the lock is
+    released with its connection and another worker takes over. Behind
+    PgBouncer a session lock cannot be kept, so every worker checks.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if settings.DB_PGBOUNCER:
+                async for db in get_db():
+                    await aio.crud_report.refresh_status_reports(db)
+                continue
+            async with dedicated_db() as db:
+                if not await aio.crud_report.lead_refresh(db):
+                    continue
+                while True:
+                    await aio.crud_report.refresh_status_reports(db)
+                    await asyncio.sleep(interval)
+        except Exception as e:
+            logfire.error(f"Status report refresh failed: {e}")
+
+@app.on_event("startup")
+async def schedule_report_refresh():
+    """
+    Refresh the status report views in the background whenever the
+    objective or key result tables changed since the last refresh.
+    """
+    app.state.report_refresh = None
+    if settings.REPORTS_REFRESH_INTERVAL_SECONDS > 0:
+        app.state.report_refresh = asyncio.create_task(
+            refresh_reports_periodically(settings.REPORTS_REFRESH_INTERVAL_SECONDS)
+        )
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """
@@ -116,7 +219,10 @@ async def shutdown_event():
     """
     with logfire.span("FastAPI shutdown"):
         # Add any shutdown tasks here, such as closing database connections
-        pass
+        if app.state.report_refresh is not None:
+            app.state.report_refresh.cancel()
+        await async_engine.dispose()
+        engine.dispose()
 
 app.include_router(api_v1_router, prefix="/api/v1")
 
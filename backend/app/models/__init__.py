@@ -4,3 +4,9 @@ from .member import Member
 from .objective import Objective
 from .key_result import KeyResult
 from .meeting import Meeting, MeetingParticipant, MeetingObjective, MeetingKeyResult
+
+from sqlalchemy.orm import configure_mappers
+
+# Create backrefs (Member.subordinates, Objective.children, ...) up front so
+# crud load profiles can reference them regardless of import order
+configure_mappers()
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Text, Date, Float, ForeignKey, Enum
+from sqlalchemy import Index, String, Text, Date, Float, ForeignKey, Enum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
 from app.models.key_result_enums import KeyResultStatus, KeyResultPriority, KeyResultComplexity
@@ -9,9 +9,12 @@ logger = logging.getLogger(__name__)
 
 class KeyResult(Base):
     __tablename__ = "key_result"
+    __table_args__ = (
+        Index("ix_key_result_end_date_start_date", "end_date", "start_date"),
+    )
 
-    member_id: Mapped[int] = mapped_column(ForeignKey("member.id"), nullable=False)
-    objective_id: Mapped[int | None] = mapped_column(ForeignKey("objective.id"), nullable=True)
+    member_id: Mapped[int] = mapped_column(ForeignKey("member.id"), nullable=False, index=True)
+    objective_id: Mapped[int | None] = mapped_column(ForeignKey("objective.id"), nullable=True, index=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=True)
     value_definition: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -25,5 +28,5 @@ class KeyResult(Base):
     start_date: Mapped[Date] = mapped_column(Date, nullable=True)
     end_date: Mapped[Date] = mapped_column(Date, nullable=True)
 
-    member = relationship("Member", back_populates="key_results", lazy="selectin")
-    objective = relationship("Objective", back_populates="key_results", lazy="selectin")
+    member = relationship("Member", back_populates="key_results", lazy="raise_on_sql")
+    objective = relationship("Objective", back_populates="key_results", lazy="raise_on_sql")
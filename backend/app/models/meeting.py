@@ -1,4 +1,13 @@
-from sqlalchemy import String, Text, Date, Time, ForeignKey, Integer
+from sqlalchemy import (
+    String,
+    Text,
+    Date,
+    Time,
+    ForeignKey,
+    Index,
+    Integer,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base import Base
 import logging
@@ -10,13 +19,19 @@ logger = logging.getLogger(__name__)
 # Association table for meeting participants
 class MeetingParticipant(Base):
     __tablename__ = "meeting_participant"
+    __table_args__ = (
+        UniqueConstraint("meeting_id", "member_id", name="uq_meeting_participant_meeting_member"),
+    )
     meeting_id: Mapped[int] = mapped_column(ForeignKey("meeting.id"))
-    member_id: Mapped[int] = mapped_column(ForeignKey("member.id"))
+    member_id: Mapped[int] = mapped_column(ForeignKey("member.id"), index=True)
 
 
 # Association table for meeting-objective with note
 class MeetingObjective(Base):
     __tablename__ = "meeting_objective"
+    __table_args__ = (
+        UniqueConstraint("meeting_id", "objective_id", name="uq_meeting_objective_meeting_objective"),
+    )
     meeting_id: Mapped[int] = mapped_column(ForeignKey("meeting.id"))
     objective_id: Mapped[int] = mapped_column(ForeignKey("objective.id"))
     note: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -26,6 +41,9 @@ class MeetingObjective(Base):
 # Association table for meeting-key_result with note
 class MeetingKeyResult(Base):
     __tablename__ = "meeting_key_result"
+    __table_args__ = (
+        UniqueConstraint("meeting_id", "key_result_id", name="uq_meeting_key_result_meeting_key_result"),
+    )
     meeting_id: Mapped[int] = mapped_column(ForeignKey("meeting.id"))
     key_result_id: Mapped[int] = mapped_column(ForeignKey("key_result.id"))
     note: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -34,6 +52,9 @@ class MeetingKeyResult(Base):
 
 class Meeting(Base):
     __tablename__ = "meeting"
+    __table_args__ = (
+        Index("ix_meeting_lead_member_id_date", "lead_member_id", "date"),
+    )
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     date: Mapped[Date] = mapped_column(Date, nullable=False)
     time: Mapped[Time] = mapped_column(Time, nullable=False)
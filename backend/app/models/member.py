@@ -1,5 +1,6 @@
-from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String, Text, ForeignKey
+from sqlalchemy.orm import Mapped, backref, mapped_column, relationship
+from sqlalchemy import Integer, String, Text, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import ARRAY
 from app.db.base import Base
 import logging
 
@@ -8,22 +9,34 @@ logger = logging.getLogger(__name__)
 
 class Member(Base):
     __tablename__ = "member"
+    __table_args__ = (Index("ix_member_path", "path", postgresql_using="gin"),)
     first_name: Mapped[str] = mapped_column(String, nullable=False)
     last_name: Mapped[str] = mapped_column(String, nullable=False)
     position: Mapped[str] = mapped_column(String, nullable=False)
     email: Mapped[str | None] = mapped_column(String, nullable=True)
     phone: Mapped[str | None] = mapped_column(String, nullable=True)
     note: Mapped[str | None] = mapped_column(Text, nullable=True)
-    supervisor_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("member.id"), nullable=True)
-    user_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("user.id"), nullable=True)
+    supervisor_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("member.id"), nullable=True, index=True)
+    user_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("user.id"), nullable=True, index=True)
+    # Materialized path of member IDs from the top manager down to this member,
+    # maintained by crud_member on create, update and delete
+    path: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=False, server_default="{}")
 
-    supervisor = relationship("Member", remote_side="Member.id", backref="subordinates", lazy="selectin")
-    user = relationship("User", backref="member_profile", lazy="selectin")
-    objectives = relationship("Objective", back_populates="member", lazy="selectin")
+    # Relationships never load implicitly; crud_member applies a load profile
+    supervisor = relationship(
+        "Member",
+        remote_side="Member.id",
+        backref=backref("subordinates", lazy="raise_on_sql"),
+        lazy="raise_on_sql",
+    )
+    user = relationship(
+        "User", backref=backref("member_profile", lazy="raise_on_sql"), lazy="raise_on_sql"
+    )
+    objectives = relationship("Objective", back_populates="member", lazy="raise_on_sql")
     # key_results relationship will be set after KeyResult is defined
 
 # Set key_results relationship after KeyResult is defined to avoid circular import
 try:
-    Member.key_results = relationship("KeyResult", back_populates="member", lazy="selectin")
+    Member.key_results = relationship("KeyResult", back_populates="member", lazy="raise_on_sql")
 except ImportError:
     pass
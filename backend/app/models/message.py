@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import Text, Date
+from sqlalchemy import Index, Text, Date
 from datetime import date
 from app.db.base import Base
 from sqlalchemy import Enum
@@ -12,6 +12,9 @@ logger = logging.getLogger(__name__)
 
 class Message(Base):
     __tablename__ = "message"
+    __table_args__ = (
+        Index("ix_message_display_end_display_start", "display_end", "display_start"),
+    )
     display_start: Mapped[date | None] = mapped_column(
         Date, unique=False, index=False, nullable=True
     )
@@ -1,5 +1,5 @@
-from sqlalchemy import Integer, String, Text, Date, ForeignKey, Enum
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Index, Integer, String, Text, Date, ForeignKey, Enum
+from sqlalchemy.orm import Mapped, backref, mapped_column, relationship
 from app.db.base import Base
 from app.models.objective_enums import ObjectivePriority, ObjectiveStatus
 import logging
@@ -9,11 +9,14 @@ logger = logging.getLogger(__name__)
 
 class Objective(Base):
     __tablename__ = "objective"
+    __table_args__ = (
+        Index("ix_objective_end_date_start_date", "end_date", "start_date"),
+    )
 
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=True)
-    member_id: Mapped[int] = mapped_column(ForeignKey("member.id"), nullable=False)
-    parent_id: Mapped[int | None] = mapped_column(ForeignKey("objective.id"), nullable=True)
+    member_id: Mapped[int] = mapped_column(ForeignKey("member.id"), nullable=False, index=True)
+    parent_id: Mapped[int | None] = mapped_column(ForeignKey("objective.id"), nullable=True, index=True)
     priority: Mapped[ObjectivePriority] = mapped_column(Enum(ObjectivePriority), nullable=False, default=ObjectivePriority.medium)
     status: Mapped[ObjectiveStatus] = mapped_column(Enum(ObjectiveStatus), nullable=False, default=ObjectiveStatus.not_started)
     start_date: Mapped[Date] = mapped_column(Date, nullable=False)
@@ -21,7 +24,12 @@ class Objective(Base):
     measurable_target: Mapped[str] = mapped_column(String(255), nullable=True)
     progress: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # percent complete
 
-    # Relationships
-    parent = relationship("Objective", remote_side="Objective.id", backref="children", lazy="selectin")
-    member = relationship("Member", back_populates="objectives", lazy="selectin")
-    key_results = relationship("KeyResult", back_populates="objective", lazy="selectin")
\ No newline at end of file
+    # Relationships never load implicitly; crud_objective applies a load profile
+    parent = relationship(
+        "Objective",
+        remote_side="Objective.id",
+        backref=backref("children", lazy="raise_on_sql"),
+        lazy="raise_on_sql",
+    )
+    member = relationship("Member", back_populates="objectives", lazy="raise_on_sql")
+    key_results = relationship("KeyResult", back_populates="objective", lazy="raise_on_sql")
\ No newline at end of file
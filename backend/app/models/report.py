@@ -0,0 +1,52 @@
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Date,
+    DateTime,
+    Enum,
+    Float,
+    Integer,
+    MetaData,
+    Table,
+)
+from app.models.key_result_enums import KeyResultPriority, KeyResultStatus
+from app.models.objective_enums import ObjectivePriority, ObjectiveStatus
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Materialized views created by migration d4b7e1a09c52. They live outside
+# Base.metadata so autogenerate neither creates nor drops them.
+report_metadata = MetaData()
+
+
+def _status_report(name: str, status_enum, priority_enum) -> Table:
+    return Table(
+        name,
+        report_metadata,
+        Column("member_id", Integer),
+        Column("status", Enum(status_enum)),
+        Column("priority", Enum(priority_enum)),
+        Column("period", Date),  # first day of the quarter of start_date
+        Column("item_count", BigInteger),
+        Column("progress_sum", Float),
+    )
+
+
+objective_status_report = _status_report(
+    "objective_status_report", ObjectiveStatus, ObjectivePriority
+)
+key_result_status_report = _status_report(
+    "key_result_status_report", KeyResultStatus, KeyResultPriority
+)
+
+status_report_version = Table(
+    "status_report_version",
+    report_metadata,
+    Column("objective_updated_at", DateTime(timezone=True)),
+    Column("objective_count", BigInteger),
+    Column("key_result_updated_at", DateTime(timezone=True)),
+    Column("key_result_count", BigInteger),
+    Column("refreshed_at", DateTime(timezone=True)),
+)
@@ -0,0 +1,50 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional, Union
+from app.schemas.key_result import KeyResultBase
+from app.schemas.member import MemberBase
+from app.schemas.objective import ObjectiveBase
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Rows refer to other rows of the same import by ``*_key`` and to existing
+# rows by the usual ``*_id``; keys exist only within one import
+
+
+class MemberImport(MemberBase):
+    key: str
+    supervisor_key: Optional[str] = None
+
+
+class ObjectiveImport(ObjectiveBase):
+    key: str
+    member_id: Optional[int] = None
+    member_key: Optional[str] = None
+    parent_key: Optional[str] = None
+
+
+class KeyResultImport(KeyResultBase):
+    key: Optional[str] = None
+    member_id: Optional[int] = None
+    member_key: Optional[str] = None
+    objective_key: Optional[str] = None
+
+
+class ImportRowError(BaseModel):
+    """A problem with one row; ``row`` counts data rows (NDJSON lines) from 1."""
+
+    row: int
+    type: Optional[str] = None
+    key: Optional[str] = None
+    loc: List[Union[str, int]] = []
+    msg: str
+
+
+class ImportResult(BaseModel):
+    dry_run: bool
+    members: int = 0
+    objectives: int = 0
+    key_results: int = 0
+    # Ids of the created members and objectives by their import key
+    ids: Dict[str, Dict[str, int]] = {}
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime, date
 from app.models.key_result import KeyResultStatus, KeyResultPriority, KeyResultComplexity
 import logging
@@ -49,8 +49,41 @@ class KeyResultInDBBase(KeyResultBase):
 
     class Config:
         from_attributes = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-        }
 class KeyResult(KeyResultInDBBase):
     pass
+
+
+class KeyResultCheckIn(BaseModel):
+    """One change of PATCH /key-results; fields left out keep their value."""
+
+    id: int
+    current_value: Optional[float] = None
+    status: Optional[KeyResultStatus] = None
+
+
+# Fields GET /key-results can sort on, as "-priority,end_date"
+KEY_RESULT_SORT_FIELDS = (
+    "title",
+    "priority",
+    "status",
+    "complexity",
+    "start_date",
+    "end_date",
+    "created_at",
+    "updated_at",
+)
+
+
+class KeyResultFilter(BaseModel):
+    """Query parameters of GET /key-results; empty lists do not filter."""
+
+    member_id: List[int] = []
+    objective_id: Optional[int] = None
+    status: List[KeyResultStatus] = []
+    priority: List[KeyResultPriority] = []
+    complexity: List[KeyResultComplexity] = []
+    # Key results whose start_date..end_date overlaps active_from..active_to;
+    # a missing date leaves that end of the key result open
+    active_from: Optional[date] = None
+    active_to: Optional[date] = None
+    sort: Optional[str] = None
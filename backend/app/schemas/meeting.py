@@ -28,9 +28,6 @@ class MeetingParticipantInDBBase(MeetingParticipantBase):
 
     class Config:
         from_attributes = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-        }
 
 
 class MeetingParticipant(MeetingParticipantInDBBase):
@@ -61,9 +58,6 @@ class MeetingObjectiveInDBBase(MeetingObjectiveBase):
 
     class Config:
         from_attributes = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-        }
 
 
 class MeetingObjective(MeetingObjectiveInDBBase):
@@ -94,9 +88,6 @@ class MeetingKeyResultInDBBase(MeetingKeyResultBase):
 
     class Config:
         from_attributes = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-        }
 
 
 class MeetingKeyResult(MeetingKeyResultInDBBase):
@@ -132,9 +123,6 @@ class MeetingInDBBase(MeetingBase):
 
     class Config:
         from_attributes = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-        }
 
 
 class Meeting(MeetingInDBBase):
@@ -145,3 +133,9 @@ class MeetingWithIDs(MeetingInDBBase):
     participant_ids: List[int] = []
     objective_ids: List[int] = []
     key_result_ids: List[int] = []
+
+
+class MeetingAssociations(BaseModel):
+    participants: List[MeetingParticipant] = []
+    objectives: List[MeetingObjective] = []
+    key_results: List[MeetingKeyResult] = []
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 import logging
 
@@ -36,9 +36,14 @@ class MemberInDBBase(MemberBase):
     
     class Config:
         from_attributes = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-        }
 
 class Member(MemberInDBBase):
     pass
+
+
+class OrgChartNode(BaseModel):
+    id: int
+    name: str
+    position: str
+    child_count: int
+    children: List["OrgChartNode"] = []
@@ -35,9 +35,6 @@ class MessageInDBBase(MessageBase):
 
     class Config:
         from_attributes = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-        }
 
 
 class Message(MessageInDBBase):
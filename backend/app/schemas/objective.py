@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import date, datetime
 from app.models.objective import ObjectivePriority, ObjectiveStatus
 import logging
@@ -45,10 +45,45 @@ class ObjectiveInDBBase(ObjectiveBase):
 
     class Config:
         from_attributes = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-        }
 
 
 class Objective(ObjectiveInDBBase):
     pass
+
+
+class ObjectiveTreeNode(BaseModel):
+    id: int
+    title: str
+    member_id: int
+    status: ObjectiveStatus
+    priority: ObjectivePriority
+    progress: int
+    child_count: int
+    key_result_count: int
+    children: List["ObjectiveTreeNode"] = []
+
+
+# Fields GET /objectives can sort on, as "-priority,end_date"
+OBJECTIVE_SORT_FIELDS = (
+    "title",
+    "priority",
+    "status",
+    "start_date",
+    "end_date",
+    "progress",
+    "created_at",
+    "updated_at",
+)
+
+
+class ObjectiveFilter(BaseModel):
+    """Query parameters of GET /objectives; empty lists do not filter."""
+
+    member_id: List[int] = []
+    parent_id: Optional[int] = None
+    status: List[ObjectiveStatus] = []
+    priority: List[ObjectivePriority] = []
+    # Objectives whose start_date..end_date overlaps active_from..active_to
+    active_from: Optional[date] = None
+    active_to: Optional[date] = None
+    sort: Optional[str] = None
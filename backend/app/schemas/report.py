@@ -0,0 +1,36 @@
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+from datetime import date, datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+ReportGroup = Literal["member_id", "status", "priority", "period"]
+
+
+class StatusReportFilter(BaseModel):
+    """Query parameters of GET /reports/status; empty lists do not filter."""
+
+    member_id: List[int] = []
+    # Quarters are identified by their first day; dates in between round down
+    period_from: Optional[date] = None
+    period_to: Optional[date] = None
+    group_by: List[ReportGroup] = ["member_id", "status", "priority", "period"]
+
+
+class StatusReportRow(BaseModel):
+    """One group; fields not grouped by are null."""
+
+    member_id: Optional[int] = None
+    status: Optional[str] = None
+    priority: Optional[str] = None
+    period: Optional[date] = None
+    count: int
+    average_progress: float
+
+
+class StatusReport(BaseModel):
+    refreshed_at: Optional[datetime] = None
+    objectives: List[StatusReportRow] = []
+    key_results: List[StatusReportRow] = []
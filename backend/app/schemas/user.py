@@ -37,9 +37,6 @@ class UserInDBBase(UserBase):
 
     class Config:
         from_attributes = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-        }
 
 
 class UserPasswordChange(BaseModel):
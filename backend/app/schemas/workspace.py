@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from app.schemas.key_result import KeyResult
+from app.schemas.meeting import Meeting
+from app.schemas.member import Member
+from app.schemas.objective import Objective
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Workspace(BaseModel):
+    """Everything the dashboard shows for the signed-in user."""
+
+    member: Optional[Member] = None
+    top_manager_id: Optional[int] = None
+    objectives: List[Objective] = []
+    key_results: List[KeyResult] = []
+    direct_reports: List[Member] = []
+    upcoming_meetings: List[Meeting] = []
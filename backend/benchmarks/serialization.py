@@ -0,0 +1,132 @@
+"""Micro-benchmark of list response serialization.
+
+Serializes 1,000 in-memory ORM rows the ways FastAPI can for
+GET /key-results and GET /members, without a database:
+
+- json: a JSONResponse response class, dicts then ``json.dumps``
+- orjson: an ORJSONResponse response class, dicts then ``orjson.dumps``
+- json_encoders: pydantic-core bytes with the old per-value Python encoders
+- pydantic-core: bytes straight from the schema, as endpoints do now
+
+Run from the backend directory: ``python -m benchmarks.serialization``
+"""
+from datetime import date, datetime, timezone
+from typing import List
+from pydantic import ConfigDict, TypeAdapter
+from app import models
+from app.models.key_result_enums import (
+    KeyResultComplexity,
+    KeyResultPriority,
+    KeyResultStatus,
+)
+from app.schemas.key_result import KeyResult as KeyResultSchema
+from app.schemas.member import Member as MemberSchema
+import argparse
+import json
+import timeit
+
+try:
+    import orjson
+except ImportError:  # optional, only used for comparison
+    orjson = None
+
+
+def key_results(n: int) -> List[models.KeyResult]:
+    now = datetime.now(timezone.utc)
+    return [
+        models.KeyResult(
+            id=i,
+            member_id=i % 50 + 1,
+            objective_id=i % 200 + 1,
+            title=f"Key result {i}",
+            description="Reduce p95 latency of the list endpoints " * 2,
+            value_definition="milliseconds",
+            unit="ms",
+            start_value=400.0,
+            current_value=400.0 - i % 300,
+            target_value=100.0,
+            status=KeyResultStatus.in_progress,
+            priority=KeyResultPriority.high,
+            complexity=KeyResultComplexity.moderate,
+            start_date=date(2026, 1, 1),
+            end_date=date(2026, 12, 31),
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(n)
+    ]
+
+
+def members(n: int) -> List[models.Member]:
+    now = datetime.now(timezone.utc)
+    return [
+        models.Member(
+            id=i,
+            first_name=f"First{i}",
+            last_name=f"Last{i}",
+            position="Engineer",
+            email=f"member{i}@example.com",
+            phone="+420 123 456 789",
+            note=None,
+            supervisor_id=i // 10 or None,
+            user_id=None,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(n)
+    ]
+
+
+def with_json_encoders(schema):
+    """The schema as configured before, with Python datetime encoders."""
+    config = ConfigDict(
+        from_attributes=True, json_encoders={datetime: lambda v: v.isoformat()}
+    )
+    return type(f"Legacy{schema.__name__}", (schema,), {"model_config": config})
+
+
+def strategies(schema):
+    adapter = TypeAdapter(List[schema])
+    legacy = TypeAdapter(List[with_json_encoders(schema)])
+
+    def validate(rows):
+        return adapter.validate_python(rows, from_attributes=True)
+
+    found = {
+        "json": lambda rows: json.dumps(
+            adapter.dump_python(validate(rows), mode="json")
+        ).encode(),
+        "json_encoders": lambda rows: legacy.dump_json(
+            legacy.validate_python(rows, from_attributes=True)
+        ),
+        "pydantic-core": lambda rows: adapter.dump_json(validate(rows)),
+    }
+    if orjson is not None:
+        found["orjson"] = lambda rows: orjson.dumps(
+            adapter.dump_python(validate(rows), mode="json")
+        )
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    for name, schema, rows in [
+        ("/key-results", KeyResultSchema, key_results(args.rows)),
+        ("/members", MemberSchema, members(args.rows)),
+    ]:
+        print(f"{name}, {args.rows} rows")
+        results = {}
+        for label, fn in strategies(schema).items():
+            best = min(timeit.repeat(lambda: fn(rows), number=args.repeat, repeat=5))
+            results[label] = best / args.repeat * 1000
+        baseline = results["json"]
+        for label, ms in results.items():
+            print(f"  {label:<14} {ms:8.2f} ms  {baseline / ms:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+import os
+
+# Settings are read on import of app.core.config; tests never connect, so
+# placeholders are enough where the environment does not provide values
+for name, value in {
+    "SECRET_KEY": "test",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_DB": "test",
+    "LOGFIRE_WRITE_TOKEN": "test",
+    "LOGFIRE_ENVIRONMENT": "test",
+}.items():
+    os.environ.setdefault(name, value)
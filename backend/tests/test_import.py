@@ -0,0 +1,189 @@
+from types import SimpleNamespace
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+import pytest
+
+from app.crud import crud_import
+from app.crud.crud_import import _check_reference, _depths, _records, _validate
+from app.db.base import Base
+from app.models import Member
+from app.schemas.bulk_import import KeyResultImport, ObjectiveImport
+
+
+@compiles(ARRAY, "sqlite")
+def _array_as_text(type_, compiler, **kw):
+    # Member.path is Postgres-only; it is never written in these tests
+    return "TEXT"
+
+
+def _keyed(**parents):
+    """Rows by key with their supervisor_key, numbered in order."""
+    return {
+        key: (row, SimpleNamespace(supervisor_key=parent))
+        for row, (key, parent) in enumerate(parents.items(), start=1)
+    }
+
+
+def test_depths_of_a_chain_in_any_order():
+    keys = _keyed(c="b", a=None, b="a", d="a")
+    assert _depths(keys, "supervisor_key") == {"a": 0, "b": 1, "c": 2, "d": 1}
+
+
+def test_depths_of_rows_in_and_below_a_cycle_are_none():
+    keys = _keyed(a="b", b="a", c="a", d=None, e="e")
+    assert _depths(keys, "supervisor_key") == {
+        "a": None,
+        "b": None,
+        "c": None,
+        "d": 0,
+        "e": None,
+    }
+
+
+def test_depths_treat_unknown_parents_as_no_parent():
+    keys = _keyed(a="missing", b="a")
+    assert _depths(keys, "supervisor_key") == {"a": 0, "b": 1}
+
+
+def _validated(text, format="ndjson"):
+    errors = []
+    rows = _validate(_records(text, format), errors)
+    return rows, errors
+
+
+def test_validate_reports_bad_json_and_keeps_going():
+    text = '{"type": "member"\n\n{"type": "member", "key": "a"}\n'
+    rows, errors = _validated(text)
+    assert errors[0]["row"] == 1
+    assert errors[0]["msg"].startswith("Invalid JSON")
+    # Row numbers count lines; the blank one is skipped
+    assert {e["row"] for e in errors[1:]} == {3}
+    assert rows == {"member": [], "objective": [], "key_result": []}
+
+
+def test_validate_reports_unknown_type_and_non_objects():
+    rows, errors = _validated('{"type": "team"}\n[1, 2]\n')
+    assert [(e["row"], e["loc"]) for e in errors] == [(1, ["type"]), (2, [])]
+    assert not any(rows.values())
+
+
+def test_validate_reports_every_field_error_with_its_key():
+    rows, errors = _validated('{"type": "member", "key": "a", "first_name": "Ann"}')
+    assert {tuple(e["loc"]) for e in errors} == {("last_name",), ("position",)}
+    assert {(e["type"], e["key"]) for e in errors} == {("member", "a")}
+
+
+def test_validate_csv_empty_cells_fall_back_to_defaults():
+    text = (
+        "type,key,title,member_key,start_date,end_date,priority,progress\n"
+        "objective,o1,Grow,m1,2026-01-01,2026-12-31,,\n"
+    )
+    rows, errors = _validated(text, "csv")
+    assert errors == []
+    [(row, item)] = rows["objective"]
+    assert row == 1
+    assert (item.priority, item.progress, item.description) == (
+        ObjectiveImport.model_fields["priority"].default,
+        0,
+        None,
+    )
+
+
+def _objective(**fields):
+    return ObjectiveImport(
+        key="o1",
+        title="Grow",
+        start_date="2026-01-01",
+        end_date="2026-12-31",
+        **fields,
+    )
+
+
+def _reference_errors(item, field, keys=(), existing=(), required=False):
+    errors = []
+    _check_reference(
+        errors, "objective", 1, item, field, dict.fromkeys(keys), existing, required
+    )
+    return [(e["loc"], e["msg"]) for e in errors]
+
+
+def test_check_reference_refuses_both_id_and_key():
+    item = _objective(member_id=1, member_key="m1")
+    assert _reference_errors(item, "member", {"m1"}, {1}) == [
+        (["member_key"], "Set member_id or member_key, not both")
+    ]
+
+
+def test_check_reference_reports_unknown_key_and_id():
+    assert _reference_errors(_objective(member_key="m2"), "member", {"m1"}) == [
+        (["member_key"], "No row with key 'm2' for member_key")
+    ]
+    assert _reference_errors(_objective(parent_id=7), "parent", existing={1}) == [
+        (["parent_id"], "parent_id 7 not found")
+    ]
+
+
+def test_check_reference_required_member():
+    item = KeyResultImport(
+        title="Latency",
+        value_definition="p95",
+        unit="ms",
+        start_value=400,
+        current_value=300,
+        target_value=100,
+    )
+    assert _reference_errors(item, "member", required=True) == [
+        (["member_id"], "member_id or member_key is required")
+    ]
+    # Optional references may be left out
+    assert _reference_errors(item, "objective") == []
+    assert _reference_errors(_objective(member_key="m1"), "member", {"m1"}) == []
+
+
+DOCUMENT = "\n".join(
+    [
+        '{"type": "member", "key": "m1", "first_name": "Ann", "last_name": "Lead",'
+        ' "position": "CTO", "supervisor_id": 1}',
+        '{"type": "objective", "key": "o1", "title": "Grow", "member_key": "m1",'
+        ' "start_date": "2026-01-01", "end_date": "2026-12-31"}',
+    ]
+)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    def no_lock(db, ids):
+        raise AssertionError("supervisors locked before writing")
+
+    monkeypatch.setattr(crud_import, "_supervisor_paths", no_lock)
+    with Session(engine) as session:
+        session.add(Member(id=1, first_name="Ann", last_name="Lead", position="CTO"))
+        session.commit()
+        yield session
+
+
+def _members(db):
+    return db.execute(select(func.count(Member.id))).scalar()
+
+
+def test_dry_run_checks_without_locking_or_writing(db):
+    result = crud_import.import_document(db, DOCUMENT, "ndjson", dry_run=True)
+    assert result["errors"] == []
+    assert (result["members"], result["objectives"]) == (1, 1)
+    assert not db.in_transaction()
+    assert _members(db) == 1
+
+
+def test_rejected_document_is_not_locked_or_written(db):
+    text = DOCUMENT.replace('"supervisor_id": 1', '"supervisor_id": 9')
+    result = crud_import.import_document(db, text, "ndjson")
+    assert [(e["row"], e["loc"]) for e in result["errors"]] == [
+        (1, ["supervisor_id"])
+    ]
+    assert not db.in_transaction()
+    assert _members(db) == 1
@@ -0,0 +1,175 @@
+from datetime import date
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+import pytest
+
+from app import schemas
+from app.crud import crud_key_result, crud_member, crud_objective, crud_user
+from app.db.base import Base
+from app.models import KeyResult, Member, Objective, User
+import app.schemas.key_result  # noqa: F401
+import app.schemas.member  # noqa: F401
+import app.schemas.objective  # noqa: F401
+import app.schemas.user  # noqa: F401
+
+
+@compiles(ARRAY, "sqlite")
+def _array_as_text(type_, compiler, **kw):
+    # Member.path is Postgres-only; it is never read in these tests
+    return "TEXT"
+
+
+# Response schema of each model, as the endpoints declare it
+SCHEMAS = {
+    Member: schemas.member.Member,
+    Objective: schemas.objective.Objective,
+    KeyResult: schemas.key_result.KeyResult,
+    User: schemas.user.User,
+}
+
+# (getter, id keyword, profile, attribute, schema) the endpoints serialize,
+# e.g. GET /members/{id}/supervisor
+ENDPOINT_LOADS = [
+    (
+        crud_member.get_member,
+        "member_id",
+        "with_supervisor",
+        "supervisor",
+        schemas.member.Member,
+    ),
+]
+
+# (model, getter, id keyword, load profiles)
+GETTERS = [
+    (Member, crud_member.get_member, "member_id", crud_member.LOAD_PROFILES),
+    (
+        Objective,
+        crud_objective.get_objective,
+        "objective_id",
+        crud_objective.LOAD_PROFILES,
+    ),
+    (
+        KeyResult,
+        crud_key_result.get_key_result,
+        "key_result_id",
+        crud_key_result.LOAD_PROFILES,
+    ),
+]
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        user = User(
+            id=1,
+            user_name="ann",
+            first_name="Ann",
+            last_name="Lead",
+            email="ann@example.com",
+            hashed_password="x",
+        )
+        top = Member(id=1, first_name="Ann", last_name="Lead", position="CTO")
+        member = Member(
+            id=2,
+            first_name="Bob",
+            last_name="Dev",
+            position="Engineer",
+            supervisor_id=1,
+            user_id=1,
+        )
+        dates = {"start_date": date(2026, 1, 1), "end_date": date(2026, 12, 31)}
+        parent = Objective(id=1, title="Parent", member_id=1, **dates)
+        objective = Objective(id=2, title="Child", member_id=2, parent_id=1, **dates)
+        key_result = KeyResult(
+            id=2,
+            member_id=2,
+            objective_id=2,
+            title="Latency",
+            value_definition="p95",
+            unit="ms",
+            start_value=400,
+            current_value=300,
+            target_value=100,
+        )
+        session.add_all([user, top, member, parent, objective, key_result])
+        session.commit()
+        # Every getter below loads id 2, which has all relationships set.
+        # Start from an empty identity map, as a request does
+        session.expunge_all()
+        yield session
+
+
+def _relationships(model):
+    return [r.key for r in inspect(model).relationships]
+
+
+@pytest.mark.parametrize(
+    "model, getter, id_name, profiles",
+    GETTERS,
+    ids=[model.__name__ for model, *_ in GETTERS],
+)
+def test_lean_profile_raises_on_relationship_access(
+    db, model, getter, id_name, profiles
+):
+    obj = getter(db, **{id_name: 2}, load="lean")
+    assert _relationships(model)
+    for key in _relationships(model):
+        with pytest.raises(InvalidRequestError):
+            getattr(obj, key)
+
+
+def test_user_relationships_raise_on_access(db):
+    user = crud_user.get_user(db, user_id=1)
+    for key in _relationships(User):
+        with pytest.raises(InvalidRequestError):
+            getattr(user, key)
+
+
+@pytest.mark.parametrize(
+    "model, getter, id_name, profile",
+    [
+        (model, getter, id_name, profile)
+        for model, getter, id_name, profiles in GETTERS
+        for profile in profiles
+    ],
+    ids=[
+        f"{model.__name__}.{profile}"
+        for model, _, _, profiles in GETTERS
+        for profile in profiles
+    ],
+)
+def test_load_profiles_serialize_through_response_schemas(
+    db, model, getter, id_name, profile
+):
+    obj = getter(db, **{id_name: 2}, load=profile)
+    SCHEMAS[model].model_validate(obj).model_dump_json()
+    unloaded = inspect(obj).unloaded
+    loaded = [key for key in _relationships(model) if key not in unloaded]
+    assert loaded or profile == "lean"
+    # What a profile loads serializes without SQL, and the rest still raises
+    for key in _relationships(model):
+        if key not in loaded:
+            with pytest.raises(InvalidRequestError):
+                getattr(obj, key)
+            continue
+        related = getattr(obj, key)
+        for item in related if isinstance(related, list) else [related]:
+            if item is not None:
+                SCHEMAS[type(item)].model_validate(item).model_dump_json()
+
+
+@pytest.mark.parametrize(
+    "getter, id_name, profile, attribute, schema",
+    ENDPOINT_LOADS,
+    ids=[f"{profile}.{attribute}" for _, _, profile, attribute, _ in ENDPOINT_LOADS],
+)
+def test_endpoint_profiles_load_what_the_endpoint_serializes(
+    db, getter, id_name, profile, attribute, schema
+):
+    obj = getter(db, **{id_name: 2}, load=profile)
+    schema.model_validate(getattr(obj, attribute)).model_dump_json()
@@ -0,0 +1,83 @@
+from datetime import date, time
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+import pytest
+
+from app.crud import crud_meeting
+from app.crud.crud_meeting import ParticipantConflict
+from app.db.base import Base
+from app.models import Meeting, MeetingParticipant, Member
+from app.schemas.meeting import MeetingObjectiveCreate, MeetingParticipantCreate
+
+
+@compiles(ARRAY, "sqlite")
+def _array_as_text(type_, compiler, **kw):
+    # Member.path is Postgres-only; it is never read in these tests
+    return "TEXT"
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine, expire_on_commit=False) as session:
+        session.add_all(
+            [
+                Member(id=1, first_name="Ann", last_name="Lead", position="CTO"),
+                Member(id=2, first_name="Bob", last_name="Dev", position="Dev"),
+                Meeting(
+                    id=1,
+                    title="Weekly",
+                    date=date(2026, 1, 5),
+                    time=time(9),
+                    duration=60,
+                    lead_member_id=1,
+                ),
+                MeetingParticipant(meeting_id=1, member_id=1),
+                MeetingParticipant(meeting_id=1, member_id=2),
+            ]
+        )
+        session.commit()
+        yield session
+
+
+def _participants(db):
+    return sorted(p.member_id for p in crud_meeting.get_participants(db, 1))
+
+
+def test_update_participant_to_the_same_member_is_a_no_op(db):
+    participant = crud_meeting.update_participant(
+        db, 1, 1, MeetingParticipantCreate(member_id=1)
+    )
+    assert participant.member_id == 1
+    assert _participants(db) == [1, 2]
+
+
+def test_update_participant_to_another_participant_conflicts(db):
+    with pytest.raises(ParticipantConflict):
+        crud_meeting.update_participant(db, 1, 1, MeetingParticipantCreate(member_id=2))
+    assert _participants(db) == [1, 2]
+
+
+def test_update_participant_to_an_unknown_member_returns_none(db):
+    assert (
+        crud_meeting.update_participant(
+            db, 1, 1, MeetingParticipantCreate(member_id=99)
+        )
+        is None
+    )
+    assert _participants(db) == [1, 2]
+
+
+def test_replace_links_reports_unknown_ids_and_writes_nothing(db):
+    links, missing = crud_meeting.replace_participants(
+        db, 1, [MeetingParticipantCreate(member_id=i) for i in (1, 98, 99)]
+    )
+    assert (links, missing) == ([], [98, 99])
+    assert _participants(db) == [1, 2]
+    links, missing = crud_meeting.replace_objectives(
+        db, 1, [MeetingObjectiveCreate(objective_id=7)]
+    )
+    assert (links, missing) == ([], [7])
@@ -0,0 +1,63 @@
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+import pytest
+
+from app.crud import crud_member
+from app.crud.crud_member import SupervisorCycle
+from app.models.member import Member
+from app.schemas.member import MemberUpdate
+
+
+@compiles(ARRAY, "sqlite")
+def _array_as_text(type_, compiler, **kw):
+    # Member.path is Postgres-only; the tests stub the path lookup instead
+    return "TEXT"
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Member.__table__.create(engine)
+    with Session(engine, expire_on_commit=False) as session:
+        session.add_all(
+            [
+                Member(id=1, first_name="Ann", last_name="Lead", position="CTO"),
+                Member(
+                    id=2,
+                    first_name="Bob",
+                    last_name="Dev",
+                    position="Dev",
+                    supervisor_id=1,
+                ),
+            ]
+        )
+        session.commit()
+        yield session
+
+
+# Locked paths of the members: 1 supervises 2
+PATHS = {1: [1], 2: [1, 2]}
+
+
+@pytest.mark.parametrize("member_id, supervisor_id", [(1, 1), (1, 2)])
+def test_update_member_refuses_supervisor_cycles(
+    db, monkeypatch, member_id, supervisor_id
+):
+    monkeypatch.setattr(
+        crud_member, "_supervisor_path", lambda db, id: list(PATHS[id])
+    )
+    moved = []
+    monkeypatch.setattr(
+        crud_member, "_replace_path_prefix", lambda *args: moved.append(args)
+    )
+    with pytest.raises(SupervisorCycle):
+        crud_member.update_member(
+            db,
+            db.get(Member, member_id),
+            MemberUpdate(supervisor_id=supervisor_id, position="Boss"),
+        )
+    assert not moved
+    member = db.get(Member, member_id)
+    assert (member.supervisor_id, member.position) == (None, "CTO")
@@ -0,0 +1,58 @@
+from datetime import date, datetime, timezone
+from sqlalchemy import Date, DateTime, Float, Integer, String
+from sqlalchemy.dialects import postgresql
+import pytest
+
+from app.crud.pagination import _keyset, _load, decode_cursor, encode_cursor
+from app.models.key_result import KeyResult
+from app.models.objective import Objective
+from app.schemas.key_result import KEY_RESULT_SORT_FIELDS
+from app.schemas.objective import OBJECTIVE_SORT_FIELDS
+
+
+def _sample(column):
+    enum_class = getattr(column.type, "enum_class", None)
+    if enum_class is not None:
+        return list(enum_class)[-1]
+    if isinstance(column.type, DateTime):
+        return datetime(2026, 10, 18, 9, 30, 15, 123456, tzinfo=timezone.utc)
+    if isinstance(column.type, Date):
+        return date(2026, 10, 18)
+    if isinstance(column.type, Integer):
+        return 42
+    if isinstance(column.type, Float):
+        return 0.5
+    if isinstance(column.type, String):
+        return "Reduce latency"
+    raise AssertionError(f"No sample value for {column} ({column.type})")
+
+
+SORTABLE = [(Objective, field) for field in OBJECTIVE_SORT_FIELDS] + [
+    (KeyResult, field) for field in KEY_RESULT_SORT_FIELDS
+]
+
+
+@pytest.mark.parametrize(
+    "model, field", SORTABLE, ids=[f"{m.__name__}.{f}" for m, f in SORTABLE]
+)
+def test_cursor_round_trips_sort_values(model, field):
+    column = getattr(model, field)
+    value = _sample(column)
+    cursor = decode_cursor(encode_cursor(7, [value], [(field, False)]))
+    loaded = _load(column, cursor.values[0])
+    # Drivers such as asyncpg bind by Python type, so the type must survive
+    assert type(loaded) is type(value)
+    assert loaded == value
+    assert cursor.id == 7
+
+
+@pytest.mark.parametrize(
+    "model, field", SORTABLE, ids=[f"{m.__name__}.{f}" for m, f in SORTABLE]
+)
+def test_keyset_binds_loaded_values(model, field):
+    column = getattr(model, field)
+    value = _sample(column)
+    cursor = decode_cursor(encode_cursor(7, [value], [(field, True)]))
+    clause = _keyset(model, [(field, True)], cursor)
+    params = clause.compile(dialect=postgresql.dialect()).params
+    assert value in params.values()
@@ -0,0 +1,115 @@
+from datetime import date
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+import pytest
+
+from app.crud import progress
+from app.crud.progress import rollup
+from app.models.key_result import KeyResult
+from app.models.objective import Objective
+
+
+@pytest.fixture
+def db():
+    # SQLite ignores FOR UPDATE but runs the same recursive query
+    engine = create_engine("sqlite://")
+    Objective.__table__.create(engine)
+    KeyResult.__table__.create(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def _objective(db, id, parent_id=None, progress=0):
+    objective = Objective(
+        id=id,
+        title=f"Objective {id}",
+        member_id=1,
+        parent_id=parent_id,
+        start_date=date(2026, 1, 1),
+        end_date=date(2026, 12, 31),
+        progress=progress,
+    )
+    db.add(objective)
+    return objective
+
+
+def _key_result(db, objective_id, current_value):
+    db.add(
+        KeyResult(
+            member_id=1,
+            objective_id=objective_id,
+            title="Key result",
+            value_definition="percent",
+            unit="%",
+            start_value=0,
+            current_value=current_value,
+            target_value=100,
+        )
+    )
+
+
+def test_rollup_recomputes_objectives_and_ancestors(db):
+    _objective(db, 1)
+    _objective(db, 2, parent_id=1)
+    _objective(db, 3, parent_id=1, progress=40)
+    _key_result(db, 2, 80)
+    db.flush()
+    rollup(db, [2])
+    assert db.get(Objective, 2).progress == 80
+    # Parent averages its children: 80 from key results, 40 as entered
+    assert db.get(Objective, 1).progress == 60
+    assert db.get(Objective, 3).progress == 40
+
+
+def test_rollup_locks_everything_in_id_order_before_recomputing(db):
+    _objective(db, 1)
+    _objective(db, 5, parent_id=1)
+    _objective(db, 3, parent_id=1)
+    _key_result(db, 5, 50)
+    _key_result(db, 3, 10)
+    db.flush()
+    statements = []
+    event.listen(
+        db.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    rollup(db, [5, 3])
+    locks = [s for s in statements if "ORDER BY objective.id" in s]
+    assert len(locks) == 1
+    # Nothing is read for the progress computation before the lock
+    assert statements.index(locks[0]) < min(
+        i for i, s in enumerate(statements) if "FROM key_result" in s
+    )
+    assert db.get(Objective, 1).progress == 30
+
+
+def test_rollup_relocks_in_id_order_after_a_concurrent_move(db, monkeypatch):
+    _objective(db, 1)
+    _objective(db, 4, parent_id=1)
+    _key_result(db, 4, 60)
+    db.flush()
+    real = progress._with_ancestors
+    calls = []
+
+    def with_ancestors(db, ids):
+        # The first ancestor query runs before 4 was moved under 1
+        calls.append(ids)
+        return {4} if len(calls) == 1 else real(db, ids)
+
+    monkeypatch.setattr(progress, "_with_ancestors", with_ancestors)
+    statements = []
+    event.listen(
+        db.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    rollup(db, [4])
+    locks = [s for s in statements if "ORDER BY objective.id" in s]
+    assert len(locks) == 2
+    # The first round's locks are released before the whole set is relocked
+    assert any(
+        s.startswith("ROLLBACK TO SAVEPOINT")
+        for s in statements[statements.index(locks[0]) : statements.index(locks[1])]
+    )
+    assert db.get(Objective, 1).progress == 60
@@ -0,0 +1,42 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+import pytest
+
+from app.crud import crud_user
+from app.models.user import User
+from app.schemas.user import UserUpdate
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+    with Session(engine, expire_on_commit=False) as session:
+        session.add(
+            User(
+                id=1,
+                user_name="ann",
+                first_name="Ann",
+                last_name="Lead",
+                email="ann@example.com",
+                hashed_password="old",
+            )
+        )
+        session.commit()
+        yield session
+
+
+def test_update_user_stores_the_given_hash(db, monkeypatch):
+    monkeypatch.setattr(crud_user, "get_password_hash", pytest.fail)
+    user = crud_user.update_user(
+        db, db.get(User, 1), UserUpdate(password="secret"), hashed_password="new"
+    )
+    assert user.hashed_password == "new"
+
+
+def test_update_user_never_hashes_itself(db, monkeypatch):
+    monkeypatch.setattr(crud_user, "get_password_hash", pytest.fail)
+    with pytest.raises(ValueError):
+        crud_user.update_user(db, db.get(User, 1), UserUpdate(password="secret"))
+    user = crud_user.update_user(db, db.get(User, 1), UserUpdate(first_name="Anna"))
+    assert (user.first_name, user.hashed_password) == ("Anna", "old")
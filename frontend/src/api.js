@@ -81,4 +81,32 @@ api.interceptors.response.use(
   }
 )
 
+// Reads every page of a list endpoint by following X-Next-Cursor
+export async function fetchAll(url, params = {}) {
+  const items = []
+  let cursor
+  do {
+    const res = await api.get(url, {
+      params: { ...params, limit: 500, cursor },
+      paramsSerializer: { indexes: null },
+    })
+    items.push(...res.data)
+    cursor = res.headers['x-next-cursor']
+  } while (cursor)
+  return items
+}
+
+// Every enum in one request, shared by all callers until the page reloads
+let enumsPromise
+export function fetchEnums() {
+  enumsPromise ??= api
+    .get('/enums')
+    .then((res) => res.data)
+    .catch((e) => {
+      enumsPromise = undefined
+      throw e
+    })
+  return enumsPromise
+}
+
 export default api